@@ -0,0 +1,72 @@
+"""Mede o custo de cada atualizacao do modo ao vivo conforme a sessao cresce.
+
+Escreve uma gravacao sintetica do live timing (`gravacao_sintetica.py`) aos poucos num arquivo, como o
+`SignalRClient` faria durante a sessao, e chama `F1DataHandler.atualizar_ao_vivo` a cada trecho. O custo de
+cada atualizacao deve acompanhar o tamanho do trecho novo, e nao o da sessao. No fim compara com ingerir a
+gravacao inteira de uma vez (o que uma recarga completa custaria a cada atualizacao).
+
+Uso:
+    python benchmarks/bench_ao_vivo.py [--pilotos 20] [--voltas 10] [--passo 30]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from data_handler import F1DataHandler  # noqa: E402
+from gravacao_sintetica import linhas_sinteticas  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pilotos", type=int, default=20)
+    parser.add_argument("--voltas", type=int, default=10)
+    parser.add_argument("--passo", type=float, default=30.0, help="segundos de sessao entre atualizacoes")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_ao_vivo_"))
+    eventos = linhas_sinteticas(args.pilotos, args.voltas)
+    caminho = os.path.abspath("gravacao.txt")
+    open(caminho, "w").close()
+
+    handler = F1DataHandler()
+    success, msg, _, _ = handler.iniciar_ao_vivo(caminho)
+    if not success:
+        raise SystemExit(msg)
+
+    print(f"{'sessao (s)':>10} {'linhas':>7} {'voltas novas':>12} {'voltas total':>12} {'ms':>8}")
+    custos = []
+    total_voltas = 0
+    proximo = 0
+    limite = args.passo
+    with open(caminho, "a") as arquivo:
+        while proximo < len(eventos):
+            inicio_trecho = proximo
+            while proximo < len(eventos) and eventos[proximo][0] < limite:
+                arquivo.write(eventos[proximo][1] + "\n")
+                proximo += 1
+            arquivo.flush()
+            inicio = time.perf_counter()
+            success, msg, novidades = handler.atualizar_ao_vivo()
+            ms = (time.perf_counter() - inicio) * 1000
+            if not success:
+                raise SystemExit(msg)
+            novas = sum(len(rotulos) for _, rotulos in novidades["voltas"].values())
+            total_voltas += novas
+            custos.append(ms)
+            print(f"{limite:>10.0f} {proximo - inicio_trecho:>7} {novas:>12} {total_voltas:>12} {ms:>8.1f}")
+            limite += args.passo
+
+    inicio = time.perf_counter()
+    completo = F1DataHandler()
+    success, msg, _, _ = completo.iniciar_ao_vivo(caminho)
+    recarga = (time.perf_counter() - inicio) * 1000
+    print(f"Atualizacao incremental: media {sum(custos) / len(custos):.1f} ms, maxima {max(custos):.1f} ms")
+    print(f"Ingerir a gravacao inteira: {recarga:.0f} ms ({msg})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Mede a comparacao entre sessoes: carga sequencial contra o pool de processos e bytes por volta transferida.
+
+Gera sessoes sinteticas do mesmo GP em anos diferentes (`sessao_sintetica.py`) e busca a mesma volta de um
+piloto em cada uma. A referencia e o que a interface fazia antes: carregar uma sessao por vez no mesmo
+handler. O pool (`F1DataHandler.get_telemetrias_sessoes`) carrega ate `--processos` sessoes ao mesmo tempo e
+devolve so os arrays das voltas (com um nucleo, o pool tem um processo so); o tamanho serializado de uma
+volta e comparado com o do `Lap` do fastf1, que leva a sessao inteira junto.
+
+Uso:
+    python benchmarks/bench_entre_sessoes.py [--sessoes 4] [--processos 3] [--pilotos 20] [--voltas 30]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cross_session import ComparadorSessoes  # noqa: E402
+from data_handler import F1DataHandler  # noqa: E402
+from sessao_sintetica import fabrica_sintetica  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessoes", type=int, default=4)
+    parser.add_argument("--processos", type=int, default=3)
+    parser.add_argument("--pilotos", type=int, default=20)
+    parser.add_argument("--voltas", type=int, default=30)
+    parser.add_argument("--piloto", default="VER")
+    parser.add_argument("--volta", type=int, default=5)
+    args = parser.parse_args()
+
+    fabrica = fabrica_sintetica(n_pilotos=args.pilotos, n_voltas=args.voltas)
+    chaves = [(2025 - i, "Sintetico", "R") for i in range(args.sessoes)]
+
+    # Cada medida num diretorio novo: o armazem de telemetria da primeira nao pode servir a segunda
+    os.chdir(tempfile.mkdtemp(prefix="bench_entre_sessoes_"))
+    sequencial = F1DataHandler(fabrica_sessao=fabrica)
+    inicio = time.perf_counter()
+    for chave in chaves:
+        success, msg, _, _ = sequencial.carregar_dados(*chave)
+        if not success:
+            raise SystemExit(msg)
+        success, msg, _, lap = sequencial.get_telemetria(args.piloto, args.volta)
+        if not success:
+            raise SystemExit(msg)
+    tempo_sequencial = time.perf_counter() - inicio
+    bytes_lap = len(pickle.dumps(lap))
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_entre_sessoes_"))
+    paralelo = F1DataHandler(fabrica_sessao=fabrica)
+    paralelo.comparador_sessoes = ComparadorSessoes(paralelo.comparador_sessoes.criar_handler, args.processos)
+    selecao = [(args.piloto, args.volta, chave) for chave in chaves]
+    inicio = time.perf_counter()
+    success, msg, voltas, _ = paralelo.get_telemetrias_sessoes(selecao)
+    tempo_paralelo = time.perf_counter() - inicio
+    if not success:
+        raise SystemExit(msg)
+    inicio = time.perf_counter()
+    paralelo.get_telemetrias_sessoes(selecao)
+    tempo_memo = time.perf_counter() - inicio
+    bytes_volta = sum(len(pickle.dumps(volta)) for volta in voltas) / len(voltas)
+    paralelo.comparador_sessoes.limpar()
+
+    # Como a interface faz ao carregar uma sessao com voltas extras de outra: o pool sobe antes da comparacao
+    os.chdir(tempfile.mkdtemp(prefix="bench_entre_sessoes_"))
+    aquecido = F1DataHandler(fabrica_sessao=fabrica)
+    aquecido.comparador_sessoes = ComparadorSessoes(aquecido.comparador_sessoes.criar_handler, args.processos)
+    wait(aquecido.comparador_sessoes.aquecer())
+    inicio = time.perf_counter()
+    success, msg, _, _ = aquecido.get_telemetrias_sessoes(selecao)
+    tempo_aquecido = time.perf_counter() - inicio
+    if not success:
+        raise SystemExit(msg)
+    aquecido.comparador_sessoes.limpar()
+
+    print(f"{args.sessoes} sessões ({args.pilotos} pilotos x {args.voltas} voltas), {os.cpu_count()} CPUs")
+    print(f"Uma sessão por vez:            {tempo_sequencial:7.2f} s")
+    rotulo_pool = f"Pool de {paralelo.comparador_sessoes.max_processos} processo(s):"
+    print(f"{rotulo_pool:<31}{tempo_paralelo:7.2f} s "
+          f"({tempo_sequencial / tempo_paralelo:.1f}x)")
+    print(f"Com o pool já aquecido:        {tempo_aquecido:7.2f} s "
+          f"({tempo_sequencial / tempo_aquecido:.1f}x)")
+    print(f"Mesma comparação de novo:      {tempo_memo * 1000:7.2f} ms")
+    print(f"Bytes por volta transferida:   {bytes_volta / 1024:7.1f} KB "
+          f"(Lap do fastf1 com a sessão: {bytes_lap / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compara o tempo de desenho com e sem a decimacao min/max (LOD) do F1Plotter.
+
+Plota varias voltas com muitas amostras (telemetria de alta frequencia gerada localmente, canvas Agg) e
+mede o desenho completo com todas as amostras, com a decimacao para a largura do grafico e depois de
+cada zoom in.
+
+Uso:
+    python benchmarks/bench_lod.py [--voltas 10] [--amostras 50000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_memoria_plot import telemetria_volta  # noqa: E402
+from data_handler import F1DataHandler  # noqa: E402
+from plotter import F1Plotter  # noqa: E402
+
+
+def tempo_desenho(plotter, repeticoes):
+    """Tempo medio (ms) de um desenho completo da figura."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        plotter.canvas.draw()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def pontos_desenhados(plotter):
+    """Total de pontos nas linhas das voltas."""
+    return sum(len(linha.get_xdata()) for linha in plotter._linhas_atuais)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--voltas", type=int, default=10)
+    parser.add_argument("--amostras", type=int, default=50000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_lod_"))
+    data_handler = F1DataHandler()
+    plotter = F1Plotter(None)
+    voltas = [{"piloto": f"P{i:02d}", "tel": telemetria_volta(i, amostras=args.amostras), "lap": None, "equipe": "",
+               "posicao": i + 1, "cor": f"C{i % 10}", "composto": "SOFT", "rotulo": f"P{i:02d}"}
+              for i in range(args.voltas)]
+    dados = {"voltas": voltas, "clima": {"temp_track": 35.0, "temp_air": 25.0, "rain": "Não", "wind_speed": 7.0},
+             "mapa": None}
+
+    inicio = time.perf_counter()
+    success, msg = plotter.plot_comparacao(data_handler, [], "Velocidade", dados=dados)
+    if not success:
+        raise SystemExit(msg)
+    print(f"Primeiro grafico (alinhamento + piramide): {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    lod = tempo_desenho(plotter, args.repeticoes)
+    pontos_lod = pontos_desenhados(plotter)
+
+    grade = dados["alinhadas"].grade
+    ys = dados["graficos"]["Velocidade"][0]
+    for linha, y in zip(plotter._linhas_atuais, ys):
+        linha.set_data(grade, y)
+    completo = tempo_desenho(plotter, args.repeticoes)
+    print(f"Todas as amostras: {pontos_desenhados(plotter):>9} pontos, {completo:7.1f} ms por desenho")
+    print(f"Com LOD:           {pontos_lod:>9} pontos, {lod:7.1f} ms por desenho")
+
+    plotter._atualizar_lod()
+    for nivel in range(1, 5):
+        inicio = time.perf_counter()
+        plotter.zoom_in()
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"Zoom in {nivel}: {pontos_desenhados(plotter):>9} pontos, {ms:7.1f} ms (redecimacao + desenho)")
+
+
+if __name__ == "__main__":
+    main()
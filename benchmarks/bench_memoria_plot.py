@@ -0,0 +1,110 @@
+"""Mede a memoria do F1Plotter ao longo de muitos graficos consecutivos.
+
+Plota comparacoes seguidas (alternando tipos de grafico e voltas) com telemetria gerada localmente, sem
+rede e sem janela (canvas Agg), e imprime a memoria a cada bloco de graficos. Com a figura reaproveitada
+a memoria deve ficar estavel depois dos primeiros graficos. O tempo por grafico inclui o custo do
+tracemalloc, entao serve so para comparar execucoes entre si.
+
+Uso:
+    python benchmarks/bench_memoria_plot.py [--graficos 500] [--voltas 3]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from data_handler import F1DataHandler  # noqa: E402
+from lap_telemetry import TelemetriaVolta  # noqa: E402
+from plotter import F1Plotter  # noqa: E402
+
+TIPOS = ["Velocidade", "Acelerador", "Freio", "Marcha", "RPM", "DRS", "Delta"]
+
+
+def telemetria_volta(semente, amostras=700, comprimento=5400.0):
+    """Gera a telemetria de uma volta num circuito oval, no formato devolvido pelo data handler."""
+    rng = np.random.default_rng(semente)
+    distancia = np.linspace(0, comprimento, amostras)
+    angulo = distancia / comprimento * 2 * np.pi
+    velocidade = 200 + 90 * np.sin(3 * angulo + rng.uniform(0, 0.2)) + rng.normal(0, 2, amostras)
+    tempo = np.concatenate([[0.0], np.cumsum(np.diff(distancia) / (velocidade[1:] / 3.6))])
+    return TelemetriaVolta(
+        Distance=distancia,
+        Speed=velocidade,
+        Throttle=np.clip(velocidade - 150, 0, 100),
+        Brake=velocidade < 140,
+        nGear=np.clip((velocidade // 40).astype(int), 1, 8),
+        RPM=9000 + 30 * velocidade,
+        DRS=np.where((angulo > 5.5) | (angulo < 0.4), 12, 0),
+        X=3000 * np.cos(angulo),
+        Y=1500 * np.sin(angulo),
+        Time=tempo,
+    )
+
+
+def dados_comparacao(semente, n_voltas):
+    """Monta um resultado equivalente ao de `F1Plotter.load_telemetry_data`."""
+    cores = ["#1E90FF", "#DC0000", "#FF8700", "#00D2BE", "#006F62"]
+    voltas = [{"piloto": f"P{i:02d}", "tel": telemetria_volta(semente * 10 + i), "lap": None, "equipe": "",
+               "posicao": i + 1, "cor": cores[i % len(cores)], "composto": "SOFT", "rotulo": f"P{i:02d}"}
+              for i in range(n_voltas)]
+    clima = {"temp_track": 35.0, "temp_air": 25.0, "rain": "Não", "wind_speed": 7.0}
+    return {"voltas": voltas, "clima": clima, "mapa": None}
+
+
+def memoria_rss():
+    """RSS atual do processo em bytes (0 fora do Linux)."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graficos", type=int, default=500)
+    parser.add_argument("--voltas", type=int, default=3)
+    parser.add_argument("--bloco", type=int, default=50)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_plot_"))
+    data_handler = F1DataHandler()
+    plotter = F1Plotter(None)
+    selecoes = [dados_comparacao(semente, args.voltas) for semente in range(5)]
+
+    tracemalloc.start()
+    print(f"{'graficos':>8} {'python (MB)':>12} {'RSS (MB)':>10} {'ms/grafico':>11}")
+    base = None
+    inicio = time.perf_counter()
+    for i in range(1, args.graficos + 1):
+        dados = selecoes[i % len(selecoes)]
+        success, msg = plotter.plot_comparacao(data_handler, [], TIPOS[i % len(TIPOS)], dados=dados)
+        if not success:
+            raise SystemExit(msg)
+        plotter.canvas.draw()
+        if i % args.bloco == 0:
+            gc.collect()
+            atual, _ = tracemalloc.get_traced_memory()
+            ms = (time.perf_counter() - inicio) / args.bloco * 1000
+            print(f"{i:>8} {atual / 1024 ** 2:>12.1f} {memoria_rss() / 1024 ** 2:>10.1f} {ms:>11.1f}")
+            if base is None:
+                base = atual
+            inicio = time.perf_counter()
+
+    atual, _ = tracemalloc.get_traced_memory()
+    print(f"Crescimento apos o primeiro bloco: {(atual - base) / 1024 ** 2:+.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
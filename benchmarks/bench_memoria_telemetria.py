@@ -0,0 +1,81 @@
+"""Compara a memoria ocupada pela telemetria de uma volta em cada representacao.
+
+Extrai voltas de uma sessao sintetica do fastf1 (sem rede) e mede, por volta:
+- o `Telemetry` do fastf1 montado por `telemetria_volta` (o que o `get_telemetry` devolve);
+- um DataFrame com os canais guardados em float64/int64 e Time como Timedelta (como o armazem devolvia antes);
+- a `TelemetriaVolta` com dtypes compactos (float32, int8/bool e Time em float64).
+
+Tambem projeta o total para as voltas de uma sessao inteira.
+
+Uso:
+    python benchmarks/bench_memoria_telemetria.py [--pilotos 20] [--voltas 70] [--amostra 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from lap_telemetry import DTYPES_CANAIS, TelemetriaVolta  # noqa: E402
+from sessao_sintetica import fabrica_sintetica  # noqa: E402
+from telemetry_loader import telemetria_volta  # noqa: E402
+
+
+def bytes_dataframe(df):
+    """Memoria do DataFrame, incluindo o indice e os objetos das colunas object."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def dataframe_largo(tel):
+    """Canais guardados com os dtypes largos do pandas/fastf1 (float64/int64, Time como Timedelta)."""
+    colunas = {}
+    for canal, dtype in DTYPES_CANAIS.items():
+        if canal not in tel:
+            continue
+        if canal == "Time":
+            colunas[canal] = tel[canal]
+        elif dtype is np.bool_:
+            colunas[canal] = tel[canal].to_numpy(dtype=bool)
+        else:
+            colunas[canal] = tel[canal].to_numpy(dtype=np.int64 if np.dtype(dtype).kind == "i" else np.float64)
+    return pd.DataFrame(colunas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pilotos", type=int, default=20)
+    parser.add_argument("--voltas", type=int, default=70)
+    parser.add_argument("--amostra", type=int, default=20, help="voltas medidas (espalhadas pela sessao)")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_memoria_tel_"))
+    session = fabrica_sintetica(n_pilotos=args.pilotos, n_voltas=args.voltas)(2024, "Sintetico", "R")
+    session.load()
+    laps = session.laps
+    posicoes = np.linspace(0, len(laps) - 1, min(args.amostra, len(laps))).astype(int)
+
+    totais = {"fastf1 Telemetry": 0, "DataFrame float64": 0, "TelemetriaVolta": 0}
+    amostras = 0
+    for posicao in posicoes:
+        tel = telemetria_volta(laps.iloc[posicao])
+        compacta = TelemetriaVolta.de_dataframe(tel)
+        totais["fastf1 Telemetry"] += bytes_dataframe(tel)
+        totais["DataFrame float64"] += bytes_dataframe(dataframe_largo(tel))
+        totais["TelemetriaVolta"] += compacta.nbytes
+        amostras += len(compacta)
+
+    n = len(posicoes)
+    print(f"{n} voltas medidas, {amostras / n:.0f} amostras por volta em media")
+    print(f"{'representacao':<20} {'bytes/volta':>12} {'sessao (MB)':>12} {'reducao':>8}")
+    base = totais["fastf1 Telemetry"]
+    for nome, total in totais.items():
+        por_volta = total / n
+        print(f"{nome:<20} {por_volta:>12,.0f} {por_volta * len(laps) / 1024 ** 2:>12.1f} {base / total:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
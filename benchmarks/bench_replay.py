@@ -0,0 +1,71 @@
+"""Mede o custo de um quadro do replay no mini-mapa com blitting e com o redesenho completo da figura.
+
+Plota duas voltas geradas localmente (canvas Agg), monta as trajetorias do replay e mede cada quadro
+redesenhando so os marcadores animados sobre o fundo guardado (o que o timer do replay faz) e, para
+comparar, com um `canvas.draw()` completo por quadro (como o hover fazia com `draw_idle`).
+
+Uso:
+    python benchmarks/bench_replay.py [--voltas 2] [--quadros 600]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_memoria_plot import dados_comparacao  # noqa: E402
+from config import REPLAY_FPS  # noqa: E402
+from data_handler import F1DataHandler  # noqa: E402
+from plotter import F1Plotter  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--voltas", type=int, default=2)
+    parser.add_argument("--quadros", type=int, default=600)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_replay_"))
+    plotter = F1Plotter(None)
+    success, msg = plotter.plot_comparacao(F1DataHandler(), [], "Velocidade", dados=dados_comparacao(1, args.voltas))
+    if not success:
+        raise SystemExit(msg)
+    plotter.canvas.draw()
+
+    inicio = time.perf_counter()
+    success, msg = plotter.iniciar_replay()
+    if not success:
+        raise SystemExit(msg)
+    replay = plotter._replay
+    print(f"Trajetorias: {replay.x_mapa.shape[1]} quadros x {args.voltas} voltas em "
+          f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    tempos = np.linspace(0, replay.duracao, args.quadros)
+    inicio = time.perf_counter()
+    for tempo in tempos:
+        plotter.mostrar_quadro_replay(tempo)
+    blit = (time.perf_counter() - inicio) / len(tempos) * 1000
+
+    completos = tempos[:max(args.quadros // 20, 1)]
+    inicio = time.perf_counter()
+    for tempo in completos:
+        plotter._posicionar_replay(tempo)
+        plotter.canvas.draw()
+    completo = (time.perf_counter() - inicio) / len(completos) * 1000
+
+    orcamento = 1000 / REPLAY_FPS
+    print(f"Orcamento por quadro a {REPLAY_FPS} fps: {orcamento:.1f} ms")
+    print(f"Blitting (marcadores e cursor): {blit:7.2f} ms por quadro")
+    print(f"Desenho completo da figura:     {completo:7.2f} ms por quadro ({completo / blit:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Mede o tempo de inicializacao da interface e falha se ele passar do orcamento.
+
+Tres verificacoes, cada uma num processo Python novo (cold start):
+
+1. `python -X importtime -c "import main"`: tempo total de import e os modulos mais caros.
+2. Modulos pesados (fastf1, pandas, matplotlib, numpy) nao podem ser importados antes da janela aparecer.
+3. Tempo ate o primeiro frame: do inicio do processo ate a janela principal ser mapeada. So roda quando ha
+   display (no Linux, com `DISPLAY` definido).
+
+Uso:
+    python benchmarks/bench_startup.py [--orcamento-import-ms 300] [--orcamento-janela-ms 1500]
+
+Sai com codigo 1 se algum orcamento for ultrapassado.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+MODULOS_PESADOS = ("fastf1", "pandas", "matplotlib", "numpy")
+
+_PRIMEIRO_FRAME = """
+import time
+import main
+
+root, ui = main.criar_janela()
+
+def exibida(event):
+    if event.widget is root:
+        root.update_idletasks()
+        print(time.time(), flush=True)
+        root.destroy()
+
+root.bind("<Map>", exibida, add="+")
+root.mainloop()
+"""
+
+
+def _executar(*args):
+    return subprocess.run([sys.executable, *args], cwd=SRC, capture_output=True, text=True, check=True)
+
+
+def tempos_import():
+    """Retorna (tempo total dos imports em ms, [(ms acumulado, modulo)] dos dois primeiros niveis).
+
+    O total soma os imports de topo, entao inclui o `site` do proprio interpretador alem de `main`.
+    """
+    saida = _executar("-X", "importtime", "-c", "import main").stderr
+    modulos = []
+    total = 0.0
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, acumulado, nome = linha.split("|")
+        if not acumulado.strip().isdigit():
+            continue
+        ms = int(acumulado) / 1000
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        if nivel == 0:
+            total += ms
+        if nivel <= 1:
+            modulos.append((ms, "  " * nivel + nome.strip()))
+    return total, sorted(modulos, reverse=True)
+
+
+def modulos_pesados_importados():
+    """Modulos pesados presentes em `sys.modules` depois de `import main`."""
+    codigo = f"import sys, main; print(' '.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))"
+    return _executar("-c", codigo).stdout.split()
+
+
+def tempo_primeiro_frame():
+    """Tempo (ms) do inicio do processo ate a janela principal aparecer, ou None sem display."""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+    inicio = time.time()
+    saida = _executar("-c", _PRIMEIRO_FRAME).stdout
+    return (float(saida.split()[-1]) - inicio) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orcamento-import-ms", type=float, default=300)
+    parser.add_argument("--orcamento-janela-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=10, help="Quantos modulos mostrar no detalhamento")
+    args = parser.parse_args()
+    falhas = []
+
+    total, modulos = tempos_import()
+    print(f"Imports ate a janela: {total:.0f} ms (orcamento {args.orcamento_import_ms:.0f} ms)")
+    for ms, nome in modulos[:args.top]:
+        print(f"  {ms:8.1f} ms  {nome}")
+    if total > args.orcamento_import_ms:
+        falhas.append(f"os imports levaram {total:.0f} ms")
+
+    pesados = modulos_pesados_importados()
+    print(f"Modulos pesados antes da janela: {', '.join(pesados) or 'nenhum'}")
+    if pesados:
+        falhas.append(f"modulos pesados importados na inicializacao: {', '.join(pesados)}")
+
+    janela = tempo_primeiro_frame()
+    if janela is None:
+        print("Primeiro frame: sem display, medicao ignorada")
+    else:
+        print(f"Primeiro frame: {janela:.0f} ms (orcamento {args.orcamento_janela_ms:.0f} ms)")
+        if janela > args.orcamento_janela_ms:
+            falhas.append(f"a janela levou {janela:.0f} ms para aparecer")
+
+    for falha in falhas:
+        print(f"FALHOU: {falha}", file=sys.stderr)
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
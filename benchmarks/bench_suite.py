@@ -0,0 +1,225 @@
+"""Suite de benchmarks offline do caminho de dados e do grafico, com sessoes sinteticas do fastf1.
+
+A sessao e gerada localmente por `sessao_sintetica` (mesmas classes do fastf1, sem rede) e injetada no
+F1DataHandler pela `fabrica_sessao`. Cada etapa e medida varias vezes e o resultado pode ser gravado em JSON
+e comparado com uma execucao anterior para achar regressoes.
+
+Etapas medidas:
+- carregar_dados (a geracao da sessao sintetica entra no tempo) e a troca para uma sessao no cache em memoria
+- get_voltas_piloto de todos os pilotos
+- get_telemetria de uma volta: extraida pelo fastf1, lida do armazem em disco e ja memoizada
+- get_telemetrias de varias voltas (extracao em paralelo)
+- interpolar_telemetria, calcular_delta e alinhar
+- get_agregados (tabela de agregados por volta de toda a sessao, com a telemetria ja carregada)
+- plot_comparacao de ponta a ponta (carga, alinhamento e desenho no canvas Agg) e trocar_tipo
+
+Uso:
+    python benchmarks/bench_suite.py [--pilotos 20] [--voltas 70] [--frequencia 3.7] [--repeticoes 5]
+                                     [--saida resultados.json] [--comparar base.json] [--tolerancia 0.2] [--minimo-ms 2]
+
+Com --comparar, sai com codigo 1 se alguma etapa ficar mais lenta que a base alem da tolerancia.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from data_handler import F1DataHandler  # noqa: E402
+from plotter import F1Plotter  # noqa: E402
+from sessao_sintetica import fabrica_sintetica  # noqa: E402
+
+SESSAO = (2025, "Sintetico", "R")
+OUTRA_SESSAO = (2025, "Sintetico", "Q")
+
+
+def medir(funcao, repeticoes, preparar=None):
+    """Executa `funcao` varias vezes e retorna os tempos em ms (`preparar` roda antes, fora da medicao).
+
+    A primeira execucao e descartada (aquecimento de caches e imports tardios).
+    """
+    tempos = []
+    for _ in range(repeticoes + 1):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos[1:]
+
+
+def _verificar(resultado):
+    """Falha o benchmark quando um metodo do handler/plotter retorna success False."""
+    if not resultado[0]:
+        raise RuntimeError(resultado[1])
+    return resultado
+
+
+def executar_suite(pilotos, voltas, frequencia, repeticoes, n_comparadas):
+    """Roda todas as etapas e retorna {etapa: [tempos em ms]}."""
+    fabrica = fabrica_sintetica(n_pilotos=pilotos, n_voltas=voltas, frequencia_hz=frequencia)
+    resultados = {}
+
+    handler = None
+
+    def carregar():
+        nonlocal handler
+        handler = F1DataHandler(fabrica_sessao=fabrica)
+        _verificar(handler.carregar_dados(*SESSAO))
+
+    resultados["carregar_dados"] = medir(carregar, max(1, repeticoes // 2))
+
+    _verificar(handler.carregar_dados(*OUTRA_SESSAO))
+    alternar = iter([SESSAO, OUTRA_SESSAO] * repeticoes)
+    resultados["carregar_dados (cache em memoria)"] = medir(
+        lambda: _verificar(handler.carregar_dados(*next(alternar))), repeticoes)
+    _verificar(handler.carregar_dados(*SESSAO))
+
+    nomes = handler.get_pilotos()
+    resultados["get_voltas_piloto (todos)"] = medir(
+        lambda: [_verificar(handler.get_voltas_piloto(piloto)) for piloto in nomes], repeticoes)
+
+    chave = handler.get_voltas_mais_rapidas()[0]
+    memo = handler._memo_sessao()["telemetria"]
+
+    def limpar_tudo():
+        memo.clear()
+        handler.armazem.limpar()
+
+    resultados["get_telemetria (fastf1)"] = medir(
+        lambda: _verificar(handler.get_telemetria(*chave)), repeticoes, preparar=limpar_tudo)
+    resultados["get_telemetria (armazem)"] = medir(
+        lambda: _verificar(handler.get_telemetria(*chave)), repeticoes, preparar=memo.clear)
+    resultados["get_telemetria (memo)"] = medir(lambda: _verificar(handler.get_telemetria(*chave)), repeticoes)
+
+    chaves = handler.get_voltas_mais_rapidas()[:n_comparadas]
+    resultados[f"get_telemetrias ({len(chaves)} voltas)"] = medir(
+        lambda: _verificar(handler.get_telemetrias(chaves)), max(1, repeticoes // 2), preparar=limpar_tudo)
+
+    _, _, telemetrias = _verificar(handler.get_telemetrias(chaves))
+    tel1, tel2 = telemetrias[0][0], telemetrias[1][0]
+    resultados["interpolar_telemetria"] = medir(
+        lambda: handler.interpolar_telemetria(tel1, tel2, "Speed"), repeticoes)
+    resultados["calcular_delta"] = medir(lambda: handler.calcular_delta(tel1, tel2), repeticoes)
+    resultados[f"alinhar ({len(chaves)} voltas)"] = medir(
+        lambda: handler.alinhar([tel for tel, _ in telemetrias]), repeticoes)
+
+    resultados["get_agregados"] = medir(lambda: _verificar(handler.get_agregados()), repeticoes,
+                                        preparar=lambda: handler._memo_sessao().pop("agregados", None))
+
+    plotter = F1Plotter(None)
+    selecao = chaves[:2]
+
+    def plotar():
+        dados = plotter.load_telemetry_data(handler, selecao)
+        _verificar(plotter.plot_comparacao(handler, selecao, "Velocidade", dados=dados))
+        plotter.canvas.draw()
+
+    resultados["plot_comparacao (telemetria fria)"] = medir(plotar, max(1, repeticoes // 2), preparar=limpar_tudo)
+    resultados["plot_comparacao"] = medir(plotar, repeticoes)
+
+    tipos = iter(["Delta", "Velocidade"] * repeticoes)
+
+    def trocar():
+        _verificar(plotter.trocar_tipo(next(tipos)))
+        plotter.canvas.draw()
+
+    resultados["trocar_tipo"] = medir(trocar, repeticoes)
+    plotter.fechar()
+    return resultados
+
+
+def resumir(tempos):
+    """Mediana, minimo e numero de repeticoes de uma etapa."""
+    return {"mediana_ms": round(statistics.median(tempos), 3), "min_ms": round(min(tempos), 3),
+            "repeticoes": len(tempos)}
+
+
+def comparar(resumo, base, tolerancia, minimo_ms):
+    """Imprime a razao de cada etapa em relacao a base e retorna as etapas que regrediram.
+
+    Uma etapa regride quando fica mais lenta que a base alem da tolerancia relativa e de `minimo_ms`, para
+    que o ruido de etapas de poucos milissegundos nao acuse regressao.
+    """
+    regressoes = []
+    print(f"\n{'etapa':40s} {'base (ms)':>10s} {'atual (ms)':>11s} {'razao':>7s}")
+    for etapa, atual in resumo.items():
+        anterior = base.get(etapa)
+        if anterior is None:
+            print(f"{etapa:40s} {'-':>10s} {atual['mediana_ms']:11.1f}   (nova)")
+            continue
+        razao = atual["mediana_ms"] / max(anterior["mediana_ms"], 1e-9)
+        piorou = atual["mediana_ms"] - anterior["mediana_ms"] > minimo_ms
+        marca = "  REGRESSAO" if razao > 1 + tolerancia and piorou else ""
+        print(f"{etapa:40s} {anterior['mediana_ms']:10.1f} {atual['mediana_ms']:11.1f} {razao:7.2f}{marca}")
+        if marca:
+            regressoes.append(etapa)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pilotos", type=int, default=20)
+    parser.add_argument("--voltas", type=int, default=70)
+    parser.add_argument("--frequencia", type=float, default=3.7, help="Amostras por segundo de car_data/pos_data")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--comparadas", type=int, default=4, help="Voltas extraidas/alinhadas juntas")
+    parser.add_argument("--saida", help="Grava os resultados neste arquivo JSON")
+    parser.add_argument("--comparar", help="JSON de uma execucao anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Aumento relativo aceito (0.2 = 20%%)")
+    parser.add_argument("--minimo-ms", type=float, default=2.0, help="Aumento absoluto minimo para acusar regressao")
+    args = parser.parse_args()
+
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Armazem de telemetria e cache do fastf1 ficam no diretorio temporario
+        os.chdir(diretorio)
+        try:
+            tempos = executar_suite(args.pilotos, args.voltas, args.frequencia, args.repeticoes, args.comparadas)
+        finally:
+            os.chdir(diretorio_original)
+
+    resumo = {etapa: resumir(valores) for etapa, valores in tempos.items()}
+    parametros = {"pilotos": args.pilotos, "voltas": args.voltas, "frequencia": args.frequencia,
+                  "repeticoes": args.repeticoes, "comparadas": args.comparadas}
+    print(f"{args.pilotos} pilotos x {args.voltas} voltas a {args.frequencia} Hz")
+    print(f"{'etapa':40s} {'mediana (ms)':>13s} {'min (ms)':>10s}")
+    for etapa, valores in resumo.items():
+        print(f"{etapa:40s} {valores['mediana_ms']:13.1f} {valores['min_ms']:10.1f}")
+
+    if args.saida:
+        documento = {
+            "meta": {
+                "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "cpus": os.cpu_count(),
+                "parametros": parametros,
+            },
+            "resultados": resumo,
+        }
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(documento, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        if base.get("meta", {}).get("parametros") != parametros:
+            print("Aviso: a base foi gerada com outros parametros.", file=sys.stderr)
+        regressoes = comparar(resumo, base["resultados"], args.tolerancia, args.minimo_ms)
+        if regressoes:
+            print(f"FALHOU: {len(regressoes)} etapa(s) mais lenta(s) que a base", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Gravacao sintetica do live timing, no formato escrito pelo `fastf1.livetiming.SignalRClient`.
+
+Cada linha e o `str()` de [categoria, mensagem, data]: DriverList, TimingAppData, TimingData (setores,
+NumberOfLaps e LastLapTime), WeatherData e CarData.z/Position.z comprimidos (deflate + base64), com os pilotos
+dando voltas num circuito oval. Serve para os benchmarks e para testar o modo ao vivo sem rede.
+"""
+import base64
+import json
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+INICIO = datetime(2024, 3, 2, 15, 0, 0)
+AMOSTRAS_POR_SEGUNDO = 4
+
+
+def _comprimir(dados):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return base64.b64encode(compressor.compress(json.dumps(dados).encode()) + compressor.flush()).decode()
+
+
+def _data(segundos):
+    return (INICIO + timedelta(seconds=segundos)).isoformat(timespec="milliseconds") + "Z"
+
+
+def _linha(categoria, mensagem, segundos):
+    return str([categoria, mensagem, _data(segundos)])
+
+
+def _tempo_str(segundos):
+    minutos, resto = divmod(segundos, 60)
+    return f"{int(minutos)}:{resto:06.3f}" if minutos else f"{resto:.3f}"
+
+
+def linhas_sinteticas(n_pilotos=20, n_voltas=10, semente=0):
+    """Gera as linhas da gravacao em ordem de tempo.
+
+    Returns:
+        list: (segundos desde o inicio, linha), uma sessao de `n_voltas` voltas de cerca de 90 s.
+    """
+    rng = np.random.default_rng(semente)
+    numeros = [str(i + 1) for i in range(n_pilotos)]
+    tempos_volta = 90 + 0.3 * np.arange(n_pilotos)[:, None] + rng.normal(0, 0.4, (n_pilotos, n_voltas))
+    fins = np.cumsum(tempos_volta, axis=1)
+
+    pilotos = {numero: {"Tla": f"P{i:02d}", "TeamName": f"Equipe {i // 2}", "Line": i + 1, "RacingNumber": numero}
+               for i, numero in enumerate(numeros)}
+    eventos = [(0.0, _linha("SessionStatus", {"Status": "Started"}, 0.0)),
+               (0.0, _linha("DriverList", pilotos, 0.0)),
+               (0.0, _linha("TimingAppData", {"Lines": {numero: {"Stints": [{"Compound": "MEDIUM", "New": "true"}]}
+                                                        for numero in numeros}}, 0.0))]
+    for i, numero in enumerate(numeros):
+        inicio = 0.0
+        for volta in range(n_voltas):
+            duracao = tempos_volta[i, volta]
+            setores = [duracao * 0.32, duracao * 0.35, duracao * 0.33]
+            for s in range(2):
+                t = inicio + sum(setores[:s + 1])
+                eventos.append((t, _linha("TimingData", {"Lines": {numero: {
+                    "Sectors": {str(s): {"Value": _tempo_str(setores[s])}}}}}, t)))
+            t = fins[i, volta]
+            eventos.append((t, _linha("TimingData", {"Lines": {numero: {
+                "NumberOfLaps": volta + 1, "LastLapTime": {"Value": _tempo_str(duracao)},
+                "Sectors": {"2": {"Value": _tempo_str(setores[2])}}}}}, t)))
+            inicio = t
+
+    duracao_sessao = float(fins.max()) + 20
+    for segundo in range(int(duracao_sessao)):
+        instantes = segundo + np.arange(AMOSTRAS_POR_SEGUNDO) / AMOSTRAS_POR_SEGUNDO
+        carros, posicoes = [], []
+        for t in instantes:
+            voltas_feitas = (fins <= t).sum(axis=1)
+            inicio = np.where(voltas_feitas > 0, fins[np.arange(n_pilotos), np.maximum(voltas_feitas - 1, 0)], 0.0)
+            duracao = tempos_volta[np.arange(n_pilotos), np.minimum(voltas_feitas, n_voltas - 1)]
+            angulo = 2 * np.pi * np.clip((t - inicio) / duracao, 0, 1)
+            velocidade = 200 + 90 * np.sin(3 * angulo)
+            carros.append({"Utc": _data(t), "Cars": {numero: {"Channels": {
+                "0": int(9000 + 30 * velocidade[i]), "2": int(velocidade[i]), "3": int(min(velocidade[i] // 40, 8)),
+                "4": int(np.clip(velocidade[i] - 150, 0, 100)), "5": int(velocidade[i] < 140),
+                "45": 12 if angulo[i] > 5.5 else 0}} for i, numero in enumerate(numeros)}})
+            posicoes.append({"Timestamp": _data(t), "Entries": {numero: {
+                "Status": "OnTrack", "X": round(3000 * np.cos(angulo[i]), 1), "Y": round(1500 * np.sin(angulo[i]), 1),
+                "Z": 0} for i, numero in enumerate(numeros)}})
+        fim = segundo + 1.0
+        eventos.append((fim, _linha("CarData.z", _comprimir({"Entries": carros}), fim)))
+        eventos.append((fim, _linha("Position.z", _comprimir({"Position": posicoes}), fim)))
+        if segundo % 60 == 0:
+            eventos.append((fim, _linha("WeatherData", {"AirTemp": "25.1", "TrackTemp": "41.3", "Rainfall": "0",
+                                                         "WindSpeed": "1.8", "Humidity": "40.0"}, fim)))
+    eventos.sort(key=lambda evento: evento[0])
+    return eventos
@@ -0,0 +1,68 @@
+"""Servidor de replay local: envia uma gravacao do live timing por TCP, no ritmo em que foi gravada.
+
+Cada cliente (ex.: o botao "Ao Vivo" com 'localhost:8765') recebe as linhas da gravacao desde o inicio,
+espacadas pela data de cada mensagem dividida pela velocidade. Sem arquivo, envia uma gravacao sintetica
+(`gravacao_sintetica.py`).
+
+Uso:
+    python benchmarks/servidor_replay.py [gravacao.txt] [--porta 8765] [--velocidade 1.0]
+"""
+import argparse
+import os
+import socketserver
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from gravacao_sintetica import linhas_sinteticas  # noqa: E402
+from live_timing import decodificar_linha  # noqa: E402
+
+
+def eventos_gravacao(caminho):
+    """(segundos desde a primeira mensagem, linha) de cada linha da gravacao, na ordem do arquivo."""
+    eventos = []
+    inicio = None
+    with open(caminho) as arquivo:
+        for linha in arquivo:
+            linha = linha.rstrip("\n")
+            decodificada = decodificar_linha(linha)
+            if decodificada is None:
+                segundos = eventos[-1][0] if eventos else 0.0
+            else:
+                inicio = inicio or decodificada[2]
+                segundos = (decodificada[2] - inicio).total_seconds()
+            eventos.append((segundos, linha))
+    return eventos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("gravacao", nargs="?", help="arquivo gravado pelo SignalRClient do fastf1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--velocidade", type=float, default=1.0)
+    parser.add_argument("--pilotos", type=int, default=20, help="pilotos da gravacao sintetica")
+    parser.add_argument("--voltas", type=int, default=10, help="voltas da gravacao sintetica")
+    args = parser.parse_args()
+
+    eventos = eventos_gravacao(args.gravacao) if args.gravacao else linhas_sinteticas(args.pilotos, args.voltas)
+
+    class Replay(socketserver.BaseRequestHandler):
+        def handle(self):
+            relogio = time.perf_counter()
+            for segundos, linha in eventos:
+                espera = relogio + segundos / args.velocidade - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                try:
+                    self.request.sendall((linha + "\n").encode())
+                except OSError:
+                    return
+
+    with socketserver.ThreadingTCPServer(("localhost", args.porta), Replay) as servidor:
+        print(f"{len(eventos)} linhas em localhost:{args.porta} ({args.velocidade:g}x)")
+        servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Gerador de sessoes sinteticas da F1 para benchmarks offline.
+
+Produz voltas, telemetria (car_data/pos_data), resultados, clima e informacoes do circuito usando as
+proprias classes do fastf1 (`Laps`, `Telemetry`, `SessionResults`, `CircuitInfo`), entao
+o merge/interpolacao da telemetria por volta percorre o mesmo caminho de uma sessao real, sem rede. Como nao
+ha `api_path`, a telemetria de todos os pilotos e gerada no primeiro uso (sem a carga por piloto).
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps, SessionResults, Telemetry
+from fastf1.mvapi import CircuitInfo
+
+EQUIPES = ["Red Bull Racing", "Ferrari", "McLaren", "Mercedes", "Aston Martin", "Alpine", "Williams",
+           "Racing Bulls, Toro Rosso", "Haas", "KICK, Sauber"]
+ABREVIATURAS = ["VER", "TSU", "LEC", "HAM", "NOR", "PIA", "RUS", "ANT", "ALO", "STR", "GAS", "DOO", "ALB", "SAI",
+                "LAW", "HAD", "OCO", "BEA", "HUL", "BOR", "AAA", "BBB", "CCC", "DDD"]
+COMPOSTOS = ["SOFT", "MEDIUM", "HARD"]
+COMPRIMENTO_PISTA = 5400.0  # m
+INICIO_SESSAO = 300.0  # s entre o inicio dos dados e a largada
+T0_DATE = pd.Timestamp("2025-03-23 06:00:00")
+V_MAX = 340 / 3.6  # m/s
+ACEL_LATERAL = 2.6 * 9.81  # m/s2 nas curvas
+ACEL_TRACAO = 9.0  # m/s2
+ACEL_FRENAGEM = 40.0  # m/s2
+
+
+def _tracado(n=4000):
+    """Gera um circuito fechado com retas e curvas e o perfil de velocidade de uma volta rapida.
+
+    A velocidade limite de cada ponto vem da curvatura (aderencia lateral fixa); depois passadas para frente
+    e para tras limitam a aceleracao e a frenagem, o que produz retas, pontos de frenagem e saidas de curva.
+    """
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    x = np.cos(t) + 0.30 * np.cos(3 * t) + 0.10 * np.sin(5 * t) + 0.04 * np.cos(9 * t)
+    y = 0.6 * np.sin(t) + 0.20 * np.sin(2 * t) - 0.08 * np.cos(4 * t) + 0.04 * np.sin(8 * t)
+    passo = np.hypot(np.diff(x, append=x[0]), np.diff(y, append=y[0]))
+    escala = COMPRIMENTO_PISTA / passo.sum()
+    x, y, passo = x * escala, y * escala, passo * escala
+    distancia = np.concatenate([[0.0], np.cumsum(passo)[:-1]])
+
+    dx, dy = np.gradient(x), np.gradient(y)
+    ddx, ddy = np.gradient(dx), np.gradient(dy)
+    curvatura = np.abs(dx * ddy - dy * ddx) / np.power(dx * dx + dy * dy, 1.5)
+    v = np.minimum(np.sqrt(ACEL_LATERAL / np.maximum(curvatura, 1e-9)), V_MAX)  # m/s
+
+    # Duas voltas seguidas em cada sentido para o perfil fechar no ponto de partida
+    for _ in range(2):
+        for i in range(1, n + 1):
+            v[i % n] = min(v[i % n], np.sqrt(v[i - 1] ** 2 + 2 * ACEL_TRACAO * passo[i - 1]))
+        for i in range(n - 1, -1, -1):
+            v[i] = min(v[i], np.sqrt(v[(i + 1) % n] ** 2 + 2 * ACEL_FRENAGEM * passo[i]))
+    return distancia, x, y, v * 3.6
+
+
+class SessaoSintetica:
+    """Sessao com a mesma interface usada pelo F1DataHandler, gerada localmente.
+
+    Args:
+        ano, gp, sessao: Identificacao da sessao (apenas informativa).
+        n_pilotos (int): Numero de pilotos.
+        n_voltas (int): Voltas por piloto.
+        frequencia_hz (float): Taxa de amostragem de car_data/pos_data (~3.7 Hz no feed real).
+        semente (int): Semente do gerador aleatorio.
+    """
+
+    def __init__(self, ano=2025, gp="Sintetico", sessao="R", n_pilotos=20, n_voltas=70, frequencia_hz=3.7,
+                 semente=0):
+        self.event = pd.Series({"year": ano, "EventName": f"{gp} Grand Prix", "Location": gp})
+        self.name = sessao
+        self.api_path = None
+        self.t0_date = T0_DATE
+        self.n_pilotos = n_pilotos
+        self.n_voltas = n_voltas
+        self.frequencia_hz = frequencia_hz
+        self._rng = np.random.default_rng(semente)
+        self._pista = _tracado()
+        self.drivers = [str(num) for num in range(1, n_pilotos + 1)]
+        self._laps = None
+        self._car_data = None
+        self._pos_data = None
+        self._weather_data = None
+        self._results = self._gerar_resultados()
+        self._ritmo = 1.0 + 0.0025 * np.arange(n_pilotos) + self._rng.normal(0, 0.001, n_pilotos)
+
+    # Interface usada pelo F1DataHandler -------------------------------------------------------------------
+
+    def load(self, *, laps=True, telemetry=True, weather=True, messages=True, livedata=None):
+        """Gera os dados pedidos, no mesmo espirito de `fastf1.core.Session.load`."""
+        if laps:
+            self._gerar_voltas()
+        if telemetry:
+            self._load_telemetry()
+        if weather:
+            self._load_weather_data()
+
+    def _load_telemetry(self, livedata=None):
+        if self._laps is None:
+            self._gerar_voltas()
+        self._car_data, self._pos_data = self._gerar_telemetria()
+
+    def _load_weather_data(self, livedata=None):
+        minutos = int(self.n_voltas * 1.6) + 10
+        tempo = pd.to_timedelta(np.arange(minutos) * 60.0, unit="s")
+        self._weather_data = pd.DataFrame({
+            "Time": tempo,
+            "AirTemp": 22 + self._rng.normal(0, 0.3, minutos),
+            "Humidity": 55 + self._rng.normal(0, 1, minutos),
+            "Pressure": 1012 + self._rng.normal(0, 0.5, minutos),
+            "Rainfall": np.zeros(minutos, dtype=bool),
+            "TrackTemp": 35 + self._rng.normal(0, 0.5, minutos),
+            "WindDirection": self._rng.integers(0, 360, minutos),
+            "WindSpeed": np.abs(2 + self._rng.normal(0, 0.5, minutos)),
+        })
+
+    @property
+    def laps(self):
+        return self._laps
+
+    @property
+    def car_data(self):
+        return self._car_data
+
+    @property
+    def pos_data(self):
+        return self._pos_data
+
+    @property
+    def weather_data(self):
+        return self._weather_data
+
+    @property
+    def results(self):
+        return self._results
+
+    def get_driver(self, identifier):
+        mask = (self._results["Abbreviation"] == identifier) | (self._results["DriverNumber"] == identifier)
+        if not mask.any():
+            raise ValueError(f"Invalid driver identifier '{identifier}'")
+        return self._results[mask].iloc[0]
+
+    def get_circuit_info(self):
+        distancia, x, y, v = self._pista
+        # Curvas nos minimos locais de velocidade
+        minimos = np.flatnonzero((v < np.roll(v, 1)) & (v <= np.roll(v, -1)) & (v < 250))
+        corners = pd.DataFrame({
+            "X": x[minimos], "Y": y[minimos], "Number": np.arange(1, len(minimos) + 1), "Letter": "",
+            "Angle": 0.0, "Distance": distancia[minimos],
+        })
+        vazio = corners.iloc[0:0]
+        return CircuitInfo(corners=corners, marshal_lights=vazio, marshal_sectors=vazio, rotation=0.0)
+
+    # Geracao ----------------------------------------------------------------------------------------------
+
+    def _gerar_resultados(self):
+        numeros = self.drivers
+        df = pd.DataFrame({
+            "DriverNumber": numeros,
+            "BroadcastName": [ABREVIATURAS[i] for i in range(self.n_pilotos)],
+            "Abbreviation": [ABREVIATURAS[i] for i in range(self.n_pilotos)],
+            "TeamName": [EQUIPES[(i // 2) % len(EQUIPES)] for i in range(self.n_pilotos)],
+            "Position": np.arange(1, self.n_pilotos + 1, dtype=float),
+            "GridPosition": np.arange(1, self.n_pilotos + 1, dtype=float),
+        }, index=numeros)
+        return SessionResults(df, _force_default_cols=True)
+
+    def _tempos_volta(self, i_piloto):
+        """Tempo de cada volta do piloto (s), com desgaste de pneu e ruido."""
+        distancia, _, _, v = self._pista
+        ds = np.diff(np.append(distancia, COMPRIMENTO_PISTA))
+        base = np.sum(ds / (v / 3.6))
+        voltas = np.arange(self.n_voltas)
+        stint_len = max(self.n_voltas // 3, 1)
+        idade = voltas % stint_len
+        tempos = base * self._ritmo[i_piloto] * (1 + 0.0008 * idade) + self._rng.normal(0, 0.15, self.n_voltas)
+        tempos[0] += 4.0
+        return tempos
+
+    def _gerar_voltas(self):
+        if self._laps is not None:
+            return
+        frames = []
+        stint_len = max(self.n_voltas // 3, 1)
+        for i, drv in enumerate(self.drivers):
+            tempos = self._tempos_volta(i)
+            fim = INICIO_SESSAO + np.cumsum(tempos)
+            inicio = fim - tempos
+            stint = np.arange(self.n_voltas) // stint_len + 1
+            s1, s2 = tempos * 0.31, tempos * 0.37
+            s3 = tempos - s1 - s2
+            td = lambda valores: pd.to_timedelta(valores, unit="s")
+            frames.append(pd.DataFrame({
+                "Time": td(fim),
+                "Driver": ABREVIATURAS[i],
+                "DriverNumber": drv,
+                "LapTime": td(tempos),
+                "LapNumber": np.arange(1, self.n_voltas + 1, dtype=float),
+                "Stint": stint.astype(float),
+                "Sector1Time": td(s1), "Sector2Time": td(s2), "Sector3Time": td(s3),
+                "Sector1SessionTime": td(inicio + s1), "Sector2SessionTime": td(inicio + s1 + s2),
+                "Sector3SessionTime": td(fim),
+                "Compound": [COMPOSTOS[(s - 1) % len(COMPOSTOS)] for s in stint],
+                "TyreLife": (np.arange(self.n_voltas) % stint_len + 1).astype(float),
+                "FreshTyre": True,
+                "Team": self._results["TeamName"].iloc[i],
+                "LapStartTime": td(inicio),
+                "LapStartDate": self.t0_date + td(inicio),
+                "TrackStatus": "1",
+                "Position": float(i + 1),
+                "Deleted": False,
+                "FastF1Generated": False,
+                "IsAccurate": True,
+            }))
+        self._laps = Laps(pd.concat(frames, ignore_index=True), session=self, _force_default_cols=True)
+
+    def _gerar_telemetria(self):
+        distancia, x, y, v = self._pista
+        ds = np.diff(np.append(distancia, COMPRIMENTO_PISTA))
+        tempo_pista = np.concatenate([[0.0], np.cumsum(ds / (v / 3.6))])  # tempo ideal ate cada ponto
+        dist_ext = np.append(distancia, COMPRIMENTO_PISTA)
+        aceleracao = (v / 3.6) * np.gradient(v / 3.6, distancia)  # m/s2 longitudinal
+        # No feed real todos os carros compartilham os mesmos instantes de amostragem de cada fonte
+        fim_sessao = self._laps["Time"].max().total_seconds() + 10
+        intervalo = 1.0 / self.frequencia_hz
+        n = int((fim_sessao - INICIO_SESSAO + 20) / intervalo)
+        base_tempo = {fonte: INICIO_SESSAO - 10 + np.cumsum(self._rng.uniform(0.6, 1.4, n) * intervalo)
+                      for fonte in ("car", "pos")}
+        car_data, pos_data = {}, {}
+        for i, drv in enumerate(self.drivers):
+            laps = self._laps[self._laps["DriverNumber"] == drv]
+            inicio = laps["LapStartTime"].dt.total_seconds().to_numpy()
+            tempos = laps["LapTime"].dt.total_seconds().to_numpy()
+            for fonte, destino in (("car", car_data), ("pos", pos_data)):
+                t = base_tempo[fonte]
+                volta = np.clip(np.searchsorted(inicio, t, side="right") - 1, 0, len(inicio) - 1)
+                fracao = np.clip((t - inicio[volta]) / tempos[volta], 0, 1)
+                s = np.interp(fracao * tempo_pista[-1], tempo_pista, dist_ext) % COMPRIMENTO_PISTA
+                tempo_sessao = pd.to_timedelta(t, unit="s")
+                dados = {"Date": self.t0_date + tempo_sessao, "SessionTime": tempo_sessao, "Time": tempo_sessao}
+                if fonte == "car":
+                    velocidade = np.interp(s, distancia, v) / self._ritmo[i] + self._rng.normal(0, 0.8, n)
+                    marcha = np.clip(np.digitize(velocidade, [90, 130, 165, 200, 235, 265, 295]) + 1, 1, 8)
+                    acel = np.interp(s, distancia, aceleracao)
+                    drs_zona = ((s > 100) & (s < 900)) | ((s > 2900) & (s < 3500))
+                    dados.update({
+                        "RPM": 7000 + (velocidade % 40) * 120 + marcha * 250,
+                        "Speed": velocidade,
+                        "nGear": marcha.astype(int),
+                        "Throttle": np.where(velocidade > V_MAX * 3.6 * 0.97, 100.0, np.clip(45 + acel * 8, 0, 100)),
+                        "Brake": acel < -8,
+                        "DRS": np.where(drs_zona & (volta > 1), 12, 0).astype(int),
+                        "Source": fonte,
+                    })
+                else:
+                    dados.update({
+                        "Status": "OnTrack",
+                        "X": np.interp(s, distancia, x) * 10,
+                        "Y": np.interp(s, distancia, y) * 10,
+                        "Z": np.zeros(n),
+                        "Source": fonte,
+                    })
+                destino[drv] = Telemetry(pd.DataFrame(dados), session=self, driver=drv)
+        return car_data, pos_data
+
+
+def fabrica_sintetica(**opcoes):
+    """Retorna uma funcao com a assinatura de `fastf1.get_session` que gera sessoes sinteticas.
+
+    A funcao e serializavel, entao tambem chega aos processos dos pools (forkserver/spawn) do handler.
+    """
+    return partial(SessaoSintetica, **opcoes)
@@ -0,0 +1,128 @@
+import numpy as np
+
+# Canais alinhados por padrao (Time em segundos desde o inicio da volta)
+CANAIS_ALINHADOS = ("Speed", "Throttle", "Brake", "nGear", "RPM", "DRS", "X", "Y", "Time")
+
+# Canais discretos usam a amostra mais proxima em vez de interpolacao linear (sem marcha 4.5 ou DRS 6)
+CANAIS_DISCRETOS = frozenset({"Brake", "nGear", "DRS"})
+
+# Canais extrapolados linearmente alem das bordas da volta; os demais repetem o valor da borda
+CANAIS_EXTRAPOLADOS = frozenset({"Time"})
+
+
+class VoltasAlinhadas:
+    """Resultado do alinhamento: N voltas reamostradas numa grade de distancia comum.
+
+    Attributes:
+        grade (numpy.ndarray): Distancias da grade (n_amostras,), crescente.
+        dados (numpy.ndarray): Array float64 (n_voltas, n_canais, n_amostras).
+        canais (tuple): Nome de cada canal, na ordem do segundo eixo de `dados`.
+    """
+
+    def __init__(self, grade, dados, canais):
+        self.grade = grade
+        self.dados = dados
+        self.canais = tuple(canais)
+        self._indices = {canal: i for i, canal in enumerate(self.canais)}
+
+    def __contains__(self, canal):
+        return canal in self._indices
+
+    def canal(self, canal):
+        """Retorna o canal para todas as voltas, como view (n_voltas, n_amostras)."""
+        return self.dados[:, self._indices[canal], :]
+
+
+def _valores_canal(tel, canal):
+    """Extrai um canal como float64 (Time convertido para segundos); NaN se o canal nao existir.
+
+    Aceita a `TelemetriaVolta` (arrays, Time ja em segundos) e DataFrames de telemetria do fastf1.
+    """
+    if canal not in tel:
+        return np.full(len(tel), np.nan)
+    serie = tel[canal]
+    if isinstance(serie, np.ndarray):
+        return serie.astype(np.float64)
+    if canal == "Time" and serie.dtype.kind == "m":
+        return serie.dt.total_seconds().to_numpy(dtype=np.float64)
+    return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _preencher_nan(valores):
+    """Preenche NaN de cada canal interpolando pelas amostras validas vizinhas (linhas todas NaN ficam NaN)."""
+    faltando = np.isnan(valores)
+    if not faltando.any():
+        return valores
+    valores = valores.copy()
+    posicoes = np.arange(valores.shape[1])
+    for linha in np.flatnonzero(faltando.any(axis=1)):
+        validos = ~faltando[linha]
+        if validos.any():
+            valores[linha, ~validos] = np.interp(posicoes[~validos], posicoes[validos], valores[linha, validos])
+    return valores
+
+
+def distancia_monotonica(distancia):
+    """Corrige a distancia para ser estritamente crescente.
+
+    Retorna a distancia corrigida e as posicoes das amostras mantidas: recuos (ruido da interpolacao do
+    fastf1) viram patamares pelo maximo acumulado, e amostras repetidas nos patamares sao descartadas.
+    """
+    distancia = np.maximum.accumulate(np.nan_to_num(distancia, nan=-np.inf))
+    distancia, mantidas = np.unique(distancia, return_index=True)
+    validas = np.isfinite(distancia)
+    return distancia[validas], mantidas[validas]
+
+
+def alinhar_voltas(telemetrias, canais=CANAIS_ALINHADOS, grade=None):
+    """Reamostra todos os canais de N voltas numa grade de distancia comum, de uma vez.
+
+    Para cada volta a busca na grade (`searchsorted`) e os pesos de interpolacao sao calculados uma unica
+    vez e aplicados a todos os canais juntos. A distancia e corrigida para ser monotonica, NaN sao
+    preenchidos pelas amostras vizinhas em vez de zero, e fora da volta o Time e extrapolado linearmente
+    enquanto os demais canais repetem o valor da borda.
+
+    Args:
+        telemetrias (list): Telemetrias das voltas (TelemetriaVolta ou DataFrames com 'Distance' e os canais
+            pedidos).
+        canais (tuple): Canais a alinhar.
+        grade (numpy.ndarray, opcional): Grade de distancia. Por padrao, uma grade uniforme do inicio ao fim
+            da primeira volta (referencia) com o mesmo numero de amostras dela.
+
+    Returns:
+        VoltasAlinhadas
+    """
+    canais = tuple(canais)
+    if grade is None:
+        distancia_ref, _ = distancia_monotonica(_valores_canal(telemetrias[0], "Distance"))
+        grade = np.linspace(distancia_ref[0], distancia_ref[-1], max(len(distancia_ref), 2))
+    grade = np.asarray(grade, dtype=np.float64)
+
+    discretos = np.array([canal in CANAIS_DISCRETOS for canal in canais])
+    extrapolados = np.array([canal in CANAIS_EXTRAPOLADOS for canal in canais])
+    dados = np.empty((len(telemetrias), len(canais), len(grade)))
+
+    for i, tel in enumerate(telemetrias):
+        distancia, mantidas = distancia_monotonica(_valores_canal(tel, "Distance"))
+        valores = np.vstack([_valores_canal(tel, canal)[mantidas] for canal in canais])
+        valores = _preencher_nan(valores)
+
+        if len(distancia) < 2:
+            dados[i] = valores[:, :1] if len(distancia) else np.nan
+            continue
+
+        # Segmento [d[j-1], d[j]] de cada ponto da grade; as bordas usam o primeiro/ultimo segmento
+        j = np.clip(np.searchsorted(distancia, grade), 1, len(distancia) - 1)
+        d0, d1 = distancia[j - 1], distancia[j]
+        peso = (grade - d0) / (d1 - d0)
+        peso_limitado = np.clip(peso, 0.0, 1.0)
+
+        v0, v1 = valores[:, j - 1], valores[:, j]
+        linear = v0 + (v1 - v0) * peso_limitado
+        if extrapolados.any():
+            linear[extrapolados] = v0[extrapolados] + (v1[extrapolados] - v0[extrapolados]) * peso
+        if discretos.any():
+            linear[discretos] = np.where(peso_limitado < 0.5, v0[discretos], v1[discretos])
+        dados[i] = linear
+
+    return VoltasAlinhadas(grade, dados, canais)
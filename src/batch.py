@@ -0,0 +1,179 @@
+"""Modo em lote: renderiza comparacoes de voltas em PNG, sem interface grafica.
+
+Uso:
+    python src/batch.py trabalhos.json [--saida graficos] [--processos 4] [--dpi 150]
+
+O arquivo de trabalhos e uma lista JSON, um item por sessao:
+
+    [
+        {"ano": 2025, "gp": "China", "sessao": "R",
+         "pares": "companheiros", "voltas": "mais_rapida", "tipos": ["Velocidade", "Delta"]},
+        {"ano": 2025, "gp": "China", "sessao": "Q", "pares": [["VER", "NOR"], ["LEC", "HAM"]], "voltas": [5, 8]}
+    ]
+
+- pares: "companheiros" (padrao) compara cada piloto com o companheiro de equipe; ou uma lista de pares.
+- voltas: "mais_rapida" (padrao) usa a volta mais rapida de cada piloto; ou uma lista de numeros de volta,
+  comparando a mesma volta dos dois pilotos.
+- tipos: tipos de grafico (padrao: todos de TIPOS_GRAFICOS).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from config import TIPOS_GRAFICOS  # noqa: E402
+from data_handler import F1DataHandler  # noqa: E402
+from extraction import contexto_processos  # noqa: E402
+from plotter import F1Plotter  # noqa: E402
+
+# Estado de cada processo do pool: cada processo carrega a sessao do cache em disco do fastf1 (e le a
+# telemetria ja extraida pelo processo principal no armazem).
+_handler = None
+_plotter = None
+
+
+def _nome_arquivo(valor):
+    """Converte um componente do nome do arquivo em texto seguro."""
+    return re.sub(r"[^\w-]+", "_", str(valor)).strip("_")
+
+
+def _iniciar_worker(session_key):
+    """Prepara o processo do pool para renderizar a sessao informada."""
+    global _handler, _plotter
+    if _handler is None or _handler.last_session_key != session_key:
+        # So o processo principal mantem o indice do cache em disco
+        _handler = F1DataHandler(indexar_cache_disco=False)
+        success, msg, _, _ = _handler.carregar_dados(*session_key)
+        if not success:
+            raise RuntimeError(msg)
+    _plotter = F1Plotter(None)
+
+
+def _renderizar(selecao, tipos, diretorio, dpi):
+    """Renderiza todos os tipos de grafico de uma selecao de voltas.
+
+    Os dados sao carregados e alinhados uma vez; os tipos seguintes so trocam os valores no grafico.
+
+    Returns:
+        tuple: (arquivos gravados, mensagens de erro)
+    """
+    arquivos, erros = [], []
+    try:
+        dados = _plotter.load_telemetry_data(_handler, selecao)
+    except Exception as e:
+        return arquivos, [f"{selecao}: {e}"]
+
+    base = "_vs_".join(f"{piloto}_V{volta}" for piloto, volta in selecao)
+    plotado = False
+    for tipo in tipos:
+        if plotado:
+            success, msg = _plotter.trocar_tipo(tipo)
+        else:
+            success, msg = _plotter.plot_comparacao(_handler, selecao, tipo, dados=dados)
+            plotado = success
+        if not success:
+            erros.append(f"{base} {tipo}: {msg}")
+            continue
+        caminho = os.path.join(diretorio, f"{base}_{_nome_arquivo(tipo)}.png")
+        _plotter.salvar_grafico(caminho, dpi=dpi)
+        arquivos.append(caminho)
+    return arquivos, erros
+
+
+def expandir_trabalho(data_handler, trabalho):
+    """Monta as selecoes [(piloto1, volta1), (piloto2, volta2)] de um trabalho na sessao carregada."""
+    pares = trabalho.get("pares", "companheiros")
+    if pares == "companheiros":
+        equipes = {}
+        for piloto in data_handler.get_pilotos():
+            equipes.setdefault(data_handler.get_driver_info(piloto)[0], []).append(piloto)
+        pares = [pilotos[:2] for pilotos in equipes.values() if len(pilotos) >= 2]
+
+    voltas = trabalho.get("voltas", "mais_rapida")
+    selecoes = []
+    for piloto1, piloto2 in pares:
+        indice1 = data_handler.get_indice_voltas(piloto1)
+        indice2 = data_handler.get_indice_voltas(piloto2)
+        if indice1 is None or indice2 is None:
+            print(f"Aviso: {piloto1} ou {piloto2} sem voltas nesta sessão.", file=sys.stderr)
+            continue
+        if voltas == "mais_rapida":
+            numeros = [(indice1.mais_rapida(), indice2.mais_rapida())]
+        else:
+            numeros = [(volta, volta) for volta in voltas]
+        for volta1, volta2 in numeros:
+            if volta1 in indice1.posicoes and volta2 in indice2.posicoes:
+                selecoes.append([(piloto1, volta1), (piloto2, volta2)])
+            else:
+                print(f"Aviso: volta inexistente em {piloto1} V{volta1} / {piloto2} V{volta2}.", file=sys.stderr)
+    return selecoes
+
+
+def executar(trabalhos, saida, processos, dpi):
+    """Executa os trabalhos e retorna o total de imagens gravadas."""
+    data_handler = F1DataHandler()
+    contexto = contexto_processos()
+    total = 0
+    inicio = time.perf_counter()
+
+    for trabalho in trabalhos:
+        session_key = (trabalho["ano"], trabalho["gp"], trabalho["sessao"])
+        success, msg, _, _ = data_handler.carregar_dados(*session_key)
+        if not success:
+            print(f"{session_key}: {msg}", file=sys.stderr)
+            continue
+
+        selecoes = expandir_trabalho(data_handler, trabalho)
+        tipos = trabalho.get("tipos", TIPOS_GRAFICOS)
+        diretorio = os.path.join(saida, "_".join(_nome_arquivo(valor) for valor in session_key))
+        os.makedirs(diretorio, exist_ok=True)
+
+        # Telemetria de todas as voltas extraida uma vez (em paralelo) para o armazem; os processos do pool
+        # so leem os arquivos de coluna por memmap
+        voltas = sorted({volta for selecao in selecoes for volta in selecao})
+        success, msg, _ = data_handler.get_telemetrias(voltas)
+        if not success:
+            print(f"{session_key}: {msg}", file=sys.stderr)
+
+        inicio_sessao = time.perf_counter()
+        imagens = 0
+        with ProcessPoolExecutor(processos, mp_context=contexto, initializer=_iniciar_worker,
+                                 initargs=(session_key,)) as executor:
+            futuros = [executor.submit(_renderizar, selecao, tipos, diretorio, dpi) for selecao in selecoes]
+            for futuro in as_completed(futuros):
+                arquivos, erros = futuro.result()
+                imagens += len(arquivos)
+                for erro in erros:
+                    print(f"Erro: {erro}", file=sys.stderr)
+        duracao = time.perf_counter() - inicio_sessao
+        print(f"{session_key}: {imagens} imagens em {duracao:.1f} s ({imagens / max(duracao, 1e-9):.2f} imagens/s)")
+        total += imagens
+
+    duracao = time.perf_counter() - inicio
+    print(f"Total: {total} imagens em {duracao:.1f} s ({total / max(duracao, 1e-9):.2f} imagens/s)")
+    return total
+
+
+def main():
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Renderiza comparações de voltas em lote, sem interface.")
+    parser.add_argument("trabalhos", help="Arquivo JSON com a lista de trabalhos")
+    parser.add_argument("--saida", default="graficos", help="Diretório das imagens (padrão: graficos)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="Processos de renderização")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolução das imagens (padrão: 150)")
+    args = parser.parse_args()
+
+    with open(args.trabalhos, encoding="utf-8") as arquivo:
+        trabalhos = json.load(arquivo)
+    executar(trabalhos, args.saida, args.processos, args.dpi)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import time
+from tkinter import messagebox
+
+import customtkinter as ctk
+
+
+def formatar_bytes(valor):
+    """Formata um tamanho em bytes (ex.: '512 KB', '1.3 GB')."""
+    for unidade in ("B", "KB", "MB"):
+        if valor < 1024:
+            return f"{valor:.0f} {unidade}"
+        valor /= 1024
+    return f"{valor:.1f} GB"
+
+
+class PainelCacheDisco(ctk.CTkToplevel):
+    """Janela com as sessoes do cache em disco: tamanho, acertos, ultimo acesso e remocao individual.
+
+    As consultas e remocoes rodam no worker de dados, como as demais chamadas ao data handler.
+    """
+
+    COLUNAS = ("Sessão", "Tamanho", "Acertos", "Último acesso", "")
+
+    def __init__(self, master, worker, data_handler):
+        super().__init__(master)
+        self.title("Cache em Disco")
+        self.geometry("760x420")
+        self.worker = worker
+        self.data_handler = data_handler
+
+        self.resumo_label = ctk.CTkLabel(self, text="Carregando...")
+        self.resumo_label.pack(padx=10, pady=(10, 5), anchor="w")
+
+        self.lista_frame = ctk.CTkScrollableFrame(self, corner_radius=10)
+        self.lista_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.lista_frame.grid_columnconfigure(0, weight=1)
+
+        self.atualizar_button = ctk.CTkButton(self, text="Atualizar", command=self.atualizar, corner_radius=8)
+        self.atualizar_button.pack(pady=(5, 10))
+
+        self.atualizar()
+
+    def atualizar(self):
+        """Busca a lista de sessoes do cache no worker."""
+        self.worker.executar(self.data_handler.listar_cache_disco, ao_concluir=self._mostrar,
+                             ao_erro=self._mostrar_erro)
+
+    def _mostrar(self, resultado):
+        """Preenche a tabela com as sessoes do cache."""
+        if not self.winfo_exists():
+            return
+        success, msg, entradas = resultado
+        if not success:
+            self._mostrar_erro(msg)
+            return
+
+        for widget in self.lista_frame.winfo_children():
+            widget.destroy()
+        for coluna, titulo in enumerate(self.COLUNAS):
+            ctk.CTkLabel(self.lista_frame, text=titulo, font=ctk.CTkFont(weight="bold")).grid(
+                row=0, column=coluna, padx=5, pady=2, sticky="w")
+
+        for linha, entrada in enumerate(entradas, start=1):
+            acesso = time.strftime("%d/%m/%Y %H:%M", time.localtime(entrada["ultimo_acesso"]))
+            valores = (entrada["rotulo"], formatar_bytes(entrada["bytes"]), str(entrada["acertos"]), acesso)
+            for coluna, valor in enumerate(valores):
+                ctk.CTkLabel(self.lista_frame, text=valor).grid(row=linha, column=coluna, padx=5, pady=2, sticky="w")
+            if entrada["em_uso"]:
+                ctk.CTkLabel(self.lista_frame, text="em uso").grid(row=linha, column=4, padx=5, pady=2)
+            else:
+                ctk.CTkButton(self.lista_frame, text="Remover", width=80, corner_radius=8,
+                              command=lambda e=entrada: self.remover(e)).grid(row=linha, column=4, padx=5, pady=2)
+
+        total = sum(entrada["bytes"] for entrada in entradas)
+        limite = self.data_handler.cache_disco.limite_bytes
+        self.resumo_label.configure(
+            text=f"{len(entradas)} sessões, {formatar_bytes(total)} de {formatar_bytes(limite)}")
+
+    def remover(self, entrada):
+        """Remove uma sessao do cache depois de confirmar."""
+        if not messagebox.askyesno("Remover do cache", f"Remover {entrada['rotulo']} "
+                                   f"({formatar_bytes(entrada['bytes'])}) do cache?", parent=self):
+            return
+        self.worker.executar(self.data_handler.remover_cache_disco, entrada["id"], ao_concluir=self._removida,
+                             ao_erro=self._mostrar_erro)
+
+    def _removida(self, resultado):
+        """Mostra o resultado da remocao e atualiza a lista."""
+        success, msg = resultado
+        if not self.winfo_exists():
+            return
+        if not success:
+            messagebox.showerror("Erro", msg, parent=self)
+        self.atualizar()
+
+    def _mostrar_erro(self, erro):
+        if self.winfo_exists():
+            messagebox.showerror("Erro", str(erro), parent=self)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+
+class MapaCircuito:
+    """Geometria do mini-mapa de uma sessao, pronta para desenhar como uma unica LineCollection.
+
+    Attributes:
+        segmentos (numpy.ndarray): Segmentos do tracado (n_segmentos, 2, 2), em coordenadas X/Y.
+        setor (numpy.ndarray): Setor de cada segmento (0, 1, 2...), ou -1 quando nao ha tempos de setor.
+        drs (numpy.ndarray): Indica se o segmento esta numa zona de DRS.
+        setores (list): Distancias das divisas entre setores.
+        distancia (numpy.ndarray): Distancia na volta do inicio de cada segmento.
+        cores (numpy.ndarray): Cor RGBA de cada segmento no lugar das cores de setor/DRS, ou None.
+        limites (tuple): (xmin, xmax, ymin, ymax) do tracado.
+    """
+
+    def __init__(self, segmentos, setor, drs, setores, distancia, cores=None):
+        self.segmentos = segmentos
+        self.setor = setor
+        self.drs = drs
+        self.setores = setores
+        self.distancia = distancia
+        self.cores = cores
+        pontos = segmentos.reshape(-1, 2)
+        if len(pontos):
+            self.limites = (np.nanmin(pontos[:, 0]), np.nanmax(pontos[:, 0]),
+                            np.nanmin(pontos[:, 1]), np.nanmax(pontos[:, 1]))
+        else:
+            self.limites = (0.0, 1.0, 0.0, 1.0)
+
+    def com_cores(self, cores):
+        """Retorna o mesmo tracado com uma cor por segmento (ex.: dominancia por mini-setor)."""
+        return MapaCircuito(self.segmentos, self.setor, self.drs, self.setores, self.distancia, cores)
+
+
+def distancias_setores(tel, lap):
+    """Distancia das divisas de setor da volta, a partir dos tempos de setor 1 e 2."""
+    if "Time" not in tel or lap is None:
+        return []
+    tempo = np.asarray(tel["Time"], dtype=float)
+    distancia = np.asarray(tel["Distance"], dtype=float)
+    divisas = []
+    acumulado = 0.0
+    for coluna in ("Sector1Time", "Sector2Time"):
+        duracao = lap.get(coluna)
+        if duracao is None or pd.isna(duracao):
+            return []
+        acumulado += duracao.total_seconds()
+        divisas.append(float(np.interp(acumulado, tempo, distancia)))
+    return divisas
+
+
+def montar_mapa_circuito(tel, lap=None):
+    """Monta o mini-mapa a partir da telemetria de uma volta (tracado, setores e zonas de DRS).
+
+    Args:
+        tel (TelemetriaVolta): Telemetria com 'X', 'Y' e 'Distance' (e 'DRS'/'Time' quando houver).
+        lap (fastf1 Lap, opcional): Volta da telemetria, para as divisas de setor.
+    """
+    pontos = np.column_stack([np.asarray(tel["X"], dtype=float), np.asarray(tel["Y"], dtype=float)])
+    segmentos = np.stack([pontos[:-1], pontos[1:]], axis=1)
+    distancia = np.asarray(tel["Distance"], dtype=float)
+
+    setores = distancias_setores(tel, lap)
+    if setores:
+        setor = np.searchsorted(setores, distancia[:-1], side="right")
+    else:
+        setor = np.full(len(segmentos), -1)
+
+    if "DRS" in tel:
+        drs = np.asarray(tel["DRS"])[:-1] > 0
+    else:
+        drs = np.zeros(len(segmentos), dtype=bool)
+    return MapaCircuito(segmentos, setor, drs, setores, distancia[:-1])
@@ -24,3 +24,39 @@ SESSOES_DISPONIVEIS = ["FP1", "FP2", "FP3", "Q", "R", "Sprint", "Sprint Shootout
 CACHE_DIR = "cache_f1"
 
 TIPOS_GRAFICOS = ["Velocidade", "Delta", "Acelerador", "Freio", "Marcha", "RPM", "DRS", "Velocidade do Vento"]
+
+INTERVALO_FILA_MS = 50  # Intervalo de leitura da fila do worker pela interface
+
+CACHE_SESSOES_MAX_BYTES = 2 * 1024 ** 3  # Orcamento de memoria para as sessoes mantidas em memoria
+
+CACHE_DISCO_MAX_BYTES = 5 * 1024 ** 3  # Orcamento do cache em disco (fastf1 + telemetria por volta)
+
+PRE_CARGA_MAX_PENDENTES = 6  # Voltas na fila da pre-carga em segundo plano (as menos provaveis ficam de fora)
+
+PRE_CARGA_LIMITE_MEMORIA = 0.8  # Fracao do orcamento de sessoes acima da qual a pre-carga nao carrega pilotos novos
+
+MAX_WORKERS_TELEMETRIA = 8  # Voltas extraidas em paralelo pelo extrator de telemetria
+
+MIN_VOLTAS_POOL_TELEMETRIA = 12  # Voltas pendentes a partir das quais a extracao vai para o pool de processos
+
+MAX_PROCESSOS_SESSOES = 3  # Sessoes carregadas ao mesmo tempo na comparacao entre sessoes
+
+VOLTAS_OUTRAS_SESSOES_MAX = 64  # Voltas de outras sessoes guardadas em memoria (arrays compactos, ~21 KB cada)
+
+MINI_SETORES = 25  # Mini-setores de mesma distancia no mapa de dominancia
+
+REPLAY_FPS = 60  # Quadros por segundo do replay no mini-mapa
+
+VELOCIDADES_REPLAY = ["0.5x", "1x", "2x", "4x"]
+
+AO_VIVO_INTERVALO_MS = 1000  # Intervalo entre as leituras da origem no modo ao vivo
+
+AO_VIVO_ATRASO_VOLTA = 5.0  # Segundos apos o fim da volta em que tempo de volta e setores ainda contam para ela
+
+AO_VIVO_ESPERA_TELEMETRIA = 15.0  # Espera maxima (s) pelo car_data do fim da volta antes de publica-la
+
+AO_VIVO_DESISTIR_VOLTA = 120.0  # Segundos apos o fim da volta em que uma volta ainda sem telemetria e descartada
+
+CORES_EXTRAS = ["#FF3333", "#00FFFF", "#FFFF00", "#FF00FF", "#7CFC00", "#FF8C00", "#9370DB", "#40E0D0"]
+
+RASTREAMENTO_MAX_TRECHOS = 50000  # Trechos de tempo guardados pelo rastreador (os mais antigos sao descartados)
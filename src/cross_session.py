@@ -0,0 +1,128 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_SESSOES_MAX_BYTES, MAX_PROCESSOS_SESSOES, VOLTAS_OUTRAS_SESSOES_MAX
+from extraction import contexto_processos, handler_da_sessao, iniciar_processo
+from lap_telemetry import TelemetriaVolta
+
+
+def _extrair_sessao(session_key, voltas):
+    """Roda no processo do pool: carrega a sessao e devolve so o necessario das voltas pedidas.
+
+    A telemetria volta como `TelemetriaVolta` com arrays comuns (copiados dos memmaps do armazem) e cada volta
+    como uma `pd.Series` simples: o `Lap` do fastf1 carrega a sessao inteira junto quando e serializado.
+
+    Returns:
+        dict: `voltas` ((piloto, volta) -> (tel, lap, equipe, posicao)), `clima` e `diretorios` da sessao.
+    """
+    handler = handler_da_sessao(session_key)
+    resultados = {}
+    for piloto, volta in voltas:
+        success, msg, tel, lap = handler.get_telemetria(piloto, volta)
+        if not success:
+            raise ValueError(f"{piloto} volta {volta}: {msg}")
+        compacta = TelemetriaVolta(**{canal: np.array(tel[canal]) for canal in tel.canais})
+        equipe, posicao = handler.get_driver_info(piloto)
+        resultados[(piloto, volta)] = (compacta, pd.Series(dict(lap), name=lap.name), equipe, posicao)
+    return {"voltas": resultados, "clima": handler.get_weather_info(),
+            "diretorios": handler._diretorios_sessao(handler.last_session_key, handler.session)}
+
+
+def _processo_pronto():
+    """Tarefa vazia: so faz o pool subir um processo (o initializer ja cria o handler dele)."""
+    return True
+
+
+class ComparadorSessoes:
+    """Carrega voltas de outras sessoes (ano, gp, sessao) em paralelo, para comparar com a sessao atual.
+
+    Cada sessao e carregada inteira num processo de um pool limitado a `max_processos` (uma tarefa por
+    sessao, com todas as voltas pedidas dela), e so a telemetria dessas voltas atravessa de volta para o
+    processo da interface, mesmo quando falta uma sessao so: a sessao do fastf1 nunca ocupa memoria fora do
+    orcamento do handler principal. O pool fica aberto entre as comparacoes, entao so a primeira paga a
+    subida dos processos, e cada processo guarda as sessoes que ja carregou. As voltas recebidas ficam num LRU
+    de `max_voltas` entradas, entao repetir ou trocar o tipo da comparacao nao volta ao pool.
+
+    Args:
+        criar_handler (callable): Cria o F1DataHandler de cada processo (serializavel: vai pelo forkserver).
+    """
+
+    def __init__(self, criar_handler, max_processos=MAX_PROCESSOS_SESSOES, max_voltas=VOLTAS_OUTRAS_SESSOES_MAX):
+        self.criar_handler = criar_handler
+        self.max_processos = min(max_processos, os.cpu_count() or 1)
+        self.max_voltas = max_voltas
+        self._executor = None
+        self._voltas = OrderedDict()  # (session_key, piloto, volta) -> (tel, lap, equipe, posicao)
+        self._climas = {}
+
+    def _get_executor(self):
+        """Retorna o pool de processos, criando-o no primeiro uso."""
+        if self._executor is None:
+            # Mesmo contexto do extrator: o processo da interface ja tem threads, entao nada de fork
+            self._executor = ProcessPoolExecutor(self.max_processos, mp_context=contexto_processos(),
+                                                 initializer=iniciar_processo,
+                                                 initargs=(self.criar_handler,
+                                                           CACHE_SESSOES_MAX_BYTES // self.max_processos))
+        return self._executor
+
+    def aquecer(self):
+        """Sobe os processos do pool antes da primeira comparacao, para ela nao pagar a importacao do fastf1.
+
+        Returns:
+            list: Futuros que terminam quando cada processo esta pronto.
+        """
+        executor = self._get_executor()
+        return [executor.submit(_processo_pronto) for _ in range(self.max_processos)]
+
+    def carregar(self, pedidos):
+        """Retorna as voltas pedidas, buscando no pool so as que ainda nao estao em memoria.
+
+        Args:
+            pedidos (list): Trincas (session_key, piloto, volta), com a volta como rotulo do dropdown ou numero.
+
+        Returns:
+            tuple: ({(session_key, piloto, volta): (tel, lap, equipe, posicao)}, {session_key: clima},
+            {session_key: diretorios em disco} das sessoes carregadas agora)
+        """
+        por_sessao = {}
+        for chave in dict.fromkeys(pedidos):
+            if chave in self._voltas:
+                self._voltas.move_to_end(chave)
+            else:
+                por_sessao.setdefault(chave[0], []).append(chave[1:])
+
+        diretorios = {}
+        if por_sessao:
+            executor = self._get_executor()
+            futuros = {executor.submit(_extrair_sessao, session_key, voltas): session_key
+                       for session_key, voltas in por_sessao.items()}
+            for futuro in as_completed(futuros):
+                self._guardar(futuros[futuro], futuro.result(), diretorios)
+
+        resultados = {chave: self._voltas[chave] for chave in pedidos}
+        climas = {chave[0]: self._climas[chave[0]] for chave in pedidos}
+        while len(self._voltas) > self.max_voltas:
+            self._voltas.popitem(last=False)
+        # Clima so das sessoes que ainda tem alguma volta em memoria
+        em_uso = {session_key for session_key, _, _ in self._voltas}
+        self._climas = {chave: clima for chave, clima in self._climas.items() if chave in em_uso}
+        return resultados, climas, diretorios
+
+    def _guardar(self, session_key, resultado, diretorios):
+        """Guarda as voltas, o clima e os diretorios devolvidos para uma sessao."""
+        for (piloto, volta), item in resultado["voltas"].items():
+            self._voltas[(session_key, piloto, volta)] = item
+        self._climas[session_key] = resultado["clima"]
+        diretorios[session_key] = resultado["diretorios"]
+
+    def limpar(self):
+        """Esquece as voltas recebidas e encerra o pool (os handlers dos processos guardam sessoes)."""
+        self._voltas.clear()
+        self._climas.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
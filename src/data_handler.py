@@ -1,65 +1,404 @@
 import os
+from functools import partial
 
 import fastf1
 import numpy as np
 import pandas as pd
 
-from config import CACHE_DIR
+from alignment import CANAIS_ALINHADOS, alinhar_voltas
+from circuit_map import montar_mapa_circuito
+from config import CACHE_DIR, CACHE_DISCO_MAX_BYTES, CACHE_SESSOES_MAX_BYTES, MINI_SETORES, PRE_CARGA_LIMITE_MEMORIA
+from cross_session import ComparadorSessoes
+from disk_cache import CacheDisco
+from extraction import ExtratorTelemetria
+from lap_aggregates import CANAIS_AGREGADOS, agregar_voltas
+from live_timing import SessaoAoVivo, abrir_origem
+from mini_sectors import calcular_dominancia
+from session_cache import CacheSessoes
+from telemetry_loader import CarregadorTelemetria, internos_compativeis, telemetria_volta
+from telemetry_store import ArmazemTelemetria
+from tracing import medido, rastreador
 
 
-class F1DataHandler:
-    """Classe para gerenciar dados de telemetria da F1."""
+class IndiceVoltas:
+    """Indice das voltas de um piloto: numero da volta -> posicao na tabela, tempos e rotulos do dropdown."""
+
+    def __init__(self, laps, numeros, tempos, rotulos):
+        self.laps = laps
+        self.numeros = numeros
+        self.tempos = tempos
+        self.rotulos = rotulos
+        self.posicoes = dict(zip(numeros.tolist(), range(len(numeros))))
+        self.por_rotulo = dict(zip(rotulos.tolist(), numeros.tolist()))
+
+    def volta(self, numero):
+        """Retorna a volta (fastf1 Lap) com o numero informado."""
+        return self.laps.iloc[self.posicoes[numero]]
+
+    def numero(self, volta):
+        """Retorna o numero da volta a partir do rotulo 'Volta N - X.XXXs' (ou do proprio numero)."""
+        if not isinstance(volta, str) and int(volta) in self.posicoes:
+            return int(volta)
+        if volta not in self.por_rotulo:
+            raise ValueError(f"Volta invalida: {volta}")
+        return self.por_rotulo[volta]
+
+    def mais_rapida(self):
+        """Retorna o numero da volta mais rapida com tempo valido (ou None)."""
+        if np.isnan(self.tempos).all():
+            return None
+        return int(self.numeros[np.nanargmin(self.tempos)])
+
+    def ultima(self):
+        """Retorna o numero da ultima volta (ou None se nao houver voltas)."""
+        if not len(self.numeros):
+            return None
+        return int(self.numeros.max())
+
+
+class IndiceVoltasAoVivo(IndiceVoltas):
+    """IndiceVoltas de uma sessao ao vivo: cresce volta a volta (`anexar`), sem remontar a tabela de voltas."""
 
     def __init__(self):
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        fastf1.Cache.enable_cache(CACHE_DIR)
+        super().__init__([], np.empty(0, dtype=int), np.empty(0), np.empty(0, dtype=str))
+
+    def volta(self, numero):
+        return self.laps[self.posicoes[numero]]
+
+    def anexar(self, lap):
+        """Acrescenta uma volta (pd.Series com LapNumber e LapTime) e retorna o rotulo dela no dropdown."""
+        numero = int(lap["LapNumber"])
+        tempo = lap["LapTime"].total_seconds() if pd.notna(lap["LapTime"]) else np.nan
+        rotulo = f"Volta {numero} - " + ("Sem tempo" if np.isnan(tempo) else f"{tempo:.3f}s")
+        self.posicoes[numero] = len(self.laps)
+        self.por_rotulo[rotulo] = numero
+        self.laps.append(lap)
+        # Arrays de uma volta por posicao: copiar as voltas de um piloto a cada volta nova e desprezivel
+        self.numeros = np.append(self.numeros, numero)
+        self.tempos = np.append(self.tempos, tempo)
+        self.rotulos = np.append(self.rotulos, rotulo)
+        return rotulo
+
+
+def construir_indices_voltas(laps):
+    """Monta o IndiceVoltas de todos os pilotos de uma vez, com formatacao vetorizada dos rotulos."""
+    numeros = laps["LapNumber"].to_numpy(dtype=float).astype(int)
+    tempos = laps["LapTime"].dt.total_seconds().to_numpy()
+    tempos_str = np.where(np.isnan(tempos), "Sem tempo", np.char.add(np.char.mod("%.3f", tempos), "s"))
+    rotulos = np.char.add(np.char.add(np.char.add("Volta ", numeros.astype(str)), " - "), tempos_str)
+
+    indices = {}
+    for piloto, posicoes in laps.groupby("Driver", sort=False).indices.items():
+        indices[piloto] = IndiceVoltas(laps.iloc[posicoes], numeros[posicoes], tempos[posicoes], rotulos[posicoes])
+    return indices
+
+
+class F1DataHandler:
+    """Classe para gerenciar dados de telemetria da F1.
+
+    Args:
+        fabrica_sessao (callable, opcional): Funcao (ano, gp, sessao) -> sessao usada no lugar de
+            `fastf1.get_session`, por exemplo para gerar sessoes sinteticas nos benchmarks.
+        indexar_cache_disco (bool): Registra as sessoes carregadas no indice do cache em disco. Os handlers dos
+            processos da comparacao entre sessoes nao registram: quem mantem o indice e o processo principal.
+    """
+
+    def __init__(self, fabrica_sessao=None, indexar_cache_disco=True):
+        self._cache_habilitado = False
+        self.fabrica_sessao = fabrica_sessao
         self.session = None
         self.last_session_key = None
-        self.laps_piloto1 = None
-        self.laps_piloto2 = None
+        self.sessoes = CacheSessoes(CACHE_SESSOES_MAX_BYTES, ao_remover=self._descartar_memo)
+        self._memo = {}  # session_key -> resultados ja calculados para a sessao
+        self.armazem = ArmazemTelemetria(os.path.join(CACHE_DIR, "telemetria"))
+        self.cache_disco = CacheDisco(CACHE_DIR, CACHE_DISCO_MAX_BYTES) if indexar_cache_disco else None
+        # Handlers dos processos dos pools: mesma fabrica de sessoes, sem mexer no indice do cache em disco
+        criar_handler = partial(F1DataHandler, fabrica_sessao, indexar_cache_disco=False)
+        self.extrator = ExtratorTelemetria(criar_handler)
+        self.comparador_sessoes = ComparadorSessoes(criar_handler)
+        self.ao_vivo = None  # origem das linhas da sessao ao vivo (ver `iniciar_ao_vivo`)
+
+    def _habilitar_cache(self):
+        """Habilita o cache em disco do fastf1 no primeiro uso (e nao ao criar o handler)."""
+        if not self._cache_habilitado:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fastf1.Cache.enable_cache(CACHE_DIR)
+            self._cache_habilitado = True
 
     def limpar_cache(self):
-        """Limpa o cache do fastf1."""
+        """Limpa o cache do fastf1 e a telemetria gravada por volta."""
         try:
-            fastf1.Cache.clear_cache(CACHE_DIR)
+            self._habilitar_cache()
+            self._encerrar_ao_vivo()
+            # Primeiro solta a telemetria em memoria (memmaps abertos dos arquivos do armazem), depois apaga
+            self.sessoes.limpar()
+            self._memo.clear()
+            self.session = None
             self.last_session_key = None
+            self.extrator.encerrar()
+            self.comparador_sessoes.limpar()
+            fastf1.Cache.clear_cache(CACHE_DIR)
+            self.armazem.limpar()
+            if self.cache_disco is not None:
+                self.cache_disco.limpar()
             return True, "Cache limpo com sucesso!"
         except Exception as e:
             return False, f"Falha ao limpar cache: {e}"
 
-    def carregar_dados(self, ano, gp, sessao):
-        """Carrega os dados da sessão F1 escolhida."""
+    @medido("carregar_dados")
+    def carregar_dados(self, ano, gp, sessao, progresso=None, cancelado=None):
+        """Carrega os dados da sessão F1 escolhida.
+
+        O carregamento é feito por etapas (voltas, clima) pra permitir acompanhar o progresso e
+        interromper entre uma etapa e outra. A telemetria não é carregada aqui: cada piloto tem a sua
+        carregada na primeira vez que for usado (ver `telemetry_loader.CarregadorTelemetria`).
+
+        Args:
+            progresso (callable, opcional): Chamado com (etapa, fracao) no inicio de cada etapa.
+            cancelado (threading.Event, opcional): Quando setado, o carregamento para na proxima etapa.
+        """
+        self._encerrar_ao_vivo()
         session_key = (ano, gp, sessao)
         if session_key == self.last_session_key and self.session is not None:
-            return True, "Dados já carregados! Usando dados existentes.", None, None
+            return True, "Dados já carregados! Usando dados existentes.", self.get_pilotos(), None
+
+        session = self.sessoes.obter(session_key)
+        if session is not None:
+            self._ativar_sessao(session_key, session)
+            if self.cache_disco is not None:
+                self.cache_disco.tocar(session_key)
+            return True, "Sessão recuperada do cache em memória.", self.get_pilotos(), None
 
         try:
-            self.session = fastf1.get_session(ano, gp, sessao)
-            self.session.load(telemetry=True, laps=True, weather=True)
-            self.last_session_key = session_key
+            with rastreador.trecho("get_session"):
+                if self.fabrica_sessao is None:
+                    self._habilitar_cache()
+                    session = fastf1.get_session(ano, gp, sessao)
+                else:
+                    session = self.fabrica_sessao(ano, gp, sessao)
+            # Mesmo resultado de session.load(telemetry=False, laps=True, weather=True), separado em etapas. Fora
+            # da versao fixada do fastf1 o clima vem pelo load publico, sem o metodo privado
+            if internos_compativeis():
+                carregar_clima = session._load_weather_data
+            else:
+                def carregar_clima():
+                    session.load(laps=False, telemetry=False, weather=True, messages=False)
+            etapas = [
+                ("voltas", lambda: session.load(laps=True, telemetry=False, weather=False)),
+                ("clima", carregar_clima),
+            ]
+            for i, (etapa, carregar) in enumerate(etapas):
+                if cancelado is not None and cancelado.is_set():
+                    return False, "Carregamento cancelado.", None, None
+                if progresso:
+                    progresso(etapa, i / len(etapas))
+                with rastreador.trecho(f"session.load ({etapa})"):
+                    carregar()
+            if progresso:
+                progresso("concluido", 1.0)
+
+            self._ativar_sessao(session_key, session)
 
             if self.session is None:
                 raise ValueError("Sessao nao foi carregada corretamente.")
 
-            pilotos = [self.session.get_driver(drv)["Abbreviation"] for drv in self.session.drivers]
+            pilotos = self.get_pilotos()
             if not pilotos:
                 raise ValueError("Nenhum piloto encontrado na sessão.")
 
             if self.session.laps is None or self.session.laps.empty:
                 raise ValueError("Nenhuma volta foi carregada para esta sessão.")
 
-            self.laps_piloto1 = None
-            self.laps_piloto2 = None
+            with rastreador.trecho("indice_voltas"):
+                self._memo_sessao()["indice_voltas"] = construir_indices_voltas(self.session.laps)
+
+            self.sessoes.adicionar(session_key, session)
+            if self.cache_disco is not None:
+                with rastreador.trecho("cache_disco"):
+                    self.cache_disco.registrar(session_key, self._diretorios_sessao(session_key, session))
+                    self.cache_disco.aplicar_limite(protegidas=self.sessoes.chaves())
             return True, "Dados carregados com sucesso!", pilotos, None
         except Exception as e:
             return False, f"Falha ao carregar dados: {e}", None, None
 
-    def get_voltas_piloto(self, piloto, piloto_num):
+    @medido("iniciar_ao_vivo")
+    def iniciar_ao_vivo(self, endereco):
+        """Acompanha uma sessao em andamento a partir do live timing gravado pelo fastf1.
+
+        A origem e uma gravacao do `fastf1.livetiming.SignalRClient` (que pode estar sendo escrita) ou um
+        servidor de replay local ('host:porta') que envia as linhas no ritmo da sessao. O que ja esta disponivel
+        e ingerido agora; o resto chega a cada `atualizar_ao_vivo`.
+
+        Args:
+            endereco (str): Caminho da gravacao ou 'host:porta' do servidor.
+
+        Returns:
+            tuple: (success, message, pilotos, None), como `carregar_dados`
+        """
+        try:
+            self._encerrar_ao_vivo()
+            origem = abrir_origem(endereco)
+            session_key = ("Ao vivo", endereco, "")
+            self._descartar_memo(session_key)
+            self._ativar_sessao(session_key, SessaoAoVivo(os.path.basename(endereco)))
+            self._memo_sessao()["indice_voltas"] = {}
+            self.ao_vivo = origem
+            success, msg, novidades = self.atualizar_ao_vivo()
+            if not success:
+                raise ValueError(msg)
+            total = sum(len(rotulos) for _, rotulos in novidades["voltas"].values())
+            return True, f"Sessão ao vivo iniciada: {total} voltas até agora.", self.get_pilotos(), None
+        except Exception as e:
+            self._encerrar_ao_vivo()
+            return False, f"Falha ao iniciar a sessão ao vivo: {e}", None, None
+
+    @medido("atualizar_ao_vivo")
+    def atualizar_ao_vivo(self):
+        """Ingere as linhas novas da sessao ao vivo e anexa as voltas completadas desde a ultima chamada.
+
+        O custo e proporcional ao que chegou: as amostras novas sao anexadas aos buffers dos pilotos, e cada
+        volta publicada entra no memo como `TelemetriaVolta` e no `IndiceVoltasAoVivo` do piloto, sem remontar
+        a sessao. Os resultados que dependem de todas as voltas (agregados, dominancia) sao descartados e
+        recalculados quando pedidos.
+
+        Returns:
+            tuple: (success, message, novidades), com novidades = {"pilotos": lista de pilotos se mudou,
+            "voltas": {piloto: (ultima volta antes, [rotulos das voltas novas])}, "encerrada": bool}, ou
+            None fora do modo ao vivo.
+        """
+        if self.ao_vivo is None:
+            return False, "Nenhuma sessão ao vivo.", None
+        try:
+            with rastreador.trecho("ao_vivo.ler"):
+                linhas = self.ao_vivo.ler()
+            n_pilotos = len(self.session.drivers)
+            with rastreador.trecho("ao_vivo.ingerir", linhas=len(linhas)):
+                publicadas = self.session.ingerir(linhas)
+
+            memo = self._memo_sessao()
+            indices = memo["indice_voltas"]
+            voltas = {}
+            for piloto, numero, tel, lap in publicadas:
+                indice = indices.setdefault(piloto, IndiceVoltasAoVivo())
+                anterior = indice.ultima()
+                voltas.setdefault(piloto, (anterior, []))[1].append(indice.anexar(lap))
+                memo["telemetria"][(piloto, numero)] = (tel, lap)
+            if linhas:
+                # Posicoes e clima mudam a cada atualizacao; agregados e dominancia a cada volta nova
+                for chave in ("pilotos", "clima") + (("agregados", "dominancia") if publicadas else ()):
+                    memo.pop(chave, None)
+
+            novidades = {"pilotos": self.get_pilotos() if len(self.session.drivers) != n_pilotos else [],
+                         "voltas": voltas, "encerrada": self.ao_vivo.encerrada}
+            return True, f"{len(linhas)} mensagens, {len(publicadas)} voltas novas.", novidades
+        except Exception as e:
+            return False, f"Falha ao atualizar a sessão ao vivo: {e}", {"pilotos": [], "voltas": {},
+                                                                      "encerrada": False}
+
+    def _encerrar_ao_vivo(self):
+        """Fecha a origem da sessao ao vivo e descarta a sessao e os resultados dela."""
+        if self.ao_vivo is None:
+            return
+        self.ao_vivo.fechar()
+        self.ao_vivo = None
+        if isinstance(self.session, SessaoAoVivo):
+            self._descartar_memo(self.last_session_key)
+            self.session = None
+            self.last_session_key = None
+
+    def _ativar_sessao(self, session_key, session):
+        """Torna a sessao informada a sessao atual."""
+        self.session = session
+        self.last_session_key = session_key
+
+    def _memo_sessao(self):
+        """Retorna o dicionario de memoizacao da sessao atual."""
+        return self._memo.setdefault(self.last_session_key, {"telemetria": {}})
+
+    def _carregador(self):
+        """Retorna o CarregadorTelemetria da sessao atual."""
+        memo = self._memo_sessao()
+        if "carregador" not in memo:
+            memo["carregador"] = CarregadorTelemetria(self.session)
+        return memo["carregador"]
+
+    def _garantir_telemetria(self, pilotos):
+        """Carrega a telemetria dos pilotos (abreviaturas) que ainda nao foram usados na sessao atual."""
+        carregador = self._carregador()
+        numeros = [self.session.get_driver(piloto)["DriverNumber"] for piloto in pilotos]
+        with rastreador.trecho("telemetria sob demanda", pilotos=len(numeros)):
+            if carregador.garantir(numeros):
+                # A sessao cresceu: atualiza a conta de memoria do cache de sessoes
+                self.sessoes.remedir(self.last_session_key)
+
+    def _telemetria_carregada(self, piloto):
+        """Indica se a telemetria do piloto ja foi carregada na sessao atual."""
+        carregador = self._memo_sessao().get("carregador")
+        return carregador is not None and self.session.get_driver(piloto)["DriverNumber"] in carregador.pilotos
+
+    def _descartar_memo(self, session_key):
+        """Descarta os resultados memoizados de uma sessao removida do cache."""
+        self._memo.pop(session_key, None)
+
+    def _diretorios_sessao(self, session_key, session):
+        """Diretorios em disco de uma sessao: a pasta do fastf1 (quando ha) e a telemetria do armazem."""
+        diretorios = []
+        if session.api_path:
+            # Mesmo caminho usado pelo fastf1 para os arquivos da sessao (api_path sem o prefixo '/static/')
+            diretorios.append(os.path.join(CACHE_DIR, session.api_path[len("/static/"):]))
+        diretorios.append(self.armazem.diretorio_sessao(session_key))
+        return diretorios
+
+    def listar_cache_disco(self):
+        """Lista as sessoes do cache em disco com tamanho, acertos e ultimo acesso.
+
+        Returns:
+            tuple: (success, message, entradas), com as entradas da mais recente para a mais antiga
+        """
+        if self.cache_disco is None:
+            return False, "Este handler não mantém o índice do cache em disco.", []
+        try:
+            entradas = self.cache_disco.listar()
+            for entrada in entradas:
+                entrada["em_uso"] = self.last_session_key is not None and \
+                    list(self.last_session_key) in entrada["chaves"]
+            return True, "Cache listado com sucesso!", entradas
+        except Exception as e:
+            return False, f"Falha ao listar o cache: {e}", []
+
+    def remover_cache_disco(self, ident):
+        """Remove uma sessao do cache em disco (e da memoria), exceto a sessao atual."""
+        if self.cache_disco is None:
+            return False, "Este handler não mantém o índice do cache em disco."
+        try:
+            entrada = next((e for e in self.cache_disco.listar() if e["id"] == ident), None)
+            if entrada is None:
+                return False, "Sessão não encontrada no cache."
+            if self.last_session_key is not None and list(self.last_session_key) in entrada["chaves"]:
+                return False, "A sessão atual não pode ser removida do cache."
+            for chave in entrada["chaves"]:
+                self.sessoes.remover(tuple(chave))
+            self.cache_disco.remover(ident)
+            return True, f"{entrada['rotulo']} removida do cache ({entrada['bytes'] / 1024 ** 2:.1f} MB)."
+        except Exception as e:
+            return False, f"Falha ao remover do cache: {e}"
+
+    def get_estatisticas_cache(self):
+        """Retorna os contadores do cache de sessoes em memoria (acertos, falhas, remocoes, bytes)."""
+        return self.sessoes.estatisticas()
+
+    def get_pilotos(self):
+        """Retorna as abreviaturas dos pilotos da sessao carregada."""
+        if not self.session:
+            return []
+        return [self.session.get_driver(drv)["Abbreviation"] for drv in self.session.drivers]
+
+    @medido("get_voltas_piloto")
+    def get_voltas_piloto(self, piloto):
         """Retorna as voltas disponiveis para um piloto.
 
         Args:
             piloto (str): Abreviatura do piloto (ex.: 'VER').
-            piloto_num (int): Numero do piloto (1 ou 2) pra determinar onde armazenar as voltas.
 
         Returns:
             tuple: (success, message, voltas)
@@ -68,28 +407,11 @@ class F1DataHandler:
             return False, "Piloto ou sessão nao selecionados.", []
 
         try:
-            # Carrega as voltas do piloto
-            laps = self.session.laps.pick_drivers(piloto)
-            if laps is None or laps.empty:
+            indice = self.get_indice_voltas(piloto)
+            if indice is None:
                 return False, f"Nenhuma volta encontrada para {piloto}", []
 
-            # Armazena as voltas no atributo correto (piloto 1 ou piloto 2)
-            if piloto_num == 1:
-                self.laps_piloto1 = laps
-            elif piloto_num == 2:
-                self.laps_piloto2 = laps
-            else:
-                raise ValueError("piloto_num deve ser 1 ou 2")
-
-            voltas = []
-            for _, lap in laps.iterrows():
-                lap_number = int(lap["LapNumber"])
-                lap_time = lap["LapTime"]
-                if pd.isna(lap_time):
-                    voltas.append(f"Volta {lap_number} - Sem tempo")
-                else:
-                    voltas.append(f"Volta {lap_number} - {lap_time.total_seconds():.3f}s")
-
+            voltas = indice.rotulos.tolist()
             if not voltas:
                 voltas = ["Nenhuma volta disponivel"]
 
@@ -97,54 +419,362 @@ class F1DataHandler:
         except Exception as e:
             return False, f"Erro ao carregar voltas: {e}", ["Erro ao carregar voltas"]
 
-    def get_telemetria(self, piloto, volta_str, piloto_num):
-        """Retorna a telemetria de uma volta especifica de um piloto."""
+    def _get_indices_voltas(self):
+        """Retorna os IndiceVoltas de todos os pilotos da sessao atual."""
+        memo = self._memo_sessao()
+        if "indice_voltas" not in memo:
+            memo["indice_voltas"] = construir_indices_voltas(self.session.laps)
+        return memo["indice_voltas"]
+
+    def get_indice_voltas(self, piloto):
+        """Retorna o IndiceVoltas do piloto na sessao atual (ou None se ele nao tiver voltas)."""
+        return self._get_indices_voltas().get(piloto)
+
+    def get_voltas_mais_rapidas(self):
+        """Retorna (piloto, volta) da volta mais rapida de cada piloto, da mais rapida para a mais lenta."""
+        if not self.session:
+            return []
+        voltas = []
+        for piloto, indice in self._get_indices_voltas().items():
+            numero = indice.mais_rapida()
+            if numero is not None:
+                voltas.append((indice.tempos[indice.posicoes[numero]], piloto, numero))
+        return [(piloto, numero) for _, piloto, numero in sorted(voltas)]
+
+    def voltas_provaveis(self, piloto, selecionada=None, outra=None):
+        """Retorna as voltas do piloto que provavelmente serao comparadas, da mais provavel para a menos.
+
+        A ordem e: a volta ja selecionada no dropdown, a mais rapida, a volta de mesmo numero que a
+        selecionada para o outro piloto e a ultima.
+
+        Args:
+            piloto (str): Abreviatura do piloto.
+            selecionada (str | int, opcional): Volta selecionada para o piloto.
+            outra (tuple, opcional): (piloto, volta) selecionados no outro dropdown.
+
+        Returns:
+            tuple: (session_key, [numeros das voltas])
+        """
+        indice = self.get_indice_voltas(piloto) if self.session else None
+        if indice is None:
+            return self.last_session_key, []
+
+        candidatas = [indice.mais_rapida(), indice.ultima()]
+        if outra is not None:
+            indice_outro = self.get_indice_voltas(outra[0])
+            try:
+                candidatas.insert(1, indice_outro.numero(outra[1]))
+            except (AttributeError, ValueError):
+                pass
+        if selecionada is not None:
+            try:
+                candidatas.insert(0, indice.numero(selecionada))
+            except ValueError:
+                pass
+        numeros = [numero for numero in dict.fromkeys(candidatas) if numero in indice.posicoes]
+        return self.last_session_key, numeros
+
+    @medido("pre_carregar_volta")
+    def pre_carregar_volta(self, session_key, piloto, volta):
+        """Aquece a telemetria de uma volta em segundo plano (memo e armazem), como o `get_telemetria`.
+
+        A pre-carga e so um palpite, entao ela desiste quando a sessao atual mudou e quando teria que carregar
+        a telemetria de um piloto novo com o cache de sessoes acima de `PRE_CARGA_LIMITE_MEMORIA` do
+        orcamento (para nao tirar outra sessao da memoria).
+
+        Returns:
+            tuple: (success, message)
+        """
+        if session_key != self.last_session_key or self.session is None:
+            return False, "Sessão trocada; pré-carga descartada."
+        try:
+            indice = self.get_indice_voltas(piloto)
+            if indice is None:
+                return False, f"Nenhuma volta encontrada para {piloto}"
+            if (piloto, volta) in self._memo_sessao()["telemetria"]:
+                return True, "Telemetria já carregada."
+            if not self.armazem.contem(session_key, piloto, volta) and not self._telemetria_carregada(piloto) \
+                    and self.sessoes.total_bytes > PRE_CARGA_LIMITE_MEMORIA * self.sessoes.limite_bytes:
+                return False, "Memória das sessões no limite; pré-carga ignorada."
+        except Exception as e:
+            return False, f"Falha na pré-carga: {e}"
+        success, msg, _, _ = self.get_telemetria(piloto, volta)
+        return success, msg
+
+    @medido("get_telemetria")
+    def get_telemetria(self, piloto, volta):
+        """Retorna a telemetria de uma volta especifica de um piloto.
+
+        A telemetria processada fica gravada no armazem em disco, entao a mesma volta so passa pelo
+        merge do fastf1 (`telemetry_loader.telemetria_volta`) uma vez.
+
+        Args:
+            piloto (str): Abreviatura do piloto.
+            volta (str | int): Rotulo do dropdown ('Volta N - X.XXXs') ou numero da volta.
+
+        Returns:
+            tuple: (success, message, tel, lap), com `tel` como `TelemetriaVolta` (dtypes compactos)
+        """
         try:
-            laps = self.laps_piloto1 if piloto_num == 1 else self.laps_piloto2
-            volta_num = int(volta_str.split("Volta ")[1].split(" - ")[0])
-            lap = laps[laps["LapNumber"] == volta_num].iloc[0]
-            tel = lap.get_telemetry()
+            indice = self.get_indice_voltas(piloto)
+            if indice is None:
+                raise ValueError(f"Nenhuma volta encontrada para {piloto}")
+            volta_num = indice.numero(volta)
+            memo = self._memo_sessao()["telemetria"]
+            if (piloto, volta_num) in memo:
+                tel, lap = memo[(piloto, volta_num)]
+                return True, "Telemetria carregada com sucesso!", tel, lap
+
+            lap = indice.volta(volta_num)
+            with rastreador.trecho("armazem.ler"):
+                tel = self.armazem.ler(self.last_session_key, piloto, volta_num)
+            if tel is None:
+                self._garantir_telemetria([piloto])
+                with rastreador.trecho("telemetria_volta", piloto=piloto, volta=volta_num):
+                    processada = telemetria_volta(lap)
+                with rastreador.trecho("armazem.gravar"):
+                    self.armazem.gravar(self.last_session_key, piloto, volta_num, processada)
+                tel = self.armazem.ler(self.last_session_key, piloto, volta_num)
             if tel.empty:
                 raise ValueError("Telemetria vazia para o piloto")
+            memo[(piloto, volta_num)] = (tel, lap)
             return True, "Telemetria carregada com sucesso!", tel, lap
         except Exception as e:
             return False, f"Falha ao carregar telemetria: {e}", None, None
 
+    @medido("get_telemetrias")
+    def get_telemetrias(self, chaves):
+        """Retorna a telemetria de varias voltas, extraindo em paralelo as que ainda nao foram processadas.
+
+        Args:
+            chaves (list): Pares (piloto, volta), com a volta como rotulo do dropdown ou numero.
+
+        Returns:
+            tuple: (success, message, [(tel, lap), ...]) na mesma ordem das chaves
+        """
+        try:
+            numeros = []
+            for piloto, volta in chaves:
+                indice = self.get_indice_voltas(piloto)
+                if indice is None:
+                    raise ValueError(f"Nenhuma volta encontrada para {piloto}")
+                numeros.append((piloto, indice.numero(volta)))
+
+            memo = self._memo_sessao()["telemetria"]
+            pendentes = list(dict.fromkeys(
+                chave for chave in numeros
+                if chave not in memo and not self.armazem.contem(self.last_session_key, *chave)
+            ))
+            # Poucas voltas sao extraidas aqui mesmo, pelo `get_telemetria` abaixo
+            if self.extrator.vale_o_pool(pendentes):
+                with rastreador.trecho("extrator.extrair", voltas=len(pendentes)):
+                    erros = self.extrator.extrair(self.last_session_key, pendentes)
+                if erros:
+                    (piloto, volta), erro = next(iter(erros.items()))
+                    raise ValueError(f"{piloto} volta {volta}: {erro}")
+            elif pendentes:
+                # Uma carga so da telemetria bruta para todos os pilotos do lote, nao uma por piloto
+                self._garantir_telemetria(list(dict.fromkeys(piloto for piloto, _ in pendentes)))
+
+            resultados = []
+            for piloto, volta in numeros:
+                success, msg, tel, lap = self.get_telemetria(piloto, volta)
+                if not success:
+                    raise ValueError(msg)
+                resultados.append((tel, lap))
+            return True, "Telemetria carregada com sucesso!", resultados
+        except Exception as e:
+            return False, f"Falha ao carregar telemetria: {e}", None
+
+    def preparar_comparacao_sessoes(self):
+        """Sobe o pool da comparacao entre sessoes, quando a selecao ja tem voltas de outra sessao."""
+        self.comparador_sessoes.aquecer()
+
+    @medido("get_telemetrias_sessoes")
+    def get_telemetrias_sessoes(self, selecao):
+        """Retorna a telemetria de voltas de sessoes diferentes, para compara-las no mesmo grafico.
+
+        As voltas da sessao atual vem de `get_telemetrias`; as das outras sessoes sao carregadas em paralelo
+        (uma sessao por processo, ver `cross_session.ComparadorSessoes`), e so os arrays das voltas pedidas
+        voltam para este processo. As sessoes carregadas entram no indice do cache em disco.
+
+        Args:
+            selecao (list): Trincas (piloto, volta, session_key), com a volta como rotulo do dropdown ou numero.
+
+        Returns:
+            tuple: (success, message, [(tel, lap, equipe, posicao), ...] na ordem da selecao,
+            {session_key: clima})
+        """
+        try:
+            atuais = [(piloto, volta) for piloto, volta, session_key in selecao
+                      if session_key == self.last_session_key]
+            outras = [(session_key, piloto, volta) for piloto, volta, session_key in selecao
+                      if session_key != self.last_session_key]
+            resultados = {}
+            climas = {}
+            if atuais:
+                success, msg, telemetrias = self.get_telemetrias(atuais)
+                if not success:
+                    raise ValueError(msg)
+                for (piloto, volta), (tel, lap) in zip(atuais, telemetrias):
+                    resultados[(self.last_session_key, piloto, volta)] = (tel, lap) + self.get_driver_info(piloto)
+                climas[self.last_session_key] = self.get_weather_info()
+            if outras:
+                with rastreador.trecho("comparador_sessoes", voltas=len(outras)):
+                    carregadas, climas_outras, diretorios = self.comparador_sessoes.carregar(outras)
+                resultados.update(carregadas)
+                climas.update(climas_outras)
+                if diretorios and self.cache_disco is not None:
+                    with rastreador.trecho("cache_disco"):
+                        for session_key, caminhos in diretorios.items():
+                            self.cache_disco.registrar(session_key, caminhos)
+                        self.cache_disco.aplicar_limite(protegidas=self.sessoes.chaves() + list(climas))
+            voltas = [resultados[(session_key, piloto, volta)] for piloto, volta, session_key in selecao]
+            return True, "Telemetria carregada com sucesso!", voltas, climas
+        except Exception as e:
+            return False, f"Falha ao carregar telemetria de outras sessões: {e}", None, None
+
+    @medido("alinhar")
+    def alinhar(self, telemetrias, canais=CANAIS_ALINHADOS, grade=None):
+        """Alinha todos os canais de N voltas numa grade de distancia comum (ver `alignment.alinhar_voltas`)."""
+        return alinhar_voltas(telemetrias, canais, grade)
+
+    @medido("interpolar_telemetria")
     def interpolar_telemetria(self, tel_ref, tel, canal):
         """Interpolar um canal de telemetria pra alinhar com a distancia de referencia."""
-        if canal == "Time":
-            valores = tel[canal].dt.total_seconds()
-        else:
-            valores = tel[canal].astype(float)
-        return np.interp(tel_ref["Distance"], tel["Distance"], valores.fillna(0))
+        grade = np.asarray(tel_ref["Distance"], dtype=float)
+        return alinhar_voltas([tel], (canal,), grade).dados[0, 0]
 
+    @medido("calcular_delta")
     def calcular_delta(self, tel1, tel2):
         """Calcula o delta de tempo entre duas telemetrias."""
-        time1 = tel1["Time"].dt.total_seconds()
-        time2 = self.interpolar_telemetria(tel1, tel2, "Time")
-        return time1 - time2
+        grade = np.asarray(tel1["Distance"], dtype=float)
+        tempos = alinhar_voltas([tel1, tel2], ("Time",), grade).canal("Time")
+        return tempos[0] - tempos[1]
+
+    @medido("get_agregados")
+    def get_agregados(self):
+        """Retorna a tabela de agregados por volta de todos os pilotos (ver `lap_aggregates.agregar_voltas`).
+
+        A tabela e calculada numa passada sobre o car_data da sessao e guardada junto com ela.
+
+        Returns:
+            tuple: (success, message, tabela)
+        """
+        if not self.session:
+            return False, "Nenhuma sessão carregada.", None
+        try:
+            memo = self._memo_sessao()
+            if "agregados" not in memo:
+                carregador = self._carregador()
+                versao = carregador.versao
+                with rastreador.trecho("canais_carro"):
+                    canais = carregador.canais_carro(CANAIS_AGREGADOS)
+                if carregador.versao != versao:
+                    self.sessoes.remedir(self.last_session_key)
+                with rastreador.trecho("agregar_voltas", voltas=len(self.session.laps)):
+                    memo["agregados"] = agregar_voltas(self.session.laps, canais)
+            return True, "Agregados calculados com sucesso!", memo["agregados"]
+        except Exception as e:
+            return False, f"Falha ao calcular os agregados das voltas: {e}", None
+
+    @medido("get_dominancia")
+    def get_dominancia(self, selecao=(), n_mini_setores=MINI_SETORES):
+        """Calcula quem foi mais rapido em cada mini-setor, entre uma volta de cada piloto da sessao.
+
+        Cada piloto entra com a volta dele na selecao ou, se nao estiver nela, com a sua volta mais rapida. A
+        telemetria que faltar e extraida em paralelo (`get_telemetrias`), e o resultado fica guardado na
+        sessao para a mesma combinacao de voltas.
+
+        Args:
+            selecao (list): Pares (piloto, volta) escolhidos pelo usuario.
+            n_mini_setores (int): Numero de mini-setores da volta.
+
+        Returns:
+            tuple: (success, message, DominanciaMiniSetores)
+        """
+        if not self.session:
+            return False, "Nenhuma sessão carregada.", None
+        try:
+            escolhidas = {}
+            for piloto, volta in selecao:
+                indice = self.get_indice_voltas(piloto)
+                if indice is not None:
+                    escolhidas.setdefault(piloto, indice.numero(volta))
+            for piloto, numero in self.get_voltas_mais_rapidas():
+                escolhidas.setdefault(piloto, numero)
+            chaves = tuple(escolhidas.items())
+
+            memo = self._memo_sessao().setdefault("dominancia", {})
+            if (n_mini_setores, chaves) not in memo:
+                mapa = self.get_mapa_circuito()
+                if mapa is None or not chaves:
+                    raise ValueError("Nenhuma volta com tempo na sessão.")
+                success, msg, resultados = self.get_telemetrias(list(chaves))
+                if not success:
+                    raise ValueError(msg)
+                with rastreador.trecho("mini-setores", voltas=len(chaves)):
+                    memo[(n_mini_setores, chaves)] = calcular_dominancia(
+                        [tel for tel, _ in resultados], [piloto for piloto, _ in chaves],
+                        [numero for _, numero in chaves], n_mini_setores, float(mapa.distancia[-1]))
+            return True, "Dominância calculada com sucesso!", memo[(n_mini_setores, chaves)]
+        except Exception as e:
+            return False, f"Falha ao calcular a dominância por mini-setor: {e}", None
 
+    @medido("get_weather_info")
     def get_weather_info(self):
-        """Retorna informacoes climaticas da sessao."""
+        """Retorna informacoes climaticas da sessao (calculadas uma vez por sessao)."""
         if not self.session or self.session.weather_data.empty:
             return {"temp_track": "N/A", "temp_air": "N/A", "rain": "Não", "wind_speed": "N/A"}
 
-        weather = self.session.weather_data
-        return {
-            "temp_track": int(weather["TrackTemp"].mean()) if "TrackTemp" in weather else "N/A",
-            "temp_air": int(weather["AirTemp"].mean()) if "AirTemp" in weather else "N/A",
-            "rain": "Sim " if (weather["Rainfall"].mean() > 0 if "Rainfall" in weather else False) else "Não",
-            "wind_speed": weather["WindSpeed"].mean() if "WindSpeed" in weather else "N/A"
-        }
+        memo = self._memo_sessao()
+        if "clima" not in memo:
+            weather = self.session.weather_data
+
+            def media(coluna):
+                # Uma sessao ao vivo pode ter so linhas de clima sem valor ate aqui (media NaN)
+                valor = weather[coluna].mean() if coluna in weather else np.nan
+                return valor if pd.notna(valor) else None
+
+            temp_track, temp_air, chuva, vento = (media(coluna) for coluna in
+                                                  ("TrackTemp", "AirTemp", "Rainfall", "WindSpeed"))
+            memo["clima"] = {
+                "temp_track": int(temp_track) if temp_track is not None else "N/A",
+                "temp_air": int(temp_air) if temp_air is not None else "N/A",
+                "rain": "Sim " if chuva is not None and chuva > 0 else "Não",
+                "wind_speed": vento if vento is not None else "N/A"
+            }
+        return dict(memo["clima"])
 
     def get_driver_info(self, piloto):
         """Retorna informacoes do piloto (equipe, posicao)."""
         if not self.session:
             return "Desconhecido", "N/A"
 
-        driver_info = self.session.get_driver(piloto)
-        team = driver_info["TeamName"] if "TeamName" in driver_info else "Desconhecido"
-        results = self.session.results
-        position = int(results[results["Abbreviation"] == piloto]["Position"].iloc[0]) if piloto in results[
-            "Abbreviation"].values else "N/A"
-        return team, position
+        memo = self._memo_sessao()
+        if "pilotos" not in memo:
+            # Mapa piloto -> (equipe, posicao) montado uma vez por sessao
+            results = self.session.results
+            equipes = results["TeamName"] if "TeamName" in results else pd.Series("Desconhecido", index=results.index)
+            memo["pilotos"] = {
+                abreviatura: (equipe, int(posicao) if pd.notna(posicao) else "N/A")
+                for abreviatura, equipe, posicao in zip(results["Abbreviation"], equipes, results["Position"])
+            }
+        return memo["pilotos"].get(piloto, ("Desconhecido", "N/A"))
+
+    @medido("get_mapa_circuito")
+    def get_mapa_circuito(self):
+        """Retorna o mini-mapa da sessao (tracado, setores e zonas de DRS), montado uma vez por sessao.
+
+        O tracado vem da volta mais rapida da sessao, entao nao depende das voltas comparadas.
+        """
+        memo = self._memo_sessao()
+        if "mapa" not in memo:
+            voltas = self.get_voltas_mais_rapidas()
+            if not voltas:
+                return None
+            success, msg, tel, lap = self.get_telemetria(*voltas[0])
+            if not success:
+                raise ValueError(msg)
+            memo["mapa"] = montar_mapa_circuito(tel, lap)
+        return memo["mapa"]
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import shutil
+import time
+
+ARQUIVO_INDICE = "indice_cache.json"
+
+
+def tamanho_diretorio(caminho):
+    """Soma o tamanho (bytes) dos arquivos de um diretorio e subdiretorios."""
+    total = 0
+    for raiz, _, arquivos in os.walk(caminho):
+        for arquivo in arquivos:
+            try:
+                total += os.lstat(os.path.join(raiz, arquivo)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _rotulo_pasta(evento, sessao):
+    """Rotulo legivel de uma pasta de sessao do fastf1 (ex.: '2024-09-01_Italian_Grand_Prix', '2024-09-01_Race')."""
+    sem_data = [re.sub(r"^\d{4}-\d{2}-\d{2}_", "", nome).replace("_", " ") for nome in (evento, sessao)]
+    return " - ".join(sem_data)
+
+
+class CacheDisco:
+    """Indice das sessoes guardadas no cache em disco, com limite de bytes e remocao das menos usadas.
+
+    Cada entrada junta os diretorios de uma sessao (a pasta do fastf1 e a telemetria do armazem) com o
+    tamanho, o numero de acertos (carregamentos que encontraram a sessao ja no disco) e o ultimo acesso. O
+    indice fica em `<diretorio>/indice_cache.json`; na primeira vez, as pastas de sessao do fastf1 que ja
+    existirem sao indexadas com a data de modificacao como ultimo acesso.
+
+    Args:
+        diretorio (str): Diretorio do cache (o mesmo passado ao fastf1).
+        limite_bytes (int): Orcamento de disco. Sessoes protegidas (em uso) nunca sao removidas.
+    """
+
+    def __init__(self, diretorio, limite_bytes):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self._entradas = None  # id -> entrada, lido do disco no primeiro uso
+
+    @property
+    def _caminho_indice(self):
+        return os.path.join(self.diretorio, ARQUIVO_INDICE)
+
+    def _indice(self):
+        if self._entradas is None:
+            try:
+                with open(self._caminho_indice, encoding="utf-8") as arquivo:
+                    self._entradas = json.load(arquivo)["sessoes"]
+            except (OSError, ValueError, KeyError):
+                self._entradas = self._descobrir()
+                self._gravar_indice()
+        return self._entradas
+
+    def _gravar_indice(self):
+        """Grava o indice num arquivo temporario e troca de uma vez, para nunca deixar o JSON pela metade."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        temporario = f"{self._caminho_indice}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({"sessoes": self._entradas}, arquivo, ensure_ascii=False, indent=1)
+        os.replace(temporario, self._caminho_indice)
+
+    def _descobrir(self):
+        """Indexa as pastas de sessao do fastf1 (`<ano>/<evento>/<sessao>`) que ja estao no diretorio."""
+        entradas = {}
+        if not os.path.isdir(self.diretorio):
+            return entradas
+        for ano in os.listdir(self.diretorio):
+            pasta_ano = os.path.join(self.diretorio, ano)
+            if not re.fullmatch(r"\d{4}", ano) or not os.path.isdir(pasta_ano):
+                continue
+            for evento in os.listdir(pasta_ano):
+                pasta_evento = os.path.join(pasta_ano, evento)
+                if not os.path.isdir(pasta_evento):
+                    continue
+                for sessao in os.listdir(pasta_evento):
+                    pasta = os.path.join(pasta_evento, sessao)
+                    if not os.path.isdir(pasta):
+                        continue
+                    relativo = "/".join((ano, evento, sessao))
+                    entradas[relativo] = self._nova_entrada(f"{ano} {_rotulo_pasta(evento, sessao)}", [relativo],
+                                                            os.path.getmtime(pasta))
+        return entradas
+
+    @staticmethod
+    def _nova_entrada(rotulo, caminhos, ultimo_acesso):
+        return {"rotulo": rotulo, "caminhos": caminhos, "chaves": [], "bytes": 0, "acertos": 0,
+                "ultimo_acesso": ultimo_acesso}
+
+    def _relativo(self, caminho):
+        return os.path.relpath(caminho, self.diretorio).replace(os.sep, "/")
+
+    def _medir(self, entrada):
+        entrada["bytes"] = sum(tamanho_diretorio(os.path.join(self.diretorio, caminho))
+                               for caminho in entrada["caminhos"])
+
+    def _buscar(self, chave):
+        """Retorna (id, entrada) da sessao (ano, gp, sessao), ou (None, None)."""
+        for ident, entrada in self._indice().items():
+            if list(chave) in entrada["chaves"]:
+                return ident, entrada
+        return None, None
+
+    def registrar(self, chave, caminhos):
+        """Registra o carregamento de uma sessao do fastf1.
+
+        Args:
+            chave (tuple): (ano, gp, sessao) como informado pelo usuario.
+            caminhos (list): Diretorios da sessao; o primeiro identifica a entrada (a pasta do fastf1, que e a
+                mesma para nomes diferentes do mesmo GP).
+        """
+        relativos = [self._relativo(caminho) for caminho in caminhos]
+        indice = self._indice()
+        entrada = indice.get(relativos[0])
+        if entrada is None:
+            entrada = indice[relativos[0]] = self._nova_entrada(" ".join(str(valor) for valor in chave),
+                                                                relativos, time.time())
+        else:
+            entrada["acertos"] += 1
+        entrada["caminhos"] += [caminho for caminho in relativos if caminho not in entrada["caminhos"]]
+        if list(chave) not in entrada["chaves"]:
+            entrada["chaves"].append(list(chave))
+        entrada["ultimo_acesso"] = time.time()
+        self._medir(entrada)
+        self._gravar_indice()
+
+    def tocar(self, chave):
+        """Atualiza o ultimo acesso de uma sessao reaproveitada da memoria."""
+        _, entrada = self._buscar(chave)
+        if entrada is not None:
+            entrada["ultimo_acesso"] = time.time()
+            self._gravar_indice()
+
+    def listar(self):
+        """Retorna as entradas (com 'id') remedidas, da usada mais recentemente para a mais antiga."""
+        indice = self._indice()
+        for entrada in indice.values():
+            self._medir(entrada)
+        self._gravar_indice()
+        entradas = [dict(entrada, id=ident) for ident, entrada in indice.items()]
+        return sorted(entradas, key=lambda entrada: entrada["ultimo_acesso"], reverse=True)
+
+    @property
+    def total_bytes(self):
+        return sum(entrada["bytes"] for entrada in self._indice().values())
+
+    def remover(self, ident):
+        """Apaga do disco os diretorios da entrada e tira ela do indice.
+
+        Returns:
+            dict: A entrada removida, ou None se o id nao existir.
+        """
+        entrada = self._indice().pop(ident, None)
+        if entrada is None:
+            return None
+        for caminho in entrada["caminhos"]:
+            shutil.rmtree(os.path.join(self.diretorio, caminho), ignore_errors=True)
+        self._gravar_indice()
+        return entrada
+
+    def aplicar_limite(self, protegidas=()):
+        """Remove as sessoes usadas ha mais tempo ate o cache caber no orcamento.
+
+        Args:
+            protegidas (iterable): Chaves (ano, gp, sessao) em uso, que nao podem ser removidas.
+
+        Returns:
+            list: Entradas removidas.
+        """
+        protegidas = [list(chave) for chave in protegidas]
+        indice = self._indice()
+        for entrada in indice.values():
+            self._medir(entrada)
+        total = self.total_bytes
+        removidas = []
+        for ident, entrada in sorted(indice.items(), key=lambda item: item[1]["ultimo_acesso"]):
+            if total <= self.limite_bytes:
+                break
+            if any(chave in protegidas for chave in entrada["chaves"]):
+                continue
+            removidas.append(self.remover(ident))
+            total -= entrada["bytes"]
+        self._gravar_indice()
+        return removidas
+
+    def limpar(self):
+        """Esquece todas as entradas (os arquivos sao apagados por quem limpa o cache)."""
+        self._entradas = {}
+        if os.path.exists(self._caminho_indice):
+            os.remove(self._caminho_indice)
@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import CACHE_SESSOES_MAX_BYTES, MAX_WORKERS_TELEMETRIA, MIN_VOLTAS_POOL_TELEMETRIA
+
+# F1DataHandler de cada processo dos pools (extrator e comparacao entre sessoes), criado pelo initializer. O
+# processo carrega a sessao que precisar do cache em disco e a mantem no cache LRU do proprio handler.
+_handler = None
+
+
+def contexto_processos():
+    """Contexto dos pools de processos: forkserver onde existe, spawn nas demais plataformas.
+
+    Os pools sao criados depois que a interface ja tem a thread do Tk e a do worker rodando; um fork nessa hora
+    copiaria para o filho travas seguradas por outras threads (logging, cache do fastf1, carregador de
+    telemetria) e poderia travar o filho. Com forkserver/spawn os processos partem de um interpretador limpo
+    e recebem tudo que precisam pelos argumentos.
+    """
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(metodo)
+
+
+def iniciar_processo(criar_handler, limite_bytes):
+    """Initializer dos pools: cria o handler do processo com uma fatia do orcamento de sessoes em memoria."""
+    global _handler
+    _handler = criar_handler()
+    _handler.sessoes.limite_bytes = limite_bytes
+
+
+def handler_da_sessao(session_key):
+    """Retorna o handler do processo com a sessao informada como sessao atual (carregando-a se preciso)."""
+    success, msg, _, _ = _handler.carregar_dados(*session_key)
+    if not success:
+        raise RuntimeError(msg)
+    return _handler
+
+
+def _extrair_pilotos(session_key, por_piloto):
+    """Roda no processo do pool: processa a telemetria das voltas de um grupo de pilotos e grava no armazem.
+
+    A telemetria bruta dos pilotos do grupo e carregada de uma vez, antes das voltas.
+    """
+    handler = handler_da_sessao(session_key)
+    handler._garantir_telemetria(list(por_piloto))
+    erros = {}
+    for piloto, voltas in por_piloto.items():
+        for volta in voltas:
+            success, msg, _, _ = handler.get_telemetria(piloto, volta)
+            if not success:
+                erros[(piloto, volta)] = msg
+    return erros
+
+
+class ExtratorTelemetria:
+    """Extrai em paralelo a telemetria de muitas voltas de uma sessao.
+
+    O merge da telemetria do fastf1 (`telemetria_volta`) passa quase todo o tempo em codigo Python/pandas preso
+    ao GIL, entao lotes grandes sao processados num pool de processos (uma tarefa por grupo de pilotos, para
+    cada processo ler a telemetria bruta uma vez so para todos os pilotos do grupo). Cada processo carrega a
+    sessao do cache em disco uma vez e grava o resultado no armazem de telemetria, que o processo principal le
+    por memmap: nada alem das chaves atravessa os processos. Abaixo de `min_voltas` o custo de subir o pool e
+    carregar a sessao nos processos nao compensa, e quem chama extrai na propria thread.
+
+    Args:
+        criar_handler (callable): Cria o F1DataHandler de cada processo (serializavel: vai pelo forkserver).
+    """
+
+    def __init__(self, criar_handler, max_workers=MAX_WORKERS_TELEMETRIA, min_voltas=MIN_VOLTAS_POOL_TELEMETRIA):
+        self.criar_handler = criar_handler
+        self.max_workers = min(max_workers, os.cpu_count() or 1)
+        self.min_voltas = min_voltas
+        self._executor = None
+
+    def _get_executor(self):
+        """Retorna o pool, criando-o no primeiro uso (os processos guardam as sessoes ja carregadas)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=contexto_processos(),
+                                                 initializer=iniciar_processo,
+                                                 initargs=(self.criar_handler,
+                                                           CACHE_SESSOES_MAX_BYTES // self.max_workers))
+        return self._executor
+
+    def vale_o_pool(self, pedidos):
+        """Indica se o lote e grande o bastante para o pool (e se ha mais de um nucleo para dividi-lo)."""
+        return self.max_workers > 1 and len(pedidos) >= self.min_voltas
+
+    def extrair(self, session_key, pedidos):
+        """Processa as voltas pedidas no pool e grava cada uma no armazem.
+
+        Args:
+            session_key (tuple): Chave (ano, gp, sessao) da sessao, carregada pelos processos do cache em disco.
+            pedidos (list): Pares (piloto, numero da volta).
+
+        Returns:
+            dict: (piloto, volta) -> erro, para as voltas que falharam.
+        """
+        por_piloto = {}
+        for piloto, volta in pedidos:
+            por_piloto.setdefault(piloto, []).append(volta)
+        # Um grupo de pilotos por processo, distribuidos em rodizio
+        grupos = [{} for _ in range(min(self.max_workers, len(por_piloto)))]
+        for i, (piloto, voltas) in enumerate(por_piloto.items()):
+            grupos[i % len(grupos)][piloto] = voltas
+        executor = self._get_executor()
+        futuros = {executor.submit(_extrair_pilotos, session_key, grupo): grupo for grupo in grupos}
+        erros = {}
+        for futuro in as_completed(futuros):
+            erro = futuro.exception()
+            if erro is not None:
+                erros.update({(piloto, volta): erro
+                              for piloto, voltas in futuros[futuro].items() for volta in voltas})
+            else:
+                erros.update(futuro.result())
+        return erros
+
+    def encerrar(self):
+        """Encerra o pool atual, se existir."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
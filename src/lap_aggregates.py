@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+CANAIS_AGREGADOS = ("Speed", "Throttle", "Brake", "nGear", "DRS")
+
+ACELERADOR_PLENO = 98  # Acelerador (%) a partir do qual a amostra conta como pe embaixo
+DRS_ABERTO = 10  # Valores do canal DRS a partir dos quais a asa esta aberta (10, 12 e 14)
+
+# Colunas copiadas da tabela de voltas do fastf1 (tempos convertidos para segundos)
+COLUNAS_VOLTAS = ("LapTime", "Sector1Time", "Sector2Time", "Sector3Time")
+
+
+def _segundos(serie, dtype=np.float32):
+    return serie.dt.total_seconds().to_numpy(dtype=dtype)
+
+
+def _amostras_por_volta(laps, canais_por_piloto):
+    """Associa cada amostra do car_data a linha da volta em que ela caiu.
+
+    As amostras de cada piloto estao em ordem de tempo, entao um `searchsorted` nos inicios das voltas dele
+    da a volta de cada amostra; amostras fora de qualquer volta (box, antes da largada) sao descartadas.
+
+    Returns:
+        tuple: (linha da volta de cada amostra, {canal: valores}), ordenados por volta e depois por tempo.
+    """
+    inicios = _segundos(laps["LapStartTime"], float)
+    fins = _segundos(laps["Time"], float)
+    numeros = laps["DriverNumber"].to_numpy()
+
+    ids, partes = [], {}
+    for numero, canais in canais_por_piloto.items():
+        linhas = np.flatnonzero((numeros == numero) & ~np.isnan(inicios))
+        if not len(linhas):
+            continue
+        linhas = linhas[np.argsort(inicios[linhas], kind="stable")]
+        tempos = canais["SessionTime"]
+        posicao = np.searchsorted(inicios[linhas], tempos, side="right") - 1
+        dentro = posicao >= 0
+        dentro[dentro] = tempos[dentro] <= fins[linhas[posicao[dentro]]]
+        ids.append(linhas[posicao[dentro]])
+        for canal, valores in canais.items():
+            partes.setdefault(canal, []).append(valores[dentro])
+
+    if not ids:
+        return np.empty(0, dtype=int), {}
+    ids = np.concatenate(ids)
+    ordem = np.argsort(ids, kind="stable")
+    return ids[ordem], {canal: np.concatenate(valores)[ordem] for canal, valores in partes.items()}
+
+
+def agregar_voltas(laps, canais_por_piloto):
+    """Monta a tabela de agregados por volta de todos os pilotos numa unica passada sobre o car_data.
+
+    As amostras de todos os pilotos sao concatenadas e ordenadas por volta, e cada agregado sai de uma
+    reducao por grupo (`np.bincount` e `ufunc.reduceat`), sem montar a telemetria de nenhuma volta.
+
+    Args:
+        laps (Laps): Voltas da sessao (`session.laps`).
+        canais_por_piloto (dict): Numero do piloto -> {canal: np.ndarray} com 'SessionTime' em segundos e os
+            canais de `CANAIS_AGREGADOS` (ver `CarregadorTelemetria.canais_carro`).
+
+    Returns:
+        pd.DataFrame: Uma linha por volta de `laps`, na mesma ordem, com piloto, numero, stint, composto,
+        tempos (s), velocidade media e maxima (km/h), % de acelerador pleno, frenagens, distancia com DRS
+        aberto (m), trocas de marcha e numero de amostras.
+    """
+    n = len(laps)
+    ids, canais = _amostras_por_volta(laps, canais_por_piloto)
+    amostras = np.bincount(ids, minlength=n)
+    com_dados = amostras > 0
+    # Primeira amostra de cada volta no array ordenado
+    inicio_grupo = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.empty(0, dtype=int)
+
+    def por_volta(pesos):
+        return np.bincount(ids, weights=pesos, minlength=n)
+
+    def media(pesos):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(com_dados, por_volta(pesos) / amostras, np.nan)
+
+    def anterior(valores):
+        """Valor da amostra anterior na mesma volta (a primeira amostra de cada volta repete o proprio valor)."""
+        deslocados = np.r_[valores[:1], valores[:-1]]
+        deslocados[inicio_grupo] = valores[inicio_grupo]
+        return deslocados
+
+    tabela = {
+        "Driver": pd.Categorical(laps["Driver"].to_numpy()),
+        "LapNumber": laps["LapNumber"].to_numpy(dtype=float).astype(np.int16),
+        "Stint": laps["Stint"].fillna(0).to_numpy(dtype=float).astype(np.int8),
+        "Compound": pd.Categorical(laps["Compound"].fillna("Desconhecido").to_numpy()),
+    }
+    for coluna in COLUNAS_VOLTAS:
+        tabela[coluna] = _segundos(laps[coluna])
+
+    velocidade = canais.get("Speed", np.zeros(len(ids))).astype(float)
+    maxima = np.full(n, np.nan)
+    if len(ids):
+        maxima[ids[inicio_grupo]] = np.maximum.reduceat(velocidade, inicio_grupo)
+    tabela["VelocidadeMedia"] = media(velocidade).astype(np.float32)
+    tabela["VelocidadeMaxima"] = maxima.astype(np.float32)
+
+    acelerador = canais.get("Throttle", np.zeros(len(ids)))
+    tabela["AceleradorPleno"] = (100 * media(acelerador >= ACELERADOR_PLENO)).astype(np.float32)
+
+    freio = canais.get("Brake", np.zeros(len(ids))).astype(bool)
+    tabela["Frenagens"] = por_volta(freio & ~anterior(freio)).astype(np.int16)
+
+    # Distancia percorrida entre amostras: velocidade media do intervalo x duracao
+    tempos = canais.get("SessionTime", np.zeros(len(ids)))
+    distancia = (velocidade + anterior(velocidade)) / 2 / 3.6 * (tempos - anterior(tempos))
+    drs = canais.get("DRS", np.zeros(len(ids)))
+    tabela["DistanciaDRS"] = por_volta(distancia * (drs >= DRS_ABERTO)).astype(np.float32)
+
+    marcha = canais.get("nGear", np.zeros(len(ids)))
+    tabela["TrocasMarcha"] = por_volta(marcha != anterior(marcha)).astype(np.int16)
+    tabela["Amostras"] = amostras.astype(np.int32)
+    return pd.DataFrame(tabela)
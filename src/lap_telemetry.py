@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# Canais da telemetria de uma volta e o dtype de cada um (em memoria e nos arquivos do armazem)
+DTYPES_CANAIS = {
+    "Distance": np.float32,
+    "Speed": np.float32,
+    "Throttle": np.float32,
+    "Brake": np.bool_,
+    "nGear": np.int8,
+    "RPM": np.float32,
+    "DRS": np.int8,
+    "X": np.float32,
+    "Y": np.float32,
+    "Time": np.float64,  # segundos desde o inicio da volta
+}
+
+
+def converter_canal(canal, valores):
+    """Converte os valores de um canal (array ou Series) no dtype compacto dele.
+
+    nGear, DRS e Brake podem chegar com NaN (bordas interpoladas pelo fastf1, buracos do ao vivo), e o cast
+    direto para int8/bool viraria 0/True sem aviso. Nesses canais os buracos recebem a amostra valida anterior
+    (ou a seguinte, no comeco) antes do cast; um canal sem nenhuma amostra valida fica zerado.
+    """
+    dtype = np.dtype(DTYPES_CANAIS[canal])
+    if isinstance(valores, pd.Series):
+        if valores.dtype.kind == "m":
+            valores = valores.dt.total_seconds()
+        valores = valores.to_numpy()
+    valores = np.asarray(valores)
+    if dtype.kind in "bi" and valores.dtype.kind in "fO":
+        valores = pd.Series(valores, dtype=float).ffill().bfill().fillna(0).round().to_numpy()
+    return np.ascontiguousarray(valores, dtype=dtype)
+
+
+class TelemetriaVolta:
+    """Telemetria processada de uma volta, um array contiguo e compacto por canal.
+
+    Substitui o DataFrame do fastf1 (float64/int64 e metadados por objeto) na memoria: canais continuos
+    em float32, Brake/nGear/DRS em bool/int8 e Time em float64 (segundos desde o inicio da volta). O acesso
+    segue o de um DataFrame (`tel["Speed"]`, `"DRS" in tel`, `len(tel)`), mas devolve `numpy.ndarray`.
+    Os arrays podem ser memmaps do armazem, sem copia.
+    """
+
+    __slots__ = tuple(DTYPES_CANAIS)
+
+    def __init__(self, **canais):
+        for canal in DTYPES_CANAIS:
+            valores = canais.get(canal)
+            setattr(self, canal, None if valores is None else converter_canal(canal, valores))
+
+    @classmethod
+    def de_dataframe(cls, tel):
+        """Converte um DataFrame de telemetria (ex.: `telemetria_volta`) nos dtypes compactos."""
+        return cls(**{canal: tel[canal] for canal in DTYPES_CANAIS if canal in tel})
+
+    def __contains__(self, canal):
+        return canal in DTYPES_CANAIS and getattr(self, canal) is not None
+
+    def __getitem__(self, canal):
+        if canal not in self:
+            raise KeyError(canal)
+        return getattr(self, canal)
+
+    def __len__(self):
+        return next((len(getattr(self, canal)) for canal in self.canais), 0)
+
+    @property
+    def canais(self):
+        """Canais presentes, na ordem de `DTYPES_CANAIS`."""
+        return [canal for canal in DTYPES_CANAIS if getattr(self, canal) is not None]
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados pelos arrays dos canais."""
+        return sum(getattr(self, canal).nbytes for canal in self.canais)
+
+    def para_dataframe(self):
+        """Retorna um DataFrame com os canais (Time como Timedelta), para exportar ou inspecionar."""
+        colunas = {canal: getattr(self, canal) for canal in self.canais}
+        if "Time" in colunas:
+            colunas["Time"] = pd.to_timedelta(colunas["Time"], unit="s")
+        return pd.DataFrame(colunas)
@@ -0,0 +1,474 @@
+import json
+import logging
+import math
+import os
+import re
+import socket
+
+import numpy as np
+import pandas as pd
+from fastf1 import _api as api
+from fastf1.utils import to_datetime, to_timedelta
+
+from config import AO_VIVO_ATRASO_VOLTA, AO_VIVO_DESISTIR_VOLTA, AO_VIVO_ESPERA_TELEMETRIA
+from lap_telemetry import TelemetriaVolta
+
+# Canais do CarData.z: numero do canal no live timing -> canal do fastf1 (mesmo mapeamento do `api.car_data`)
+CANAIS_CARRO = {"0": "RPM", "2": "Speed", "3": "nGear", "4": "Throttle", "5": "Brake", "45": "DRS"}
+CANAIS_POSICAO = ("X", "Y")
+
+logger = logging.getLogger(__name__)
+
+
+class SerieCrescente:
+    """Amostras de um piloto em arrays que dobram de capacidade quando enchem.
+
+    Anexar um bloco custa o tamanho do bloco (amortizado), e o trecho de uma volta sai por busca binaria no
+    tempo, sem copia.
+    """
+
+    def __init__(self, canais, capacidade=1024):
+        self.n = 0
+        self.tempo = np.empty(capacidade)
+        self.canais = {canal: np.empty(capacidade, dtype=np.float32) for canal in canais}
+
+    @property
+    def ultimo_tempo(self):
+        """Tempo (s) da amostra mais recente (-inf sem amostras)."""
+        return float(self.tempo[self.n - 1]) if self.n else -math.inf
+
+    def anexar(self, tempos, valores):
+        """Anexa amostras em ordem de tempo; as anteriores a ultima ja guardada (repetidas) sao descartadas."""
+        tempos = np.asarray(tempos, dtype=float)
+        novas = tempos > self.ultimo_tempo
+        tempos = tempos[novas]
+        if not len(tempos):
+            return
+        fim = self.n + len(tempos)
+        if fim > len(self.tempo):
+            capacidade = max(2 * len(self.tempo), fim)
+            self.tempo = self._crescer(self.tempo, capacidade)
+            self.canais = {canal: self._crescer(array, capacidade) for canal, array in self.canais.items()}
+        self.tempo[self.n:fim] = tempos
+        for canal, array in self.canais.items():
+            array[self.n:fim] = np.asarray(valores[canal], dtype=np.float32)[novas]
+        self.n = fim
+
+    def _crescer(self, array, capacidade):
+        maior = np.empty(capacidade, dtype=array.dtype)
+        maior[:self.n] = array[:self.n]
+        return maior
+
+    def intervalo(self, inicio, fim):
+        """Retorna (tempos, {canal: valores}) das amostras entre `inicio` e `fim` (s), como views."""
+        tempos = self.tempo[:self.n]
+        i, j = np.searchsorted(tempos, [inicio, fim], side="left")
+        j += int(j < self.n and tempos[j] == fim)
+        return tempos[i:j], {canal: array[i:j] for canal, array in self.canais.items()}
+
+    def tabela(self):
+        """Copia das amostras como DataFrame, com 'SessionTime' como Timedelta."""
+        dados = {"SessionTime": pd.to_timedelta(self.tempo[:self.n], unit="s")}
+        dados.update({canal: array[:self.n].copy() for canal, array in self.canais.items()})
+        return pd.DataFrame(dados)
+
+
+class _OrigemLinhas:
+    """Base das origens do live timing: guarda a linha incompleta do fim de cada leitura para a proxima."""
+
+    def __init__(self):
+        self.encerrada = False
+        self._resto = b""
+
+    def _separar(self, bloco):
+        partes = (self._resto + bloco).split(b"\n")
+        self._resto = partes.pop()
+        return [parte.decode("utf-8", errors="replace") for parte in partes if parte.strip()]
+
+    def fechar(self):
+        self.encerrada = True
+
+
+class OrigemArquivo(_OrigemLinhas):
+    """Gravacao do live timing (`fastf1.livetiming.SignalRClient`), lida como `tail -f`.
+
+    Cada leitura devolve so as linhas escritas desde a anterior, entao o arquivo pode estar sendo gravado
+    durante a sessao.
+    """
+
+    def __init__(self, caminho):
+        super().__init__()
+        self.caminho = caminho
+        self._posicao = 0
+
+    def ler(self):
+        """Retorna as linhas completas novas do arquivo."""
+        with open(self.caminho, "rb") as arquivo:
+            arquivo.seek(self._posicao)
+            bloco = arquivo.read()
+            self._posicao = arquivo.tell()
+        return self._separar(bloco)
+
+
+class OrigemServidor(_OrigemLinhas):
+    """Servidor de replay local que envia as linhas de uma gravacao por TCP, no ritmo da sessao."""
+
+    def __init__(self, host, porta, timeout=5.0):
+        super().__init__()
+        self.endereco = (host, porta)
+        self._socket = socket.create_connection(self.endereco, timeout=timeout)
+        self._socket.setblocking(False)
+
+    def ler(self):
+        """Retorna as linhas completas recebidas desde a ultima leitura, sem bloquear."""
+        blocos = []
+        while not self.encerrada:
+            try:
+                bloco = self._socket.recv(1 << 16)
+            except BlockingIOError:
+                break
+            if not bloco:
+                self.fechar()
+                break
+            blocos.append(bloco)
+        return self._separar(b"".join(blocos))
+
+    def fechar(self):
+        super().fechar()
+        self._socket.close()
+
+
+def abrir_origem(endereco):
+    """Abre a origem do live timing: caminho de uma gravacao ou 'host:porta' de um servidor de replay."""
+    if os.path.isfile(endereco):
+        return OrigemArquivo(endereco)
+    encontrado = re.fullmatch(r"(?:tcp://)?([\w.\-]+):(\d+)", endereco.strip())
+    if encontrado is None:
+        raise ValueError(f"Origem invalida (arquivo inexistente ou sem host:porta): {endereco}")
+    return OrigemServidor(encontrado.group(1), int(encontrado.group(2)))
+
+
+def decodificar_linha(linha):
+    """Separa uma linha da gravacao em (categoria, mensagem, data), como o `LiveTimingData` do fastf1.
+
+    Returns:
+        tuple | None: None para linhas que nao sao mensagens (ex.: o estado inicial) ou estao corrompidas.
+    """
+    texto = linha.replace("'", '"').replace("True", "true").replace("False", "false")
+    try:
+        categoria, mensagem, data = json.loads(texto)
+    except (json.JSONDecodeError, ValueError, TypeError):
+        return None
+    data = to_datetime(data) if isinstance(data, str) else None
+    return None if data is None else (categoria, mensagem, data)
+
+
+def _segundos(valor):
+    """Tempo do live timing ('1:32.123', '31.456') em segundos (nan se vazio ou invalido)."""
+    delta = to_timedelta(valor) if isinstance(valor, str) else None
+    return delta.total_seconds() if delta is not None else math.nan
+
+
+def _valor(resposta, *chaves):
+    """`resposta[c1][c2]...` ou None (o live timing manda listas vazias no lugar de dicts sem dados)."""
+    for chave in chaves:
+        if not isinstance(resposta, dict) or chave not in resposta:
+            return None
+        resposta = resposta[chave]
+    return resposta
+
+
+class SessaoAoVivo:
+    """Sessao montada aos poucos a partir das mensagens do live timing.
+
+    Oferece o que o `F1DataHandler` usa de uma sessao do fastf1 (`drivers`, `get_driver`, `laps`, `results`,
+    `weather_data`, `car_data`), mas cresce a cada `ingerir`: as amostras de carro e de posicao sao anexadas
+    aos buffers de cada piloto (`SerieCrescente`), e uma volta e publicada quando o NumberOfLaps do
+    TimingData avanca e os dados atrasados dela chegam (tempo de volta e ultimo setor em ate
+    `AO_VIVO_ATRASO_VOLTA` segundos, como no fastf1, e o car_data ate o fim da volta ou
+    `AO_VIVO_ESPERA_TELEMETRIA` segundos). As tabelas sao montadas so quando pedidas.
+
+    Os tempos sao segundos desde a primeira mensagem: a hora de recebimento da linha para as voltas e o
+    'Utc' das amostras para a telemetria.
+    """
+
+    api_path = None
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.drivers = []
+        self.agora = 0.0  # tempo da ultima mensagem ingerida
+        self._origem = None
+        self._info = {}  # numero -> campos do DriverList (Tla, TeamName, Line, ...)
+        self._carro = {}  # numero -> SerieCrescente do CarData
+        self._posicao = {}  # numero -> SerieCrescente do Position
+        self._lotes = ({}, {})  # amostras de carro e de posicao das linhas em processamento, por piloto
+        self._timing = {}  # numero -> estado da volta em andamento
+        self._compostos = {}  # numero -> (stint, composto) atuais
+        self._pendentes = []  # voltas completadas esperando os dados atrasados
+        self._voltas = []  # linhas da tabela de voltas publicadas
+        self._clima = []
+        self._tabelas = {}  # tabelas montadas sob demanda, descartadas quando os dados mudam
+
+    def _tempo(self, data):
+        if self._origem is None:
+            self._origem = data
+        return (data - self._origem).total_seconds()
+
+    def ingerir(self, linhas):
+        """Processa as linhas novas e retorna as voltas publicadas por elas.
+
+        Returns:
+            list: (piloto, numero da volta, TelemetriaVolta, volta como pd.Series), em ordem de publicacao.
+        """
+        for linha in linhas:
+            decodificada = decodificar_linha(linha)
+            if decodificada is None:
+                continue
+            categoria, mensagem, data = decodificada
+            self.agora = self._tempo(data)
+            try:
+                self._processar(categoria, mensagem)
+            except (ValueError, TypeError, KeyError):
+                # Mensagem fora do formato esperado: descartada, como no fastf1
+                continue
+        self._anexar_lotes()
+        if linhas:
+            self._tabelas.pop("results", None)
+        return self._publicar()
+
+    def _processar(self, categoria, mensagem):
+        if categoria == "CarData.z":
+            self._amostras_carro(api.parse(mensagem, zipped=True))
+        elif categoria == "Position.z":
+            self._amostras_posicao(api.parse(mensagem, zipped=True))
+        elif categoria == "TimingData":
+            for numero, resposta in (_valor(mensagem, "Lines") or {}).items():
+                self._timing_piloto(numero, resposta)
+        elif categoria == "TimingAppData":
+            for numero, resposta in (_valor(mensagem, "Lines") or {}).items():
+                self._stints_piloto(numero, resposta)
+        elif categoria == "DriverList":
+            for numero, campos in mensagem.items():
+                if isinstance(campos, dict):
+                    self._registrar_piloto(numero).update(campos)
+        elif categoria == "WeatherData" and isinstance(mensagem, dict):
+            self._clima.append((self.agora, mensagem))
+            self._tabelas.pop("weather_data", None)
+
+    def _registrar_piloto(self, numero):
+        if numero not in self._info:
+            self._info[numero] = {}
+            self.drivers.append(numero)
+        return self._info[numero]
+
+    def _amostras_carro(self, dados):
+        lote = self._lotes[0]
+        for entrada in dados["Entries"]:
+            tempo = self._tempo(to_datetime(entrada["Utc"]))
+            for numero, carro in entrada["Cars"].items():
+                try:
+                    canais = carro["Channels"]
+                    lote.setdefault(numero, []).append([tempo] + [canais[canal] for canal in CANAIS_CARRO])
+                except KeyError:
+                    continue
+
+    def _amostras_posicao(self, dados):
+        lote = self._lotes[1]
+        for amostra in dados["Position"]:
+            tempo = self._tempo(to_datetime(amostra["Timestamp"]))
+            for numero, posicao in amostra["Entries"].items():
+                try:
+                    lote.setdefault(numero, []).append((tempo, posicao["X"], posicao["Y"]))
+                except KeyError:
+                    continue
+
+    def _anexar_lotes(self):
+        """Anexa as amostras das linhas processadas aos buffers, um bloco por piloto e por tipo."""
+        for lote, series, canais in zip(self._lotes, (self._carro, self._posicao),
+                                        (tuple(CANAIS_CARRO.values()), CANAIS_POSICAO)):
+            for numero, amostras in lote.items():
+                amostras = np.asarray(amostras, dtype=float)
+                if numero not in series:
+                    series[numero] = SerieCrescente(canais)
+                series[numero].anexar(amostras[:, 0], dict(zip(canais, amostras[:, 1:].T)))
+            lote.clear()
+
+    def _timing_piloto(self, numero, resposta):
+        """Acompanha o NumberOfLaps, os setores e o LastLapTime de um piloto (mesmas regras do fastf1)."""
+        if not isinstance(resposta, dict):
+            return
+        info = self._registrar_piloto(numero)
+        if "Line" in resposta:
+            info["Line"] = resposta["Line"]
+        estado = self._timing.setdefault(numero, {"voltas": 0, "fim": None, "setores": [math.nan] * 3,
+                                                  "anterior": None})
+
+        voltas = resposta.get("NumberOfLaps")
+        if isinstance(voltas, int) and voltas > estado["voltas"]:
+            stint, composto = self._compostos.get(numero, (math.nan, None))
+            volta = {"numero": numero, "LapNumber": voltas, "inicio": estado["fim"], "fim": self.agora,
+                     "setores": estado["setores"], "LapTime": math.nan, "Stint": stint, "Compound": composto}
+            self._pendentes.append(volta)
+            estado.update(voltas=voltas, fim=self.agora, setores=[math.nan] * 3, anterior=volta)
+
+        # Valores que chegam ate AO_VIVO_ATRASO_VOLTA depois do fim da volta ainda sao dela
+        anterior = estado["anterior"]
+        atrasado = anterior is not None and self.agora - anterior["fim"] < AO_VIVO_ATRASO_VOLTA
+        setores = anterior["setores"] if atrasado else estado["setores"]
+        for i in range(3):
+            valor = _segundos(_valor(resposta, "Sectors", str(i), "Value"))
+            if not math.isnan(valor):
+                setores[i] = valor
+        tempo_volta = _segundos(_valor(resposta, "LastLapTime", "Value"))
+        if atrasado and tempo_volta < 150:
+            anterior["LapTime"] = tempo_volta
+
+    def _stints_piloto(self, numero, resposta):
+        """Guarda o stint mais recente do piloto e o composto dele (o TimingAppData manda so o que mudou)."""
+        stints = _valor(resposta, "Stints")
+        if isinstance(stints, list):
+            stints = dict(enumerate(stints))
+        stints = {int(indice): stint for indice, stint in (stints or {}).items() if isinstance(stint, dict)}
+        if not stints:
+            return
+        indice = max(stints)
+        atual, composto = self._compostos.get(numero, (0, None))
+        if indice + 1 < atual:
+            return
+        if indice + 1 > atual:
+            composto = None
+        self._compostos[numero] = (indice + 1, stints[indice].get("Compound", composto))
+
+    def _publicar(self):
+        """Publica as voltas pendentes cujos dados atrasados ja chegaram."""
+        publicadas = []
+        restantes = []
+        for volta in self._pendentes:
+            numero = volta["numero"]
+            carro = self._carro.get(numero)
+            espera = self.agora - volta["fim"]
+            completa = carro is not None and carro.ultimo_tempo >= volta["fim"]
+            if espera < AO_VIVO_ATRASO_VOLTA or (not completa and espera < AO_VIVO_ESPERA_TELEMETRIA):
+                restantes.append(volta)
+                continue
+            inicio = volta["inicio"]
+            if inicio is None and not math.isnan(volta["LapTime"]):
+                inicio = volta["fim"] - volta["LapTime"]
+            tel = self.telemetria(numero, inicio, volta["fim"]) if inicio is not None else None
+            if tel is None:
+                # Sem amostras (ou sem inicio) ainda: a volta espera mais um pouco antes de ser descartada
+                if espera < AO_VIVO_DESISTIR_VOLTA:
+                    restantes.append(volta)
+                else:
+                    logger.warning("Volta %d de %s descartada: sem telemetria %.0f s depois do fim",
+                                   int(volta["LapNumber"]), self.get_driver(numero)["Abbreviation"], espera)
+                continue
+            lap = self._linha_volta(volta, inicio)
+            self._voltas.append(lap)
+            publicadas.append((lap["Driver"], int(volta["LapNumber"]), tel, pd.Series(lap)))
+        self._pendentes = restantes
+        if publicadas:
+            self._tabelas.pop("laps", None)
+        return publicadas
+
+    def _linha_volta(self, volta, inicio):
+        """Linha da tabela de voltas, com as colunas do fastf1 usadas pelo handler e pelo plotter."""
+        def delta(segundos):
+            return pd.Timedelta(seconds=segundos) if not math.isnan(segundos) else pd.NaT
+
+        return {
+            "Driver": self.get_driver(volta["numero"])["Abbreviation"],
+            "DriverNumber": volta["numero"],
+            "LapNumber": float(volta["LapNumber"]),
+            "LapTime": delta(volta["LapTime"]),
+            "Sector1Time": delta(volta["setores"][0]),
+            "Sector2Time": delta(volta["setores"][1]),
+            "Sector3Time": delta(volta["setores"][2]),
+            "Stint": float(volta["Stint"]),
+            "Compound": volta["Compound"],
+            "LapStartTime": delta(inicio),
+            "Time": delta(volta["fim"]),
+        }
+
+    def telemetria(self, numero, inicio, fim):
+        """Telemetria de uma volta a partir dos buffers do piloto (custo proporcional as amostras da volta).
+
+        A distancia e integrada da velocidade, e X/Y sao interpolados do Position nos instantes do car_data.
+
+        Returns:
+            TelemetriaVolta | None: None se a volta tem menos de duas amostras.
+        """
+        carro = self._carro.get(numero)
+        if carro is None:
+            return None
+        tempos, canais = carro.intervalo(inicio, fim)
+        if len(tempos) < 2:
+            return None
+        velocidade = canais["Speed"].astype(float)
+        distancia = np.cumsum(velocidade / 3.6 * np.diff(tempos, prepend=tempos[0]))
+
+        posicao = self._posicao.get(numero)
+        x = y = np.full(len(tempos), np.nan)
+        if posicao is not None:
+            tempos_pos, xy = posicao.intervalo(inicio - 1, fim + 1)
+            if len(tempos_pos) >= 2:
+                x = np.interp(tempos, tempos_pos, xy["X"])
+                y = np.interp(tempos, tempos_pos, xy["Y"])
+        return TelemetriaVolta(Distance=distancia, Speed=velocidade, Throttle=canais["Throttle"],
+                               Brake=canais["Brake"] > 0, nGear=canais["nGear"], RPM=canais["RPM"],
+                               DRS=canais["DRS"], X=x, Y=y, Time=tempos - inicio)
+
+    def get_driver(self, identificador):
+        """Dados do piloto pelo numero ou pela abreviatura (Abbreviation, DriverNumber, TeamName, Position)."""
+        numero = identificador
+        if numero not in self._info:
+            numero = next((n for n, info in self._info.items() if info.get("Tla") == identificador), None)
+            if numero is None:
+                raise ValueError(f"Piloto invalido: {identificador}")
+        info = self._info[numero]
+        linha = info.get("Line")
+        return {"DriverNumber": numero, "Abbreviation": info.get("Tla", numero),
+                "TeamName": info.get("TeamName", "Desconhecido"),
+                "Position": float(linha) if linha is not None else math.nan}
+
+    @property
+    def laps(self):
+        """Voltas publicadas ate agora (montada de novo so depois de novas voltas)."""
+        if "laps" not in self._tabelas:
+            self._tabelas["laps"] = pd.DataFrame(self._voltas, columns=[
+                "Driver", "DriverNumber", "LapNumber", "LapTime", "Sector1Time", "Sector2Time", "Sector3Time",
+                "Stint", "Compound", "LapStartTime", "Time"])
+        return self._tabelas["laps"]
+
+    @property
+    def results(self):
+        """Pilotos com equipe e posicao atual."""
+        if "results" not in self._tabelas:
+            self._tabelas["results"] = pd.DataFrame([self.get_driver(numero) for numero in self.drivers],
+                                                    columns=["DriverNumber", "Abbreviation", "TeamName", "Position"])
+        return self._tabelas["results"]
+
+    @property
+    def weather_data(self):
+        """Amostras do WeatherData (uma por minuto), com as conversoes do fastf1."""
+        if "weather_data" not in self._tabelas:
+            linhas = []
+            for tempo, clima in self._clima:
+                linha = {"Time": pd.Timedelta(seconds=tempo), "Rainfall": clima.get("Rainfall") == "1"}
+                for chave in ("AirTemp", "TrackTemp", "WindSpeed"):
+                    try:
+                        linha[chave] = float(clima[chave])
+                    except (KeyError, ValueError):
+                        linha[chave] = math.nan
+                linhas.append(linha)
+            self._tabelas["weather_data"] = pd.DataFrame(linhas)
+        return self._tabelas["weather_data"]
+
+    @property
+    def car_data(self):
+        """car_data de todos os pilotos como DataFrames com 'SessionTime' (copia dos buffers, para agregados)."""
+        return {numero: serie.tabela() for numero, serie in self._carro.items()}
+
+    def _load_telemetry(self):
+        """A telemetria ja esta em memoria (chamado pelo `CarregadorTelemetria` em sessoes sem `api_path`)."""
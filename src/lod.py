@@ -0,0 +1,53 @@
+import numpy as np
+
+
+class PiramideMinMax:
+    """Piramide de resolucoes min/max das voltas de um grafico, para desenhar so o que cabe na tela.
+
+    O nivel k guarda, para cada bloco de 2**k amostras de cada volta, a posicao do minimo e do maximo. Ao
+    desenhar, escolhe-se o nivel em que os blocos visiveis cabem em `max_pontos` e cada bloco vira dois
+    pontos (min e max na ordem da distancia), entao picos como velocidade maxima e pontas de freio nunca
+    somem. NaN nunca e escolhido quando o bloco tem algum valor valido.
+    """
+
+    def __init__(self, ys):
+        """Monta todos os niveis a partir dos valores (n_voltas, n_amostras)."""
+        self.ys = ys
+        self.n = ys.shape[1]
+        valores_min = np.where(np.isnan(ys), np.inf, ys)
+        valores_max = np.where(np.isnan(ys), -np.inf, ys)
+
+        # Nivel 0: cada amostra e o proprio min/max
+        indices = np.broadcast_to(np.arange(self.n), ys.shape)
+        self.niveis = [(indices, indices)]
+        while self.niveis[-1][0].shape[1] > 1:
+            imin, imax = self.niveis[-1]
+            self.niveis.append((self._reduzir(imin, valores_min, np.less_equal),
+                                self._reduzir(imax, valores_max, np.greater_equal)))
+
+    @staticmethod
+    def _reduzir(indices, valores, melhor):
+        """Junta os blocos dois a dois, mantendo o indice do melhor valor de cada par."""
+        if indices.shape[1] % 2:
+            indices = np.concatenate([indices, indices[:, -1:]], axis=1)
+        a, b = indices[:, 0::2], indices[:, 1::2]
+        va = np.take_along_axis(valores, a, axis=1)
+        vb = np.take_along_axis(valores, b, axis=1)
+        return np.where(melhor(va, vb), a, b)
+
+    def decimar(self, inicio, fim, max_pontos):
+        """Indices das amostras a desenhar no intervalo [inicio, fim) de cada volta.
+
+        Returns:
+            numpy.ndarray: Indices (n_voltas, n_pontos) em ordem crescente, ou None se o intervalo ja cabe em
+            `max_pontos` e pode ser desenhado inteiro.
+        """
+        if fim - inicio <= max_pontos:
+            return None
+        nivel = 1
+        while nivel < len(self.niveis) - 1 and 2 * (((fim - 1) >> nivel) - (inicio >> nivel) + 1) > max_pontos:
+            nivel += 1
+        imin, imax = self.niveis[nivel]
+        blocos = slice(inicio >> nivel, ((fim - 1) >> nivel) + 1)
+        pares = np.sort(np.stack([imin[:, blocos], imax[:, blocos]], axis=2), axis=2)
+        return pares.reshape(len(pares), -1)
@@ -1,17 +1,22 @@
 import customtkinter as ctk
 
-from data_handler import F1DataHandler
-from plotter import F1Plotter
 from ui import F1UI
 
 
+def criar_janela():
+    """Cria a janela principal.
+
+    Os modulos pesados (fastf1, pandas, matplotlib) nao sao importados aqui: a interface os carrega no
+    worker depois que a janela aparece.
+    """
+    root = ctk.CTk()
+    ui = F1UI(root)
+    return root, ui
+
+
 def main():
     """Start do programa."""
-    root = ctk.CTk()
-    data_handler = F1DataHandler()
-    plotter = F1Plotter(graph_frame=None)
-    ui = F1UI(root, data_handler, plotter)
-    plotter.graph_frame = ui.graph_frame
+    root, _ = criar_janela()
     root.mainloop()
 
 
@@ -0,0 +1,55 @@
+import numpy as np
+
+from alignment import alinhar_voltas
+
+
+class DominanciaMiniSetores:
+    """Tempo de cada volta em cada mini-setor e a volta mais rapida em cada um.
+
+    Attributes:
+        limites (numpy.ndarray): Distancias das divisas dos mini-setores (n_mini_setores + 1,).
+        tempos (numpy.ndarray): Tempo (s) de cada volta em cada mini-setor (n_voltas, n_mini_setores).
+        vencedor (numpy.ndarray): Indice da volta mais rapida em cada mini-setor (-1 sem tempos).
+        pilotos (list): Piloto de cada volta.
+        voltas (list): Numero de cada volta.
+    """
+
+    def __init__(self, limites, tempos, pilotos, voltas):
+        self.limites = limites
+        self.tempos = tempos
+        self.pilotos = list(pilotos)
+        self.voltas = list(voltas)
+        validos = ~np.isnan(tempos).all(axis=0)
+        self.vencedor = np.full(tempos.shape[1], -1)
+        self.vencedor[validos] = np.nanargmin(tempos[:, validos], axis=0)
+
+    def mini_setor(self, distancia):
+        """Mini-setor de cada distancia (as distancias fora da volta caem no primeiro/ultimo)."""
+        return np.clip(np.searchsorted(self.limites, distancia, side="right") - 1, 0, len(self.limites) - 2)
+
+    def vitorias(self):
+        """Retorna (piloto, mini-setores vencidos) dos pilotos que venceram algum, do que mais venceu ao que menos."""
+        contagem = np.bincount(self.vencedor[self.vencedor >= 0], minlength=len(self.pilotos))
+        return [(self.pilotos[i], int(contagem[i])) for i in np.argsort(-contagem, kind="stable") if contagem[i]]
+
+
+def calcular_dominancia(telemetrias, pilotos, voltas, n_mini_setores, comprimento):
+    """Divide a volta em mini-setores de mesma distancia e mede o tempo de todas as voltas em cada um.
+
+    O Time de todas as voltas e reamostrado direto nas divisas dos mini-setores (`alinhar_voltas` com as
+    divisas como grade), entao os tempos por mini-setor saem de uma unica diferenca no eixo das divisas,
+    para todas as voltas de uma vez.
+
+    Args:
+        telemetrias (list): Telemetria de cada volta (com 'Distance' e 'Time').
+        pilotos (list): Piloto de cada volta.
+        voltas (list): Numero de cada volta.
+        n_mini_setores (int): Numero de mini-setores.
+        comprimento (float): Distancia da volta (m) dividida entre os mini-setores.
+
+    Returns:
+        DominanciaMiniSetores
+    """
+    limites = np.linspace(0.0, comprimento, n_mini_setores + 1)
+    tempos = alinhar_voltas(telemetrias, ("Time",), limites).canal("Time")
+    return DominanciaMiniSetores(limites, np.diff(tempos, axis=1), pilotos, voltas)
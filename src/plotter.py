@@ -1,254 +1,861 @@
-# src/plotter.py
-from tkinter import filedialog
+import time
 
-import matplotlib.pyplot as plt
-import mplcursors
 import numpy as np
-import pandas as pd
 from matplotlib.axes import Axes
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.colors import LinearSegmentedColormap
-
-from config import TEAM_COLORS, TIRE_COLORS
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LinearSegmentedColormap, to_rgba, to_rgba_array
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from circuit_map import montar_mapa_circuito
+from config import CORES_EXTRAS, REPLAY_FPS, TEAM_COLORS, TIPOS_GRAFICOS, TIRE_COLORS
+from lod import PiramideMinMax
+from replay import TrajetoriasReplay
+from tracing import medido, rastreador
+
+# Tipos de gráfico que mostram diretamente um canal alinhado: tipo -> (canal, rótulo do eixo y)
+CANAIS_GRAFICO = {
+    "Velocidade": ("Speed", "Velocidade (km/h)"),
+    "Acelerador": ("Throttle", "Acelerador (%)"),
+    "Freio": ("Brake", "Freio (%)"),
+    "Marcha": ("nGear", "Marcha"),
+    "RPM": ("RPM", "RPM"),
+    "DRS": ("DRS", "DRS (Ativado=1, Desativado=0)"),
+}
+
+CORES_SETORES = ["#FF5555", "#55FF55", "#5555FF"]
+
+# Cor de cada segmento do mini-mapa pelo setor; o setor -1 (sem tempos de setor) cai na última linha
+_CORES_MAPA = to_rgba_array(CORES_SETORES + [to_rgba("white", 0.3)])
+_COR_DRS = to_rgba("#00FF00", 0.7)
+
+# Rótulo das linhas ocultas do pool (rótulos com "_" ficam fora da legenda)
+_ROTULO_OCULTO = "_oculta"
 
 
 class F1Plotter:
-    """Classe para gerenciar a plotagem de gráficos de telemetria."""
+    """Classe para gerenciar a plotagem de gráficos de telemetria.
+
+    A figura, o canvas, os eixos e os artistas fixos (fundo, linhas das voltas, traçado do mini-mapa) são
+    criados uma única vez e reaproveitados a cada comparação: as linhas só recebem novos dados com
+    `set_data`. Apenas as anotações de cada gráfico são removidas e recriadas.
+    """
 
     def __init__(self, graph_frame):
         self.graph_frame = graph_frame
         self.canvas = None
         self.current_ax: Axes | None = None
         self.current_fig = None
+        self.ax_map: Axes | None = None
+        self._ax_comparacao: Axes | None = None
+        self._ax_evolucao: Axes | None = None  # eixo do gráfico de evolução, criado no primeiro uso
+        self._fundo = None
+        self._linhas = []  # pool de linhas do gráfico principal, uma por volta
+        self._tracado = None  # LineCollection do mini-mapa (setores e zonas de DRS)
+        self._mapa_atual = None
+        self._marcador = None
+        self._tooltip = None
+        self._fundo_blit = None  # imagem da figura sem os artistas animados, restaurada a cada hover
+        self._hover = None  # arrays do gráfico atual usados no hover (grade, ys, X e Y da referência, rótulos)
+        self._artistas_volateis = []  # linhas de setor do gráfico atual, removidas no próximo
+        self._picos = []  # anotações de pico, refeitas também na troca de tipo
+        self._dados = None  # dados do gráfico atual, para trocar o tipo sem recarregar
+        self._linhas_atuais = []
+        self._tipo_atual = None
+        self._carros = None  # marcadores animados do replay no mini-mapa
+        self._carros_grafico = None  # marcadores animados do replay sobre as linhas do gráfico principal
+        self._cursor_replay = None
+        self._relogio_replay = None
+        self._replay = None  # TrajetoriasReplay do replay em andamento (ou parado no fim)
+        self._timer_replay = None
+        self._inicio_replay = (0.0, 0.0)  # (relógio, tempo de volta) do último início ou troca de velocidade
+        self._velocidade_replay = 1.0
+        self._ao_parar_replay = None
 
     def limpar_grafico(self):
-        """Limpa o gráfico anterior."""
-        if self.canvas:
-            self.canvas.get_tk_widget().pack_forget()
-
-    def _setup_layout(self) -> tuple[Axes, Axes]:
-        """Configura o layout do gráfico com o gráfico principal e o mini-mapa."""
+        """Limpa o gráfico anterior, mantendo a figura e os artistas reaproveitáveis."""
+        self.parar_replay(redesenhar=False)
+        for artista in self._artistas_volateis + self._picos:
+            artista.remove()
+        self._artistas_volateis = []
+        self._picos = []
+        self._dados = None
+        self._linhas_atuais = []
+        self._tipo_atual = None
+        self._hover = None
+        for linha in self._linhas:
+            linha.set_visible(False)
+            linha.set_label(_ROTULO_OCULTO)
+        if self._marcador is not None:
+            self._marcador.set_data([], [])
+            self._tooltip.set_visible(False)
+
+    def fechar(self):
+        """Libera a figura e o canvas (um novo gráfico cria outros)."""
         self.limpar_grafico()
-        fig = plt.figure(figsize=(8, 6), facecolor="#1a1a1a")
+        if self.canvas is not None and self.graph_frame is not None:
+            self.canvas.get_tk_widget().destroy()
+        if self.current_fig is not None:
+            self.current_fig.clear()
+        self.canvas = self.current_fig = self.current_ax = self.ax_map = None
+        self._ax_comparacao = self._ax_evolucao = None
+        self._fundo = self._tracado = self._mapa_atual = self._marcador = self._tooltip = self._fundo_blit = None
+        self._carros = self._carros_grafico = self._cursor_replay = self._relogio_replay = self._timer_replay = None
+        self._linhas = []
+
+    @medido("layout")
+    def _setup_layout(self) -> tuple[Axes, Axes]:
+        """Configura o layout do gráfico com o gráfico principal e o mini-mapa.
+
+        Na primeira chamada cria a figura, o canvas e os artistas fixos; nas seguintes só limpa o gráfico
+        anterior.
+        """
+        if self.current_fig is not None:
+            self.limpar_grafico()
+            self._mostrar_evolucao(False)
+            return self.current_ax, self.ax_map
+
+        fig = Figure(figsize=(8, 6), facecolor="#1a1a1a")
         gs = fig.add_gridspec(1, 4)
         ax: Axes = fig.add_subplot(gs[0, :3])
         ax_map: Axes = fig.add_subplot(gs[0, 3])
-        self.current_ax = ax
+        # Margens fixas no lugar do tight_layout a cada gráfico
+        fig.subplots_adjust(left=0.1, right=0.98, bottom=0.08, top=0.9, wspace=0.1)
+
+        # Fundo com gradiente, reposicionado a cada gráfico
+        gradient = np.linspace(0, 1, 256)
+        gradient = np.vstack((gradient, gradient))
+        cmap = LinearSegmentedColormap.from_list("custom_gradient", ["#2a2a2a", "#1a1a1a"])
+        self._fundo = ax.imshow(gradient, aspect="auto", cmap=cmap, extent=(0, 1, 0, 1), alpha=0.5, zorder=-1)
+
+        ax.set_xlabel("Distância na Volta (m)", color="white")
+        ax.set_facecolor("none")
+        ax.tick_params(colors="white")
+        ax.grid(True, color="gray", linestyle="--", alpha=0.3)
+
+        self._tracado = LineCollection([], linewidths=2)
+        ax_map.add_collection(self._tracado)
+        # Artistas do hover são animados: ficam fora do desenho normal e são redesenhados por blitting
+        self._marcador, = ax_map.plot([], [], "o", color="yellow", markersize=8, zorder=3, animated=True)
+        self._tooltip = ax.annotate("", xy=(0, 0), xytext=(12, 12), textcoords="offset points", color="white",
+                                    bbox=dict(boxstyle="round", fc="#1a1a1a", ec="white", alpha=0.9),
+                                    animated=True, visible=False, zorder=5)
+        # Artistas do replay, também animados: cada quadro só move estes por cima do fundo guardado
+        self._carros = ax_map.scatter([], [], s=70, edgecolors="white", zorder=4, animated=True, visible=False)
+        self._carros_grafico = ax.scatter([], [], s=35, edgecolors="white", zorder=4, animated=True, visible=False)
+        self._cursor_replay = ax.axvline(0, color="white", linewidth=1, alpha=0.6, animated=True, visible=False)
+        self._relogio_replay = ax.text(0.01, 0.98, "", transform=ax.transAxes, color="white", va="top",
+                                       animated=True, visible=False, zorder=5)
+        ax_map.set_aspect("equal")
+        ax_map.axis("off")
+        ax_map.set_facecolor("#1a1a1a")
+
+        if self.graph_frame is None:
+            # Sem janela (exportação em lote, benchmarks): canvas Agg, desenhado só ao salvar
+            self.canvas = FigureCanvasAgg(fig)
+        else:
+            # Importado aqui para o modo em lote não depender do Tk
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
+            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("draw_event", self._ao_desenhar)
+        self.canvas.mpl_connect("motion_notify_event", self._ao_mover)
+        self.canvas.mpl_connect("axes_leave_event", self._ao_sair)
+        # Zoom e pan mudam o intervalo visível: as linhas são redecimadas para ele
+        ax.callbacks.connect("xlim_changed", self._atualizar_lod)
+
         self.current_fig = fig
+        self.current_ax = self._ax_comparacao = ax
+        self.ax_map = ax_map
         return ax, ax_map
 
-    def _load_telemetry_data(self, data_handler, piloto1, piloto2, volta1_str, volta2_str):
-        """Carrega os dados de telemetria e informações dos pilotos."""
-        # Carrega telemetria
-        success1, msg1, tel1, lap1 = data_handler.get_telemetria(piloto1, volta1_str, 1)
-        success2, msg2, tel2, lap2 = data_handler.get_telemetria(piloto2, volta2_str, 2)
-        if not success1 or not success2:
-            raise ValueError(f"{msg1}\n{msg2}")
+    def _mostrar_evolucao(self, evolucao):
+        """Alterna a figura entre o gráfico de comparação (com mini-mapa) e o de evolução das voltas."""
+        if self._ax_evolucao is None and not evolucao:
+            return
+        if self._ax_evolucao is None:
+            ax = self.current_fig.add_subplot(1, 1, 1)
+            ax.set_facecolor("#1a1a1a")
+            ax.tick_params(colors="white")
+            ax.set_xlabel("Volta", color="white")
+            ax.set_ylabel("Tempo de Volta (s)", color="white")
+            ax.grid(True, color="gray", linestyle="--", alpha=0.3)
+            self._ax_evolucao = ax
+        self._ax_evolucao.set_visible(evolucao)
+        self._ax_comparacao.set_visible(not evolucao)
+        self.ax_map.set_visible(not evolucao)
+        self.current_ax = self._ax_evolucao if evolucao else self._ax_comparacao
+
+    @staticmethod
+    def _linha_do_pool(pool, ax: Axes, i):
+        """Retorna a i-ésima linha do pool, criando-a se ainda não existir."""
+        while len(pool) <= i:
+            linha, = ax.plot([], [], visible=False, label=_ROTULO_OCULTO)
+            pool.append(linha)
+        return pool[i]
+
+    @medido("load_telemetry_data")
+    def load_telemetry_data(self, data_handler, selecao, dominancia=False):
+        """Carrega os dados de telemetria e informações dos pilotos das voltas selecionadas.
+
+        Não mexe na figura, então pode rodar no worker de dados; o resultado é passado
+        para `plot_comparacao` através do argumento `dados`.
+
+        Args:
+            selecao (list): Pares (piloto, volta) da sessão atual ou trincas (piloto, volta, session_key) de
+                qualquer sessão. A primeira volta é a referência da comparação.
+            dominancia (bool): Colore o mini-mapa pelo piloto mais rápido em cada mini-setor, entre as
+                voltas selecionadas e a mais rápida de cada um dos demais pilotos (só numa sessão).
+        """
+        sessoes = [item[2] if len(item) > 2 else data_handler.last_session_key for item in selecao]
+        if any(sessao != data_handler.last_session_key for sessao in sessoes):
+            return self._load_entre_sessoes(data_handler, selecao, sessoes)
+        selecao = [(piloto, volta) for piloto, volta, *_ in selecao]
+
+        # Carrega telemetria (as voltas ainda não processadas são extraídas em paralelo)
+        success, msg, resultados = data_handler.get_telemetrias(selecao)
+        if not success:
+            raise ValueError(msg)
 
         # Pega informações dos pilotos
-        team1, pos1 = data_handler.get_driver_info(piloto1)
-        team2, pos2 = data_handler.get_driver_info(piloto2)
-        cor1 = TEAM_COLORS.get(team1, "#FF3333")
-        cor2 = TEAM_COLORS.get(team2, "#00FFFF")
-        compound1 = lap1.get("Compound", "Desconhecido")
-        compound2 = lap2.get("Compound", "Desconhecido")
+        voltas = []
+        cores_usadas = set()
+        contagem = {}
+        for piloto, _ in selecao:
+            contagem[piloto] = contagem.get(piloto, 0) + 1
+        for (piloto, _), (tel, lap) in zip(selecao, resultados):
+            team, pos = data_handler.get_driver_info(piloto)
+            cor = self._cor_livre(team, cores_usadas, len(voltas))
+            compound = lap.get("Compound", "Desconhecido")
+            rotulo = f"{piloto} ({compound}, P{pos})"
+            if contagem[piloto] > 1:
+                rotulo = f"{piloto} V{int(lap['LapNumber'])} ({compound}, P{pos})"
+            voltas.append({"piloto": piloto, "tel": tel, "lap": lap, "equipe": team, "posicao": pos, "cor": cor,
+                           "composto": compound, "rotulo": rotulo})
 
         # Pega informações climáticas
         weather_info = data_handler.get_weather_info()
-        temp_track = weather_info["temp_track"]
-        temp_air = weather_info["temp_air"]
-        rain = weather_info["rain"]
-        wind_speed = weather_info["wind_speed"]
-
-        return tel1, tel2, lap1, lap2, team1, team2, pos1, pos2, cor1, cor2, compound1, compound2, temp_track, temp_air, rain, wind_speed
-
-    def _prepare_telemetry_data(self, data_handler, tel1, tel2, tipo_grafico, wind_speed):
-        """Prepara os dados de telemetria para plotagem com base no tipo de gráfico."""
-        if tipo_grafico == "Velocidade":
-            y1 = tel1["Speed"]
-            y2 = data_handler.interpolar_telemetria(tel1, tel2, "Speed")
-            ylabel = "Velocidade (km/h)"
+
+        dados = {"voltas": voltas, "clima": weather_info, "mapa": data_handler.get_mapa_circuito()}
+        dados.update(self._prepare_telemetry_data(data_handler, voltas, weather_info["wind_speed"]))
+        if dominancia and dados["mapa"] is not None:
+            success, msg, resultado = data_handler.get_dominancia(selecao)
+            if not success:
+                raise ValueError(msg)
+            dados["mapa"], dados["legenda_mapa"] = self._mapa_dominancia(data_handler, dados["mapa"], resultado)
+        return dados
+
+    def _load_entre_sessoes(self, data_handler, selecao, sessoes):
+        """Como `load_telemetry_data`, para voltas de sessões diferentes (ex.: o mesmo GP em dois anos).
+
+        As sessões que não são a atual são carregadas em paralelo em outros processos. O rótulo de cada volta
+        leva o que muda entre as sessões (ano, GP e/ou sessão); o clima do título e o mini-mapa são os da
+        sessão da volta de referência.
+        """
+        selecao = [(piloto, volta, sessao) for (piloto, volta, *_), sessao in zip(selecao, sessoes)]
+        success, msg, resultados, climas = data_handler.get_telemetrias_sessoes(selecao)
+        if not success:
+            raise ValueError(msg)
+
+        variam = [i for i in range(3) if len({sessao[i] for sessao in sessoes}) > 1]
+        voltas = []
+        cores_usadas = set()
+        for (piloto, _, sessao), (tel, lap, team, pos) in zip(selecao, resultados):
+            cor = self._cor_livre(team, cores_usadas, len(voltas))
+            compound = lap.get("Compound", "Desconhecido")
+            nome = " ".join([piloto] + [str(sessao[i]) for i in variam])
+            voltas.append({"piloto": nome, "tel": tel, "lap": lap, "equipe": team, "posicao": pos, "cor": cor,
+                           "composto": compound, "rotulo": f"{nome} V{int(lap['LapNumber'])} ({compound}, P{pos})"})
+
+        weather_info = climas[sessoes[0]]
+        mapa = data_handler.get_mapa_circuito() if sessoes[0] == data_handler.last_session_key else None
+        dados = {"voltas": voltas, "clima": weather_info, "mapa": mapa}
+        dados.update(self._prepare_telemetry_data(data_handler, voltas, weather_info["wind_speed"]))
+        return dados
+
+    def _mapa_dominancia(self, data_handler, mapa, dominancia):
+        """Colore o traçado pelo piloto mais rápido em cada mini-setor.
+
+        Só os pilotos que venceram algum mini-setor recebem cor (do que mais venceu ao que menos), então
+        companheiros de equipe e as cores extras raramente entram em conflito.
+
+        Returns:
+            tuple: (mapa colorido, [(rótulo, cor), ...] para a legenda do mini-mapa)
+        """
+        cores_usadas = set()
+        cores = {}
+        legenda = []
+        for i, (piloto, vitorias) in enumerate(dominancia.vitorias()):
+            cores[piloto] = self._cor_livre(data_handler.get_driver_info(piloto)[0], cores_usadas, i)
+            legenda.append((f"{piloto} ({vitorias})", cores[piloto]))
+        # Uma cor por volta, na ordem da dominância; mini-setores sem vencedor (-1) caem na última
+        sem_cor = to_rgba("white", 0.3)
+        paleta = to_rgba_array([cores.get(piloto, sem_cor) for piloto in dominancia.pilotos] + [sem_cor])
+        return mapa.com_cores(paleta[dominancia.vencedor[dominancia.mini_setor(mapa.distancia)]]), legenda
+
+    @staticmethod
+    def _cor_livre(team, cores_usadas, i):
+        """Cor da equipe, ou uma cor livre da paleta extra para companheiros de equipe e equipes desconhecidas."""
+        cor = TEAM_COLORS.get(team)
+        if cor is None or cor in cores_usadas:
+            livres = [c for c in CORES_EXTRAS if c not in cores_usadas]
+            cor = livres[0] if livres else CORES_EXTRAS[i % len(CORES_EXTRAS)]
+        cores_usadas.add(cor)
+        return cor
+
+    @medido("load_evolucao")
+    def load_evolucao(self, data_handler, pilotos):
+        """Carrega os agregados por volta e as cores dos pilotos para o gráfico de evolução.
+
+        Como `load_telemetry_data`, não mexe na figura e pode rodar no worker de dados.
+
+        Args:
+            pilotos (list): Abreviaturas dos pilotos.
+        """
+        success, msg, agregados = data_handler.get_agregados()
+        if not success:
+            raise ValueError(msg)
+        cores_usadas = set()
+        cores = {piloto: self._cor_livre(data_handler.get_driver_info(piloto)[0], cores_usadas, i)
+                 for i, piloto in enumerate(pilotos)}
+        return {"agregados": agregados[agregados["Driver"].isin(pilotos)], "cores": cores}
+
+    @medido("plot_evolucao")
+    def plot_evolucao(self, data_handler, pilotos, dados=None):
+        """Plota a evolução dos tempos de volta, com o composto de cada volta e as trocas de stint.
+
+        Args:
+            pilotos (list): Abreviaturas dos pilotos.
+            dados (dict, opcional): Resultado de `load_evolucao` já calculado fora da thread do Tk.
+        """
+        try:
+            if dados is None:
+                dados = self.load_evolucao(data_handler, pilotos)
+            tabela = dados["agregados"]
+            tabela = tabela[tabela["LapTime"].notna()]
+            if tabela.empty:
+                raise ValueError("Nenhuma volta com tempo para os pilotos selecionados.")
+
+            if self.current_fig is None:
+                self._setup_layout()
+            self.limpar_grafico()
+            self._mostrar_evolucao(True)
+            ax = self.current_ax
+
+            compostos = {}
+            for piloto in pilotos:
+                voltas = tabela[tabela["Driver"] == piloto]
+                if voltas.empty:
+                    continue
+                cor = dados["cores"][piloto]
+                numeros = voltas["LapNumber"].to_numpy()
+                tempos = voltas["LapTime"].to_numpy()
+                linha, = ax.plot(numeros, tempos, color=cor, linewidth=1.5, label=piloto)
+                cores_pontos = [TIRE_COLORS.get(composto, "gray") for composto in voltas["Compound"]]
+                pontos = ax.scatter(numeros, tempos, c=cores_pontos, edgecolors=cor, s=20, zorder=3)
+                self._artistas_volateis += [linha, pontos]
+                # Linha pontilhada na primeira volta de cada stint novo (parada nos boxes)
+                stints = voltas["Stint"].to_numpy()
+                for numero in numeros[1:][stints[1:] != stints[:-1]]:
+                    self._artistas_volateis.append(ax.axvline(numero, color=cor, linestyle=":", alpha=0.6))
+                compostos.update(dict.fromkeys(voltas["Compound"]))
+
+            # Voltas atrás do safety car ou com parada distorcem a escala: o eixo vai até 107% da mediana
+            todos = tabela["LapTime"].to_numpy()
+            ax.set_xlim(tabela["LapNumber"].min() - 1, tabela["LapNumber"].max() + 1)
+            ax.set_ylim(todos.min() - 0.5, min(todos.max(), 1.07 * np.median(todos)) + 0.5)
+            ax.set_title(f"Evolução dos Tempos de Volta: {' vs '.join(pilotos)}", color="white")
+
+            marcadores = [Line2D([], [], marker="o", linestyle="none", color=TIRE_COLORS.get(composto, "gray"),
+                                 label=str(composto)) for composto in compostos]
+            ax.legend(handles=ax.get_legend_handles_labels()[0] + marcadores, facecolor="#1a1a1a",
+                      edgecolor="white", labelcolor="white", fontsize="small")
+            self._redesenhar()
+            return True, "Gráfico de evolução plotado com sucesso!"
+        except Exception as e:
+            return False, f"Falha ao plotar a evolução das voltas: {e}"
+
+    @medido("preparar_graficos")
+    def _prepare_telemetry_data(self, data_handler, voltas, wind_speed):
+        """Prepara os dados de todos os tipos de gráfico de uma vez.
+
+        Todos os canais de todas as voltas são alinhados numa grade de distância comum, e para cada tipo em
+        `TIPOS_GRAFICOS` ficam prontos os valores (uma linha por volta; a primeira é a referência), o rótulo
+        do eixo y e os picos. Trocar o tipo do gráfico depois só escolhe uma entrada deste pacote.
+
+        Returns:
+            dict: `alinhadas` (VoltasAlinhadas), `graficos` (tipo -> (ys, ylabel, max_idx, max_val)) e
+            `erros_graficos` (tipo -> mensagem, para os tipos sem dados nesta sessão).
+        """
+        telemetrias = [volta["tel"] for volta in voltas]
+        alinhadas = data_handler.alinhar(telemetrias)
+        graficos = {}
+        erros = {}
+        for tipo_grafico in TIPOS_GRAFICOS:
+            try:
+                graficos[tipo_grafico] = self._dados_tipo(alinhadas, telemetrias, tipo_grafico, wind_speed)
+            except ValueError as e:
+                erros[tipo_grafico] = str(e)
+        return {"alinhadas": alinhadas, "graficos": graficos, "erros_graficos": erros}
+
+    @staticmethod
+    def _dados_tipo(alinhadas, telemetrias, tipo_grafico, wind_speed):
+        """Calcula os valores, o rótulo do eixo y e os picos de um tipo de gráfico."""
+        if tipo_grafico == "DRS" and any("DRS" not in tel for tel in telemetrias):
+            raise ValueError("Dados de DRS não disponíveis para esta sessão.")
+
+        distancia = alinhadas.grade
+        if tipo_grafico in CANAIS_GRAFICO:
+            canal, ylabel = CANAIS_GRAFICO[tipo_grafico]
+            ys = alinhadas.canal(canal)
         elif tipo_grafico == "Delta":
-            y1 = data_handler.calcular_delta(tel1, tel2)
-            y2 = np.zeros_like(y1)
+            # Delta de cada volta em relação à referência (positivo = mais lenta que a referência)
+            tempos = alinhadas.canal("Time")
+            ys = tempos - tempos[0]
             ylabel = "Delta (s)"
-        elif tipo_grafico == "Acelerador":
-            y1 = tel1["Throttle"]
-            y2 = data_handler.interpolar_telemetria(tel1, tel2, "Throttle")
-            ylabel = "Acelerador (%)"
-        elif tipo_grafico == "Freio":
-            y1 = tel1["Brake"]
-            y2 = data_handler.interpolar_telemetria(tel1, tel2, "Brake")
-            ylabel = "Freio (%)"
-        elif tipo_grafico == "Marcha":
-            y1 = tel1["nGear"]
-            y2 = data_handler.interpolar_telemetria(tel1, tel2, "nGear")
-            ylabel = "Marcha"
-        elif tipo_grafico == "RPM":
-            y1 = tel1["RPM"]
-            y2 = data_handler.interpolar_telemetria(tel1, tel2, "RPM")
-            ylabel = "RPM"
-        elif tipo_grafico == "DRS":
-            if "DRS" not in tel1 or "DRS" not in tel2:
-                raise ValueError("Dados de DRS não disponíveis para esta sessão.")
-            y1 = tel1["DRS"]
-            y2 = data_handler.interpolar_telemetria(tel1, tel2, "DRS")
-            ylabel = "DRS (Ativado=1, Desativado=0)"
         elif tipo_grafico == "Velocidade do Vento":
             if wind_speed == "N/A":
                 raise ValueError("Dados de velocidade do vento não disponíveis para esta sessão.")
-            y1 = np.full_like(tel1["Distance"], wind_speed)
-            y2 = np.full_like(tel1["Distance"], wind_speed)
+            ys = np.full((len(telemetrias), len(distancia)), wind_speed, dtype=float)
             ylabel = "Velocidade do Vento (km/h)"
         else:
             raise ValueError("Tipo de gráfico inválido")
 
-        max_idx1 = np.argmax(y1)
-        max_idx2 = np.argmax(y2) if tipo_grafico != "Delta" else np.argmax(np.abs(y2))
-        max_val1 = y1.iloc[max_idx1] if isinstance(y1, pd.Series) else y1[max_idx1]
-        max_val2 = y2[max_idx2]
+        max_idx = np.argmax(np.abs(ys) if tipo_grafico == "Delta" else ys, axis=1)
+        max_val = ys[np.arange(len(ys)), max_idx]
+
+        return ys, ylabel, max_idx, max_val
 
-        return y1, y2, ylabel, max_idx1, max_idx2, max_val1, max_val2
+    @staticmethod
+    def _grafico(dados, tipo_grafico):
+        """Retorna a entrada do pacote de gráficos para o tipo pedido."""
+        if tipo_grafico in dados["erros_graficos"]:
+            raise ValueError(dados["erros_graficos"][tipo_grafico])
+        if tipo_grafico not in dados["graficos"]:
+            raise ValueError("Tipo de gráfico inválido")
+        return dados["graficos"][tipo_grafico]
 
-    def _plot_main_graph(self, ax: Axes, tel1, y1, y2, piloto1, piloto2, compound1, compound2, pos1, pos2, cor1, cor2,
-                         tipo_grafico, temp_track, temp_air, rain, ylabel):
+    @medido("linhas")
+    def _plot_main_graph(self, ax: Axes, distancia, ys, voltas, tipo_grafico, temp_track, temp_air, rain, ylabel):
         """Plota o gráfico principal com os dados de telemetria."""
-        # Adiciona fundo com gradiente
-        gradient = np.linspace(0, 1, 256)
-        gradient = np.vstack((gradient, gradient))
-        cmap = LinearSegmentedColormap.from_list("custom_gradient", ["#2a2a2a", "#1a1a1a"])
-        ax.imshow(gradient, aspect="auto", cmap=cmap, extent=ax.get_xlim() + ax.get_ylim(), alpha=0.5, zorder=-1)
+        # Atualiza os dados (referência em linha cheia, demais tracejadas)
+        lines = []
+        for i, (y, volta) in enumerate(zip(ys, voltas)):
+            line = self._linha_do_pool(self._linhas, ax, i)
+            line.set_data(distancia, y)
+            line.set(label=volta["rotulo"], color=volta["cor"], linestyle="solid" if i == 0 else "dashed",
+                     linewidth=2, visible=True)
+            lines.append(line)
 
-        # Plota os dados
-        line1, = ax.plot(tel1["Distance"], y1, label=f"{piloto1} ({compound1}, P{pos1})", color=cor1, linewidth=2)
-        line2, = ax.plot(tel1["Distance"], y2, label=f"{piloto2} ({compound2}, P{pos2})", color=cor2,
-                         linestyle="dashed", linewidth=2)
+        self._reescalar(ax)
 
         # Configura o título e os eixos
-        ax.set_xlabel("Distância na Volta (m)", color="white")
+        self._set_titulo(ax, voltas, tipo_grafico, temp_track, temp_air, rain, ylabel)
+
+        return lines
+
+    def _reescalar(self, ax: Axes):
+        """Reescala o gráfico pelos dados e estica o fundo até os novos limites."""
+        self._fundo.set_visible(False)
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
+        self._fundo.set_extent(ax.get_xlim() + ax.get_ylim())
+        self._fundo.set_visible(True)
+
+    @staticmethod
+    def _set_titulo(ax: Axes, voltas, tipo_grafico, temp_track, temp_air, rain, ylabel):
+        """Configura o título e o rótulo do eixo y."""
+        pilotos = [volta["piloto"] for volta in voltas]
+        titulo = " vs ".join(pilotos) if len(pilotos) <= 4 else f"{pilotos[0]} vs {len(pilotos) - 1} voltas"
         ax.set_ylabel(ylabel, color="white")
         ax.set_title(
-            f"Comparação de {tipo_grafico}: {piloto1} vs {piloto2}\nTemp. Pista: {temp_track}°C, Temp. Ar: {temp_air}°C, Chuva: {rain}",
+            f"Comparação de {tipo_grafico}: {titulo}\n"
+            f"Temp. Pista: {temp_track}°C, Temp. Ar: {temp_air}°C, Chuva: {rain}",
             color="white")
 
-        return line1, line2
-
-    def _plot_minimap(self, ax_map: Axes, tel1, data_handler):
-        """Plota o mini-mapa com setores e zonas de DRS."""
-        x = tel1["X"]
-        y = tel1["Y"]
-        ax_map.plot(x, y, color="white", linewidth=2, alpha=0.3)
-
-        # Destaca setores
-        circuit_info = data_handler.session.get_circuit_info()
-        sector_distances = []
-        if hasattr(circuit_info, "corners"):
-            for corner in circuit_info.corners:
-                if "distance" in corner:
-                    sector_distances.append(corner["distance"])
-            sector_colors = ["#FF5555", "#55FF55", "#5555FF"]
-            start_dist = 0
-            for i, end_dist in enumerate(sector_distances + [tel1["Distance"].iloc[-1]]):
-                mask = (tel1["Distance"] >= start_dist) & (tel1["Distance"] <= end_dist)
-                ax_map.plot(tel1["X"][mask], tel1["Y"][mask], color=sector_colors[i % len(sector_colors)], linewidth=2)
-                start_dist = end_dist
-
-        # Destaca zonas de DRS
-        if "DRS" in tel1:
-            drs_zones = tel1["DRS"] > 0
-            if drs_zones.any():
-                ax_map.plot(tel1["X"][drs_zones], tel1["Y"][drs_zones], color="#00FF00", linewidth=3, alpha=0.7,
-                            label="DRS Zone")
-
-        ax_map.set_aspect("equal")
-        ax_map.axis("off")
-        ax_map.set_facecolor("#1a1a1a")
-        return sector_distances
-
-    def _add_interactivity(self, line1, line2, tel1, ax_map: Axes, fig):
-        """Adiciona interatividade ao gráfico com tooltips e marcador dinâmico no mini-mapa."""
-        cursor = mplcursors.cursor([line1, line2], hover=True)
-        marker, = ax_map.plot([], [], "o", color="yellow", markersize=8)
-
-        @cursor.connect("add")
-        def on_add(sel):
-            x_dist, y_val = sel.target
-            sel.annotation.set_text(f"Distância: {x_dist:.1f}m\nValor: {y_val:.2f}")
-            idx = np.argmin(np.abs(tel1["Distance"] - x_dist))
-            marker.set_data([tel1["X"].iloc[idx]], [tel1["Y"].iloc[idx]])
-            fig.canvas.draw_idle()
-
-    def _add_annotations(self, ax: Axes, tel1, y1, max_idx1, max_val1, cor1, max_idx2, max_val2, cor2,
-                         sector_distances):
+    @medido("mini-mapa")
+    def _plot_minimap(self, ax_map: Axes, mapa):
+        """Plota o mini-mapa com setores e zonas de DRS (ou com as cores próprias do mapa, como na dominância).
+
+        Todo o traçado é uma única LineCollection com cor e largura por segmento, atualizada só quando o
+        mapa muda (o mapa da sessão é montado uma vez pelo data handler).
+        """
+        if mapa is not self._mapa_atual:
+            if mapa.cores is None:
+                cores = _CORES_MAPA[mapa.setor]
+                cores[mapa.drs] = _COR_DRS
+            else:
+                cores = mapa.cores
+            self._tracado.set_segments(mapa.segmentos)
+            self._tracado.set_color(cores)
+            self._tracado.set_linewidth(np.where(mapa.drs, 3, 2))
+
+            xmin, xmax, ymin, ymax = mapa.limites
+            margem = 0.05 * max(xmax - xmin, ymax - ymin, 1)
+            ax_map.set_xlim(xmin - margem, xmax + margem)
+            ax_map.set_ylim(ymin - margem, ymax + margem)
+            self._mapa_atual = mapa
+        return mapa.setores
+
+    def _legenda_mapa(self, ax_map: Axes, legenda):
+        """Legenda do mini-mapa colorido por dominância (removida no próximo gráfico)."""
+        handles = [Line2D([], [], color=cor, linewidth=3, label=rotulo) for rotulo, cor in legenda]
+        artista = ax_map.legend(handles=handles, loc="upper center", bbox_to_anchor=(0.5, 0.0), ncol=2,
+                                fontsize="x-small", facecolor="#1a1a1a", edgecolor="white", labelcolor="white",
+                                title="Mini-setores", title_fontsize="x-small")
+        artista.get_title().set_color("white")
+        self._artistas_volateis.append(artista)
+
+    def _add_interactivity(self, alinhadas, ys, voltas):
+        """Prepara o hover do gráfico: tooltip no gráfico principal e marcador dinâmico no mini-mapa.
+
+        Os arrays usados a cada movimento do mouse ficam prontos aqui (grade ordenada para `searchsorted`,
+        valores do tipo atual e posição da referência no mapa).
+        """
+        self._hover = (alinhadas.grade, ys, np.ascontiguousarray(alinhadas.canal("X")[0]),
+                       np.ascontiguousarray(alinhadas.canal("Y")[0]), [volta["piloto"] for volta in voltas])
+
+    def _ao_desenhar(self, event):
+        """Guarda o fundo para o blitting após cada desenho completo e repõe os artistas do hover."""
+        self._fundo_blit = self.canvas.copy_from_bbox(self.current_fig.bbox)
+        self._desenhar_hover()
+        self._desenhar_replay()
+
+    def _desenhar_hover(self):
+        """Desenha o tooltip e o marcador no buffer do canvas, se o hover estiver ativo."""
+        if self._tooltip.get_visible():
+            self.current_ax.draw_artist(self._tooltip)
+            self.ax_map.draw_artist(self._marcador)
+
+    def _blit_hover(self):
+        """Redesenha só os artistas animados (hover e replay) sobre o fundo guardado."""
+        if self._fundo_blit is None:
+            return
+        self.canvas.restore_region(self._fundo_blit)
+        self._desenhar_hover()
+        self._desenhar_replay()
+        self.canvas.blit(self.current_fig.bbox)
+
+    def _ao_mover(self, event):
+        """Atualiza o hover na posição do mouse: busca binária na grade e volta mais próxima no eixo y."""
+        if self._hover is None or self._replay is not None:
+            return
+        if event.inaxes is not self.current_ax or event.xdata is None:
+            return
+        grade, ys, x_mapa, y_mapa, pilotos = self._hover
+        i = int(np.clip(np.searchsorted(grade, event.xdata), 1, len(grade) - 1))
+        if event.xdata - grade[i - 1] < grade[i] - event.xdata:
+            i -= 1
+        valores = ys[:, i]
+        if np.isnan(valores).all():
+            return
+        volta = int(np.nanargmin(np.abs(valores - event.ydata)))
+
+        self._tooltip.xy = (grade[i], valores[volta])
+        # Na metade direita o tooltip abre para a esquerda, para não sair da figura
+        direita = grade[i] > (grade[0] + grade[-1]) / 2
+        self._tooltip.set_position((-12, 12) if direita else (12, 12))
+        self._tooltip.set_horizontalalignment("right" if direita else "left")
+        self._tooltip.set_text(f"{pilotos[volta]}\nDistância: {grade[i]:.1f}m\nValor: {valores[volta]:.2f}")
+        self._tooltip.set_visible(True)
+        self._marcador.set_data([x_mapa[i]], [y_mapa[i]])
+        self._blit_hover()
+
+    def _ao_sair(self, event):
+        """Esconde o hover quando o mouse sai do gráfico principal."""
+        if event.inaxes is self.current_ax and self._tooltip.get_visible():
+            self._tooltip.set_visible(False)
+            self._marcador.set_data([], [])
+            self._blit_hover()
+
+    @medido("anotacoes")
+    def _add_annotations(self, ax: Axes, distancia, voltas, max_idx, max_val, sector_distances):
         """Adiciona anotações ao gráfico, como picos e setores."""
-        # Adiciona anotações nos picos
-        ax.annotate(f"{max_val1:.1f}", (tel1["Distance"].iloc[max_idx1], max_val1), textcoords="offset points",
-                    xytext=(0, 10), ha="center", color=cor1)
-        ax.plot(tel1["Distance"].iloc[max_idx1], max_val1, "o", color=cor1)
-        ax.annotate(f"{max_val2:.1f}", (tel1["Distance"].iloc[max_idx2], max_val2), textcoords="offset points",
-                    xytext=(0, -15), ha="center", color=cor2)
-        ax.plot(tel1["Distance"].iloc[max_idx2], max_val2, "o", color=cor2)
+        self._anotar_picos(ax, distancia, voltas, max_idx, max_val)
 
         # Adiciona linhas verticais para os setores
         if sector_distances:
             for dist in sector_distances:
-                ax.axvline(x=dist, color="gray", linestyle="--", alpha=0.5,
-                           label="Setor" if dist == sector_distances[0] else "")
-
-    def _apply_visual_style(self, ax: Axes, compound1, compound2):
+                linha = ax.axvline(x=dist, color="gray", linestyle="--", alpha=0.5,
+                                   label="Setor" if dist == sector_distances[0] else "")
+                self._artistas_volateis.append(linha)
+
+    def _anotar_picos(self, ax: Axes, distancia, voltas, max_idx, max_val):
+        """Anota o pico da referência e o maior pico entre as demais voltas, removendo os anteriores."""
+        for artista in self._picos:
+            artista.remove()
+        self._picos = []
+        destaques = [(0, 10)]
+        if len(voltas) > 1:
+            destaques.append((1 + int(np.argmax(max_val[1:])), -15))
+        for i, deslocamento in destaques:
+            cor = voltas[i]["cor"]
+            anotacao = ax.annotate(f"{max_val[i]:.1f}", (distancia[max_idx[i]], max_val[i]),
+                                   textcoords="offset points", xytext=(0, deslocamento), ha="center", color=cor)
+            pico, = ax.plot(distancia[max_idx[i]], max_val[i], "o", color=cor)
+            self._picos += [anotacao, pico]
+
+    @medido("legenda")
+    def _apply_visual_style(self, ax: Axes, compounds):
         """Aplica o estilo visual ao gráfico, incluindo cores e legenda."""
-        legend = ax.legend(facecolor="#1a1a1a", edgecolor="white", labelcolor="white")
-        for text, compound in zip(legend.get_texts(), [compound1, compound2]):
+        legend = ax.legend(facecolor="#1a1a1a", edgecolor="white", labelcolor="white",
+                           ncol=2 if len(compounds) > 6 else 1, fontsize="small" if len(compounds) > 6 else None)
+        for text, compound in zip(legend.get_texts(), compounds):
             if compound in TIRE_COLORS:
                 text.set_color(TIRE_COLORS[compound])
-        ax.set_facecolor("none")
-        ax.tick_params(colors="white")
-        ax.grid(True, color="gray", linestyle="--", alpha=0.3)
 
-    def plot_comparacao(self, data_handler, piloto1, piloto2, volta1_str, volta2_str, tipo_grafico):
-        """Plota a comparação de telemetria entre dois pilotos."""
+    @medido("plot_comparacao")
+    def plot_comparacao(self, data_handler, selecao, tipo_grafico, dados=None):
+        """Plota a comparação de telemetria entre as voltas selecionadas.
+
+        Args:
+            selecao (list): Pares (piloto, volta) ou trincas (piloto, volta, session_key); a primeira volta é a
+                referência.
+            dados (dict, opcional): Resultado de `load_telemetry_data` já calculado fora da thread do Tk.
+        """
         try:
             # Carrega os dados
-            tel1, tel2, lap1, lap2, team1, team2, pos1, pos2, cor1, cor2, compound1, compound2, temp_track, temp_air, rain, wind_speed = self._load_telemetry_data(
-                data_handler, piloto1, piloto2, volta1_str, volta2_str
-            )
-
-            # Prepara os dados de telemetria
-            y1, y2, ylabel, max_idx1, max_idx2, max_val1, max_val2 = self._prepare_telemetry_data(
-                data_handler, tel1, tel2, tipo_grafico, wind_speed
-            )
-
-            # Configura o layout
+            if dados is None:
+                dados = self.load_telemetry_data(data_handler, selecao)
+            voltas = dados["voltas"]
+            clima = dados["clima"]
+
+            # Prepara os dados de telemetria (já vem pronto de `load_telemetry_data`)
+            if "graficos" not in dados:
+                dados.update(self._prepare_telemetry_data(data_handler, voltas, clima["wind_speed"]))
+            alinhadas = dados["alinhadas"]
+            ys, ylabel, max_idx, max_val = self._grafico(dados, tipo_grafico)
+
+            # Configura o layout (reaproveita a figura do gráfico anterior)
             ax, ax_map = self._setup_layout()
 
             # Plota o gráfico principal
-            line1, line2 = self._plot_main_graph(
-                ax, tel1, y1, y2, piloto1, piloto2, compound1, compound2, pos1, pos2, cor1, cor2, tipo_grafico,
-                temp_track, temp_air, rain, ylabel
+            lines = self._plot_main_graph(
+                ax, alinhadas.grade, ys, voltas, tipo_grafico, clima["temp_track"], clima["temp_air"], clima["rain"],
+                ylabel
             )
 
             # Plota o mini-mapa
-            sector_distances = self._plot_minimap(ax_map, tel1, data_handler)
+            if dados.get("mapa") is None:
+                dados["mapa"] = montar_mapa_circuito(voltas[0]["tel"], voltas[0]["lap"])
+            sector_distances = self._plot_minimap(ax_map, dados["mapa"])
+            if dados.get("legenda_mapa"):
+                self._legenda_mapa(ax_map, dados["legenda_mapa"])
 
             # Adiciona interatividade
-            self._add_interactivity(line1, line2, tel1, ax_map, self.current_fig)
+            self._add_interactivity(alinhadas, ys, voltas)
 
             # Adiciona anotações
-            self._add_annotations(ax, tel1, y1, max_idx1, max_val1, cor1, max_idx2, max_val2, cor2, sector_distances)
+            self._add_annotations(ax, alinhadas.grade, voltas, max_idx, max_val, sector_distances)
 
             # Aplica o estilo visual
-            self._apply_visual_style(ax, compound1, compound2)
+            self._apply_visual_style(ax, [volta["composto"] for volta in voltas])
 
             # Finaliza o gráfico
-            plt.tight_layout()
-            self.canvas = FigureCanvasTkAgg(self.current_fig, master=self.graph_frame)
-            self.canvas.draw()
-            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+            self._dados = dados
+            self._linhas_atuais = lines
+            self._tipo_atual = tipo_grafico
+            self._atualizar_lod()
+            self._redesenhar()
 
             return True, "Gráfico plotado com sucesso!"
         except Exception as e:
             return False, f"Falha ao plotar gráfico: {e}"
 
+    @property
+    def tem_grafico(self):
+        """Indica se há um gráfico plotado que pode trocar de tipo."""
+        return self._dados is not None
+
+    @medido("trocar_tipo")
+    def trocar_tipo(self, tipo_grafico):
+        """Troca o tipo do gráfico atual usando o pacote já calculado.
+
+        Só os valores y das linhas, os rótulos e as anotações de pico mudam; telemetria, alinhamento,
+        mini-mapa e setores são mantidos.
+        """
+        if self._dados is None:
+            return False, "Nenhum gráfico para atualizar."
+        try:
+            ys, ylabel, max_idx, max_val = self._grafico(self._dados, tipo_grafico)
+            ax = self.current_ax
+            clima = self._dados["clima"]
+            voltas = self._dados["voltas"]
+            self._tipo_atual = tipo_grafico
+            grade = self._dados["alinhadas"].grade
+            for line, y in zip(self._linhas_atuais, ys):
+                line.set_data(grade, y)
+            self._add_interactivity(self._dados["alinhadas"], ys, voltas)
+            if self._replay is not None:
+                self._replay.com_valores(grade, ys)
+                self._posicionar_replay(self._tempo_replay())
+            # Picos antes da reescala, para os marcadores do tipo anterior não entrarem nos limites
+            self._anotar_picos(ax, self._dados["alinhadas"].grade, voltas, max_idx, max_val)
+            self._reescalar(ax)
+            self._set_titulo(ax, voltas, tipo_grafico, clima["temp_track"], clima["temp_air"], clima["rain"], ylabel)
+            self._redesenhar()
+            return True, "Gráfico atualizado."
+        except Exception as e:
+            return False, f"Falha ao trocar o tipo do gráfico: {e}"
+
+    @property
+    def replay_ativo(self):
+        """Indica se o replay está rodando."""
+        return self._replay is not None and self._timer_replay is not None and self._inicio_replay[0] > 0
+
+    def iniciar_replay(self, velocidade=1.0, ao_parar=None):
+        """Anima as voltas do gráfico atual no mini-mapa, com o cursor do gráfico principal acompanhando.
+
+        As posições de todas as voltas são pré-calculadas numa base de tempo comum (`TrajetoriasReplay`), e
+        cada quadro só restaura o fundo guardado e redesenha os marcadores e o cursor (blitting), sem
+        redesenhar a figura.
+
+        Args:
+            velocidade (float): Segundos de volta por segundo de relógio.
+            ao_parar (callable, opcional): Chamado sem argumentos quando o replay termina ou é parado.
+        """
+        if self._dados is None:
+            return False, "Nenhum gráfico para reproduzir."
+        try:
+            self.parar_replay(redesenhar=False)
+            voltas = self._dados["voltas"]
+            alinhadas = self._dados["alinhadas"]
+            ys = self._grafico(self._dados, self._tipo_atual)[0]
+            with rastreador.trecho("replay.trajetorias"):
+                self._replay = TrajetoriasReplay([volta["tel"] for volta in voltas], alinhadas.grade, ys)
+            cores = [volta["cor"] for volta in voltas]
+            self._carros.set_facecolors(cores)
+            self._carros_grafico.set_facecolors(cores)
+            self._velocidade_replay = velocidade
+            self._ao_parar_replay = ao_parar
+            self._tooltip.set_visible(False)
+            self._marcador.set_data([], [])
+            for artista in self._artistas_replay():
+                artista.set_visible(True)
+
+            self._inicio_replay = (time.perf_counter(), 0.0)
+            if self._timer_replay is None:
+                self._timer_replay = self.canvas.new_timer(interval=int(1000 / REPLAY_FPS))
+                self._timer_replay.add_callback(self._avancar_replay)
+            self._timer_replay.start()
+            self.mostrar_quadro_replay(0.0)
+            return True, "Replay iniciado."
+        except Exception as e:
+            self._replay = None
+            return False, f"Falha ao iniciar o replay: {e}"
+
+    def definir_velocidade_replay(self, velocidade):
+        """Muda a velocidade do replay a partir do tempo de volta atual."""
+        if self.replay_ativo:
+            self._inicio_replay = (time.perf_counter(), self._tempo_replay())
+        self._velocidade_replay = velocidade
+
+    def parar_replay(self, redesenhar=True):
+        """Para o replay e esconde os marcadores."""
+        if self._replay is None:
+            return
+        if self._timer_replay is not None:
+            self._timer_replay.stop()
+        self._replay = None
+        self._inicio_replay = (0.0, 0.0)
+        for artista in self._artistas_replay():
+            artista.set_visible(False)
+        if redesenhar:
+            self._blit_hover()
+        ao_parar, self._ao_parar_replay = self._ao_parar_replay, None
+        if ao_parar is not None:
+            ao_parar()
+
+    def _artistas_replay(self):
+        return [self._carros, self._carros_grafico, self._cursor_replay, self._relogio_replay]
+
+    def _tempo_replay(self):
+        """Tempo de volta (s) em que o replay está agora."""
+        relogio, tempo = self._inicio_replay
+        if relogio <= 0:
+            return tempo
+        return tempo + (time.perf_counter() - relogio) * self._velocidade_replay
+
+    def _avancar_replay(self):
+        """Desenha o quadro do tempo atual (callback do timer); no fim da volta mais lenta o replay para."""
+        if self._replay is None:
+            return
+        tempo = self._tempo_replay()
+        self.mostrar_quadro_replay(tempo)
+        if tempo >= self._replay.duracao:
+            self._timer_replay.stop()
+            self._inicio_replay = (0.0, self._replay.duracao)
+            ao_parar, self._ao_parar_replay = self._ao_parar_replay, None
+            if ao_parar is not None:
+                ao_parar()
+
+    def mostrar_quadro_replay(self, tempo):
+        """Posiciona os marcadores no tempo de volta pedido (s) e redesenha só eles por blitting."""
+        if self._replay is None:
+            return
+        self._posicionar_replay(tempo)
+        self._blit_hover()
+
+    def _posicionar_replay(self, tempo):
+        replay = self._replay
+        quadro = replay.quadro(tempo)
+        self._carros.set_offsets(np.column_stack((replay.x_mapa[:, quadro], replay.y_mapa[:, quadro])))
+        self._carros_grafico.set_offsets(np.column_stack((replay.distancia[:, quadro], replay.valor[:, quadro])))
+        self._cursor_replay.set_xdata([replay.distancia[0, quadro]] * 2)
+        self._relogio_replay.set_text(f"{replay.tempos[quadro]:.1f}s ({self._velocidade_replay:g}x)")
+
+    def _desenhar_replay(self):
+        """Desenha os marcadores e o cursor do replay no buffer do canvas, se houver replay."""
+        if self._replay is not None:
+            self.ax_map.draw_artist(self._carros)
+            for artista in self._artistas_replay()[1:]:
+                self.current_ax.draw_artist(artista)
+
+    def _redesenhar(self):
+        """Agenda o redesenho na janela; sem janela a figura só é desenhada ao salvar.
+
+        Com o rastreamento ligado o desenho é feito na hora, para o tempo dele entrar na operação.
+        """
+        if self.graph_frame is None:
+            return
+        if rastreador.ativo:
+            with rastreador.trecho("canvas.draw"):
+                self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
+
+    def _piramide(self, tipo_grafico):
+        """Retorna a pirâmide min/max do tipo de gráfico, montada na primeira vez que ele é desenhado."""
+        piramides = self._dados.setdefault("piramides", {})
+        if tipo_grafico not in piramides:
+            piramides[tipo_grafico] = PiramideMinMax(self._grafico(self._dados, tipo_grafico)[0])
+        return piramides[tipo_grafico]
+
+    @medido("lod")
+    def _atualizar_lod(self, ax=None, dpi=None):
+        """Desenha em cada linha só cerca de 2 pontos por pixel do intervalo visível (min/max por bloco).
+
+        Sem dados além da resolução da tela, as linhas recebem todas as amostras do intervalo. Com `dpi`, os
+        pixels são os da imagem exportada nessa resolução, e não os da tela.
+        """
+        if self._dados is None or self._tipo_atual is None:
+            return
+        ax = self.current_ax
+        grade = self._dados["alinhadas"].grade
+        piramide = self._piramide(self._tipo_atual)
+        x0, x1 = sorted(ax.get_xlim())
+        # Uma amostra de cada lado para as linhas chegarem até as bordas
+        inicio = max(int(np.searchsorted(grade, x0)) - 1, 0)
+        fim = min(int(np.searchsorted(grade, x1)) + 1, len(grade))
+        largura = ax.bbox.width * (dpi / self.current_fig.dpi if isinstance(dpi, (int, float)) else 1)
+        indices = piramide.decimar(inicio, fim, max(int(2 * largura), 2))
+        for i, line in enumerate(self._linhas_atuais):
+            if indices is None:
+                line.set_data(grade[inicio:fim], piramide.ys[i, inicio:fim])
+            else:
+                line.set_data(grade[indices[i]], piramide.ys[i, indices[i]])
+
     def zoom_in(self):
         """Aplica zoom in no gráfico."""
         if self.current_ax:
@@ -273,10 +880,23 @@ class F1Plotter:
 
     def exportar_grafico(self):
         """Exporta o gráfico como PNG."""
+        from tkinter import filedialog
+
         if self.current_fig:
             file_path = filedialog.asksaveasfilename(defaultextension=".png",
                                                      filetypes=[("PNG files", "*.png"), ("All files", "*.*")])
             if file_path:
-                self.current_fig.savefig(file_path, dpi=300, bbox_inches="tight")
+                self.salvar_grafico(file_path, dpi=300, bbox_inches="tight")
                 return True, f"Gráfico exportado como {file_path}"
         return False, "Nenhum gráfico para exportar."
+
+    @medido("savefig")
+    def salvar_grafico(self, caminho, dpi=300, **kwargs):
+        """Salva o gráfico atual em arquivo (o formato vem da extensão)."""
+        # A decimação da tela perderia picos na resolução da imagem: as linhas são decimadas para o dpi
+        # de destino durante o savefig e voltam à resolução da tela depois
+        self._atualizar_lod(dpi=dpi)
+        try:
+            self.current_fig.savefig(caminho, dpi=dpi, facecolor=self.current_fig.get_facecolor(), **kwargs)
+        finally:
+            self._atualizar_lod()
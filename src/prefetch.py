@@ -0,0 +1,79 @@
+from config import PRE_CARGA_MAX_PENDENTES
+from worker import PRIORIDADE_SEGUNDO_PLANO
+
+
+class PreCarregador:
+    """Pre-carga em segundo plano da telemetria das voltas que provavelmente serao comparadas.
+
+    Quando as voltas de um piloto aparecem no dropdown, as candidatas (`F1DataHandler.voltas_provaveis`)
+    entram no worker de dados com `PRIORIDADE_SEGUNDO_PLANO`, uma tarefa por volta: qualquer pedido do
+    usuario passa na frente e espera no maximo a volta que ja esta em andamento. Cada grupo (um por
+    dropdown de piloto) tem suas tarefas, canceladas quando o grupo e agendado de novo. O numero de voltas
+    na fila e limitado por `max_pendentes`, e o handler recusa carregar pilotos novos com a memoria das
+    sessoes no limite.
+
+    Args:
+        worker (F1Worker): Worker de dados da interface.
+        data_handler (F1DataHandler): Handler cujo memo e armazem sao aquecidos.
+        max_pendentes (int): Voltas pre-carregadas na fila ao mesmo tempo, somando todos os grupos.
+    """
+
+    def __init__(self, worker, data_handler, max_pendentes=PRE_CARGA_MAX_PENDENTES):
+        self.worker = worker
+        self.data_handler = data_handler
+        self.max_pendentes = max_pendentes
+        self._tarefas = {}  # grupo -> tarefas ainda nao concluidas
+
+    @property
+    def pendentes(self):
+        """Numero de tarefas de pre-carga ainda nao concluidas nem canceladas."""
+        for tarefas in self._tarefas.values():
+            # Tarefas canceladas fora daqui (ex.: `F1Worker.cancelar_tudo`) nunca chamam os callbacks
+            tarefas[:] = [tarefa for tarefa in tarefas if not tarefa.cancelado.is_set()]
+        return sum(len(tarefas) for tarefas in self._tarefas.values())
+
+    def agendar(self, grupo, piloto, selecionada=None, outra=None):
+        """Substitui a pre-carga do grupo pelas voltas provaveis do piloto.
+
+        Args:
+            grupo (str): Identifica quem pediu (ex.: o dropdown do piloto 1).
+            piloto (str): Abreviatura do piloto.
+            selecionada (str, opcional): Volta selecionada para o piloto.
+            outra (tuple, opcional): (piloto, volta) selecionados no outro dropdown.
+        """
+        self.cancelar(grupo)
+        self._submeter(grupo, self.data_handler.voltas_provaveis, piloto, selecionada, outra,
+                       ao_concluir=lambda resultado: self._enfileirar(grupo, piloto, *resultado))
+
+    def _enfileirar(self, grupo, piloto, session_key, numeros):
+        """Agenda uma tarefa por volta, ate o limite de pendentes."""
+        for numero in numeros:
+            if self.pendentes >= self.max_pendentes:
+                break
+            self._submeter(grupo, self.data_handler.pre_carregar_volta, session_key, piloto, numero)
+
+    def _submeter(self, grupo, funcao, *args, ao_concluir=None):
+        tarefas = self._tarefas.setdefault(grupo, [])
+
+        def concluir(resultado):
+            self._descartar(grupo, tarefa)
+            if ao_concluir is not None:
+                ao_concluir(resultado)
+
+        # Erros da pre-carga nao interessam ao usuario: a volta e carregada de novo quando for comparada
+        tarefa = self.worker.executar(funcao, *args, ao_concluir=concluir,
+                                      ao_erro=lambda _: self._descartar(grupo, tarefa),
+                                      prioridade=PRIORIDADE_SEGUNDO_PLANO)
+        tarefas.append(tarefa)
+
+    def _descartar(self, grupo, tarefa):
+        tarefas = self._tarefas.get(grupo, [])
+        if tarefa in tarefas:
+            tarefas.remove(tarefa)
+
+    def cancelar(self, grupo=None):
+        """Cancela a pre-carga de um grupo (ou de todos). A volta em andamento termina, mas e descartada."""
+        grupos = [grupo] if grupo is not None else list(self._tarefas)
+        for nome in grupos:
+            for tarefa in self._tarefas.pop(nome, []):
+                tarefa.cancelar()
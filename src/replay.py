@@ -0,0 +1,47 @@
+import numpy as np
+
+from config import REPLAY_FPS
+
+
+class TrajetoriasReplay:
+    """Posicao de cada volta numa base de tempo comum, pre-calculada para o replay.
+
+    Cada volta e reamostrada uma unica vez em quadros de `1 / fps` segundos de volta: X e Y no mini-mapa e
+    distancia e valor no grafico principal. Desenhar um quadro e so indexar esses arrays; uma volta que ja
+    terminou fica parada na linha de chegada.
+
+    Attributes:
+        tempos (numpy.ndarray): Tempo de volta (s) de cada quadro (n_quadros,).
+        x_mapa, y_mapa (numpy.ndarray): Posicao de cada volta no mini-mapa (n_voltas, n_quadros).
+        distancia (numpy.ndarray): Distancia percorrida por cada volta (n_voltas, n_quadros).
+        valor (numpy.ndarray): Valor do tipo de grafico atual na posicao de cada volta (n_voltas, n_quadros).
+    """
+
+    def __init__(self, telemetrias, grade, ys, fps=REPLAY_FPS):
+        self.fps = fps
+        duracao = max(float(tel["Time"][-1]) for tel in telemetrias)
+        self.tempos = np.arange(0.0, duracao + 1.0 / fps, 1.0 / fps)
+        forma = (len(telemetrias), len(self.tempos))
+        self.x_mapa = np.empty(forma)
+        self.y_mapa = np.empty(forma)
+        self.distancia = np.empty(forma)
+        for i, tel in enumerate(telemetrias):
+            tempo = np.asarray(tel["Time"], dtype=float)
+            self.x_mapa[i] = np.interp(self.tempos, tempo, np.asarray(tel["X"], dtype=float))
+            self.y_mapa[i] = np.interp(self.tempos, tempo, np.asarray(tel["Y"], dtype=float))
+            self.distancia[i] = np.interp(self.tempos, tempo, np.asarray(tel["Distance"], dtype=float))
+        self.valor = None
+        self.com_valores(grade, ys)
+
+    def com_valores(self, grade, ys):
+        """Recalcula o valor de cada volta no grafico principal (ex.: apos trocar o tipo do grafico)."""
+        self.valor = np.vstack([np.interp(distancia, grade, y) for distancia, y in zip(self.distancia, ys)])
+
+    @property
+    def duracao(self):
+        """Tempo de volta (s) do ultimo quadro."""
+        return float(self.tempos[-1])
+
+    def quadro(self, tempo):
+        """Indice do quadro de um tempo de volta (s), limitado ao primeiro e ao ultimo."""
+        return int(np.clip(round(tempo * self.fps), 0, len(self.tempos) - 1))
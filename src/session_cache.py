@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def medir_sessao(session):
+    """Estima a memoria ocupada por uma sessao somando o tamanho real dos seus DataFrames (em bytes)."""
+    frames = []
+    for atributo in ("laps", "results", "weather_data"):
+        try:
+            frames.append(getattr(session, atributo))
+        except Exception:
+            # O fastf1 levanta DataNotLoadedError para dados que nao foram carregados
+            continue
+    for atributo in ("car_data", "pos_data"):
+        try:
+            frames.extend(getattr(session, atributo).values())
+        except Exception:
+            continue
+    return int(sum(df.memory_usage(index=True, deep=True).sum() for df in frames if isinstance(df, pd.DataFrame)))
+
+
+class CacheSessoes:
+    """Cache LRU de sessoes carregadas, limitado pela memoria ocupada pelos DataFrames.
+
+    Args:
+        limite_bytes (int): Orcamento de memoria. A sessao mais recente nunca e removida, mesmo que sozinha
+            ultrapasse o limite.
+        ao_remover (callable, opcional): Chamado com a chave de cada sessao removida do cache.
+    """
+
+    def __init__(self, limite_bytes, ao_remover=None):
+        self.limite_bytes = limite_bytes
+        self.ao_remover = ao_remover
+        self._sessoes = OrderedDict()  # chave -> (session, bytes)
+        self.total_bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def __contains__(self, chave):
+        return chave in self._sessoes
+
+    def __len__(self):
+        return len(self._sessoes)
+
+    def chaves(self):
+        """Chaves das sessoes em memoria, da usada ha mais tempo para a mais recente."""
+        return list(self._sessoes)
+
+    def obter(self, chave):
+        """Retorna a sessao da chave (ano, gp, sessao) ou None, atualizando a ordem de uso."""
+        item = self._sessoes.get(chave)
+        if item is None:
+            self.falhas += 1
+            return None
+        self._sessoes.move_to_end(chave)
+        self.acertos += 1
+        return item[0]
+
+    def adicionar(self, chave, session):
+        """Guarda a sessao e remove as menos usadas recentemente ate caber no orcamento."""
+        if chave in self._sessoes:
+            self._remover(chave, contar=False)
+        tamanho = medir_sessao(session)
+        self._sessoes[chave] = (session, tamanho)
+        self.total_bytes += tamanho
+        while self.total_bytes > self.limite_bytes and len(self._sessoes) > 1:
+            mais_antiga = next(iter(self._sessoes))
+            self._remover(mais_antiga)
+
+    def remedir(self, chave):
+        """Atualiza o tamanho de uma sessao que cresceu (ex.: telemetria carregada depois) e reaplica o limite."""
+        item = self._sessoes.get(chave)
+        if item is None:
+            return
+        session, tamanho = item
+        novo = medir_sessao(session)
+        self._sessoes[chave] = (session, novo)
+        self.total_bytes += novo - tamanho
+        while self.total_bytes > self.limite_bytes and len(self._sessoes) > 1:
+            mais_antiga = next(iter(self._sessoes))
+            if mais_antiga == chave:
+                break
+            self._remover(mais_antiga)
+
+    def remover(self, chave):
+        """Remove uma sessao especifica do cache."""
+        if chave in self._sessoes:
+            self._remover(chave)
+
+    def limpar(self):
+        """Remove todas as sessoes do cache."""
+        for chave in list(self._sessoes):
+            self._remover(chave)
+
+    def _remover(self, chave, contar=True):
+        _, tamanho = self._sessoes.pop(chave)
+        self.total_bytes -= tamanho
+        if contar:
+            self.remocoes += 1
+        if self.ao_remover:
+            self.ao_remover(chave)
+
+    def estatisticas(self):
+        """Retorna os contadores do cache."""
+        return {
+            "sessoes": len(self._sessoes),
+            "bytes": self.total_bytes,
+            "limite_bytes": self.limite_bytes,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+        }
@@ -0,0 +1,170 @@
+import threading
+
+import fastf1
+import numpy as np
+from fastf1 import _api as api
+from fastf1.core import Telemetry
+
+# Versao do fastf1 (a fixada no requirements.txt) cujos internos o carregamento por piloto reproduz
+VERSAO_FASTF1_INTERNOS = "3.5.3"
+
+
+def internos_compativeis():
+    """Indica se o fastf1 instalado e a versao cujos metodos privados o carregamento por piloto usa.
+
+    Em outra versao, `_calculate_t0_date`, `_car_data`/`_pos_data`, `_cast_default_cols` e a `_api` podem ter
+    mudado; o handler volta a usar so o `session.load` publico (telemetria de todos os pilotos de uma vez).
+    """
+    return fastf1.__version__ == VERSAO_FASTF1_INTERNOS
+
+
+def telemetria_volta(lap):
+    """Equivalente ao `Lap.get_telemetry()` do fastf1 sem os canais DriverAhead e DistanceToDriverAhead.
+
+    O fastf1 calcula o piloto a frente com a telemetria de todos os pilotos da sessao. Esses canais nao sao
+    usados nos graficos nem guardados no armazem, entao a volta so precisa da telemetria do proprio piloto
+    (e o calculo fica bem mais barato). As demais amostras e canais sao os mesmos do `get_telemetry`.
+    """
+    pos_data = lap.get_pos_data(pad=1, pad_side="both")
+    car_data = lap.get_car_data(pad=1, pad_side="both").add_distance().add_relative_distance()
+    return pos_data.merge_channels(car_data).slice_by_lap(lap, interpolate_edges=True)
+
+
+class CarregadorTelemetria:
+    """Segunda fase do carregamento da sessao: telemetria (car_data/pos_data) so dos pilotos usados.
+
+    A primeira fase (`F1DataHandler.carregar_dados`) carrega voltas, resultados e clima sem telemetria. Quando
+    um piloto e usado pela primeira vez, os dados brutos da sessao sao lidos pela API do fastf1 (do cache em
+    disco depois do primeiro download) e so os pilotos pedidos viram `Telemetry` em `session.car_data` e
+    `session.pos_data`, do mesmo jeito que o `Session._load_telemetry` faz para todos. O resto dos dados
+    brutos e descartado, entao a memoria da sessao cresce so com os pilotos usados.
+
+    Sessoes sem `api_path` (como as sinteticas dos benchmarks) carregam a telemetria completa na primeira vez,
+    assim como qualquer sessao quando o fastf1 instalado nao e o da versao fixada (`internos_compativeis`).
+
+    Attributes:
+        pilotos (set): Numeros dos pilotos com telemetria carregada.
+        versao (int): Incrementada a cada carga, para quem guarda estado derivado da sessao (como a conta de
+            memoria do cache de sessoes) saber que precisa atualizar.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.pilotos = set()
+        self.versao = 0
+        self._iniciada = False
+        self._trava = threading.Lock()
+
+    def garantir(self, numeros):
+        """Carrega a telemetria dos pilotos (numeros de carro) que ainda nao foram carregados.
+
+        Returns:
+            bool: True se algum piloto foi carregado agora.
+        """
+        with self._trava:
+            pendentes = [numero for numero in dict.fromkeys(numeros) if numero not in self.pilotos]
+            if not pendentes:
+                return False
+            if self._carga_completa():
+                self._carregar_tudo()
+            else:
+                self._materializar(pendentes)
+            self.versao += 1
+            return True
+
+    def canais_carro(self, canais):
+        """Canais do car_data de todos os pilotos como arrays, sem montar `Telemetry` para eles.
+
+        Serve para calculos de uma passada sobre a sessao inteira (ver `lap_aggregates`): os dados brutos sao
+        lidos, convertidos e descartados, entao a memoria da sessao nao cresce.
+
+        Args:
+            canais (iterable): Canais do car_data (ex.: 'Speed', 'Brake').
+
+        Returns:
+            dict: Numero do piloto -> {canal: np.ndarray}, com 'SessionTime' em segundos.
+        """
+        with self._trava:
+            if self._carga_completa():
+                if not self._iniciada:
+                    self._carregar_tudo()
+                    self.versao += 1
+                return {numero: self._arrays(tel, canais, tel["SessionTime"].dt.total_seconds().to_numpy())
+                        for numero, tel in self.session.car_data.items()}
+
+            car_bruto, pos_bruto = self._ler_brutos(posicao=not self._iniciada)
+            if not self._iniciada:
+                self._iniciar(car_bruto, pos_bruto)
+            t0 = np.datetime64(self.session.t0_date, "ns")
+            arrays = {}
+            for numero in self.session.drivers:
+                if numero not in car_bruto:
+                    continue
+                bruto = car_bruto[numero]
+                # Mesmo Time do `Telemetry` montado pelo fastf1: Date arredondado em ms menos o t0_date
+                datas = bruto["Date"].dt.round("ms").to_numpy(dtype="datetime64[ns]")
+                arrays[numero] = self._arrays(bruto, canais, (datas - t0) / np.timedelta64(1, "s"))
+            return arrays
+
+    @staticmethod
+    def _arrays(dados, canais, tempos):
+        arrays = {canal: dados[canal].to_numpy() for canal in canais if canal in dados}
+        arrays["SessionTime"] = tempos
+        return arrays
+
+    def _carga_completa(self):
+        """Indica se a telemetria tem de ser carregada toda de uma vez pelo fastf1, sem a carga por piloto."""
+        return self.session.api_path is None or not internos_compativeis()
+
+    def _carregar_tudo(self):
+        """Carrega a telemetria de todos os pilotos pelo fastf1 (uma vez so)."""
+        if self._iniciada:
+            return
+        if self.session.api_path is None:
+            # Sessoes sinteticas dos benchmarks: so a telemetria, sem gerar as voltas de novo
+            self.session._load_telemetry()
+        else:
+            self.session.load(laps=False, telemetry=True, weather=False, messages=False)
+        self.pilotos.update(self.session.drivers)
+        self._iniciada = True
+
+    def _ler_brutos(self, posicao=True):
+        """Le os dados brutos (car_data e, se pedido, pos_data) de todos os pilotos pela API do fastf1."""
+        leitores = (api.car_data, api.position_data) if posicao else (api.car_data,)
+        brutos = []
+        for leitor in leitores:
+            try:
+                brutos.append(leitor(self.session.api_path))
+            except api.SessionNotAvailableError:
+                brutos.append({})
+        return brutos[0], brutos[1] if posicao else {}
+
+    def _iniciar(self, car_bruto, pos_bruto):
+        """Calcula o t0_date, que depende dos dados de todos os pilotos, e prepara a sessao para as cargas."""
+        session = self.session
+        session._calculate_t0_date(car_bruto, pos_bruto)
+        session._car_data = {}
+        session._pos_data = {}
+        if hasattr(session, "_laps"):
+            session._laps["LapStartDate"] = session._laps["LapStartTime"] + session.t0_date
+        self._iniciada = True
+
+    def _materializar(self, numeros):
+        """Converte os dados brutos dos pilotos pedidos em `Telemetry`, como no `Session._load_telemetry`."""
+        session = self.session
+        car_bruto, pos_bruto = self._ler_brutos()
+        if not self._iniciada:
+            self._iniciar(car_bruto, pos_bruto)
+
+        for bruto, destino in ((car_bruto, session._car_data), (pos_bruto, session._pos_data)):
+            for numero in numeros:
+                if numero not in bruto:
+                    continue
+                # Mesmo tratamento do fastf1: o Time e recalculado pelo Date, que tem resolucao maior
+                tel = Telemetry(bruto[numero].drop(labels="Time", axis=1), session=session, driver=numero,
+                                drop_unknown_channels=True, _cast_default_cols=True)
+                tel["Date"] = tel["Date"].dt.round("ms")
+                tel["Time"] = tel["Date"] - session.t0_date
+                tel["SessionTime"] = tel["Time"]
+                destino[numero] = tel
+        self.pilotos.update(numeros)
@@ -0,0 +1,88 @@
+import os
+import re
+import shutil
+import uuid
+
+import numpy as np
+
+from lap_telemetry import DTYPES_CANAIS, TelemetriaVolta, converter_canal
+
+# Canais guardados por volta e o dtype fixo de cada arquivo de coluna (os mesmos da TelemetriaVolta)
+CANAIS_ARMAZENADOS = DTYPES_CANAIS
+
+_MARCADOR_COMPLETO = "_completo"
+
+
+def _nome_seguro(valor):
+    """Converte um componente da chave em um nome de diretorio valido."""
+    return re.sub(r"[^\w-]+", "_", str(valor)).strip("_") or "_"
+
+
+class ArmazemTelemetria:
+    """Segunda camada de cache com a telemetria ja processada de cada volta.
+
+    Cada volta e gravada como um arquivo .npy por canal, com dtype fixo, em
+    `<diretorio>/<ano>/<gp>/<sessao>/<piloto>/<volta>/`. A leitura usa `numpy.memmap`, entao reabrir uma volta
+    nao refaz o merge/interpolacao do fastf1 e praticamente nao copia dados.
+    """
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+
+    def diretorio_sessao(self, session_key):
+        """Diretorio com todas as voltas gravadas de uma sessao."""
+        ano, gp, sessao = session_key
+        return os.path.join(self.diretorio, _nome_seguro(ano), _nome_seguro(gp), _nome_seguro(sessao))
+
+    def _caminho(self, session_key, piloto, volta):
+        return os.path.join(self.diretorio_sessao(session_key), _nome_seguro(piloto), str(int(volta)))
+
+    def contem(self, session_key, piloto, volta):
+        """Indica se a volta ja esta gravada."""
+        return os.path.exists(os.path.join(self._caminho(session_key, piloto, volta), _MARCADOR_COMPLETO))
+
+    def ler(self, session_key, piloto, volta):
+        """Abre a telemetria gravada da volta, ou retorna None se ela nao estiver no armazem.
+
+        Returns:
+            TelemetriaVolta: Canais apoiados em memmaps somente leitura (copiados so quando o arquivo foi
+            gravado com outro dtype, por versoes antigas do armazem).
+        """
+        caminho = self._caminho(session_key, piloto, volta)
+        if not os.path.exists(os.path.join(caminho, _MARCADOR_COMPLETO)):
+            return None
+
+        colunas = {}
+        for canal in CANAIS_ARMAZENADOS:
+            arquivo = os.path.join(caminho, f"{canal}.npy")
+            if os.path.exists(arquivo):
+                colunas[canal] = np.load(arquivo, mmap_mode="r")
+        return TelemetriaVolta(**colunas)
+
+    def gravar(self, session_key, piloto, volta, tel):
+        """Grava os canais conhecidos da telemetria de uma volta.
+
+        A escrita e feita em um diretorio temporario e movida no final, entao uma gravacao interrompida
+        nunca deixa uma volta pela metade no armazem.
+        """
+        destino = self._caminho(session_key, piloto, volta)
+        temporario = f"{destino}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(temporario)
+        try:
+            for canal in CANAIS_ARMAZENADOS:
+                if canal not in tel:
+                    continue
+                # Mesma conversao da TelemetriaVolta (inclusive o preenchimento de NaN de nGear/DRS/Brake)
+                np.save(os.path.join(temporario, f"{canal}.npy"), converter_canal(canal, tel[canal]))
+            open(os.path.join(temporario, _MARCADOR_COMPLETO), "w").close()
+            if os.path.exists(destino):
+                shutil.rmtree(destino)
+            os.replace(temporario, destino)
+        finally:
+            if os.path.exists(temporario):
+                shutil.rmtree(temporario, ignore_errors=True)
+
+    def limpar(self):
+        """Remove todas as voltas gravadas."""
+        if os.path.exists(self.diretorio):
+            shutil.rmtree(self.diretorio)
@@ -0,0 +1,208 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from config import RASTREAMENTO_MAX_TRECHOS
+
+
+class _TrechoInativo:
+    """Context manager vazio devolvido quando o rastreamento esta desligado."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_INATIVO = _TrechoInativo()
+
+
+class Trecho:
+    """Um trecho medido (span): nome, inicio, duracao, thread e trechos filhos diretos."""
+
+    __slots__ = ("rastreador", "nome", "args", "inicio_ns", "duracao_ns", "thread", "filhos")
+
+    def __init__(self, rastreador, nome, args):
+        self.rastreador = rastreador
+        self.nome = nome
+        self.args = args
+        self.inicio_ns = 0
+        self.duracao_ns = 0
+        self.thread = None
+        self.filhos = []
+
+    def __enter__(self):
+        self.rastreador._pilha().append(self)
+        self.thread = threading.current_thread()
+        self.inicio_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.duracao_ns = time.perf_counter_ns() - self.inicio_ns
+        self.rastreador._encerrar(self)
+        return False
+
+
+class Operacao:
+    """Uma acao do usuario (carregar, comparar, trocar o tipo...) e os trechos de primeiro nivel dela.
+
+    Os trechos podem vir de threads diferentes (worker de dados e thread do Tk); a duracao vai do inicio da
+    operacao ao fim do ultimo trecho.
+    """
+
+    __slots__ = ("nome", "inicio_ns", "fim_ns", "trechos")
+
+    def __init__(self, nome, inicio_ns):
+        self.nome = nome
+        self.inicio_ns = inicio_ns
+        self.fim_ns = inicio_ns
+        self.trechos = []
+
+    @property
+    def duracao_ms(self):
+        return (self.fim_ns - self.inicio_ns) / 1e6
+
+    def etapas(self):
+        """Tempo (ms) por etapa, da mais lenta para a mais rapida.
+
+        Cada trecho de primeiro nivel e detalhado pelos seus filhos diretos (somados por nome); o tempo que
+        sobra fora dos filhos entra com o nome do proprio trecho.
+        """
+        tempos = {}
+        for trecho in self.trechos:
+            proprio = trecho.duracao_ns
+            for filho in trecho.filhos:
+                tempos[filho.nome] = tempos.get(filho.nome, 0) + filho.duracao_ns / 1e6
+                proprio -= filho.duracao_ns
+            tempos[trecho.nome] = tempos.get(trecho.nome, 0) + proprio / 1e6
+        return sorted(tempos.items(), key=lambda item: item[1], reverse=True)
+
+
+class Rastreador:
+    """Coleta trechos de tempo das etapas do data handler e do plotter.
+
+    Desligado, `trecho()` devolve um context manager vazio compartilhado e `medido` so testa uma flag antes
+    de chamar a funcao, entao o custo fica perto de zero. Ligado, cada trecho encerrado vai para um buffer
+    circular (exportavel no formato de trace do Chrome) e para a operacao atual, que alimenta o resumo da
+    barra de status.
+    """
+
+    def __init__(self, max_trechos=RASTREAMENTO_MAX_TRECHOS):
+        self.ativo = False
+        self.trechos = deque(maxlen=max_trechos)
+        self.operacoes = deque(maxlen=100)
+        self._origem_ns = time.perf_counter_ns()
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._operacao = None
+
+    def _pilha(self):
+        """Pilha de trechos abertos da thread atual."""
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def trecho(self, nome, **args):
+        """Context manager que mede o bloco como um trecho `nome` (com `args` no trace)."""
+        if not self.ativo:
+            return _INATIVO
+        return Trecho(self, nome, args)
+
+    def iniciar_operacao(self, nome):
+        """Inicia uma nova operacao; os trechos de primeiro nivel encerrados depois passam a pertencer a ela."""
+        if not self.ativo:
+            return
+        with self._trava:
+            self._operacao = Operacao(nome, time.perf_counter_ns())
+            self.operacoes.append(self._operacao)
+
+    def _encerrar(self, trecho):
+        """Registra um trecho encerrado no pai (se houver), no buffer e na operacao atual."""
+        pilha = self._pilha()
+        pilha.pop()
+        with self._trava:
+            self.trechos.append(trecho)
+            if pilha:
+                pilha[-1].filhos.append(trecho)
+                return
+            if self._operacao is None:
+                # Trecho fora de uma operacao explicita vira uma operacao propria
+                self._operacao = Operacao(trecho.nome, trecho.inicio_ns)
+                self.operacoes.append(self._operacao)
+            self._operacao.trechos.append(trecho)
+            self._operacao.fim_ns = max(self._operacao.fim_ns, trecho.inicio_ns + trecho.duracao_ns)
+
+    def resumo(self):
+        """Texto curto com o tempo da ultima operacao e das suas etapas mais lentas, para a barra de status."""
+        with self._trava:
+            operacao = self._operacao
+            etapas = operacao.etapas()[:6] if operacao is not None else []
+        if not etapas:
+            return "Nenhuma etapa medida."
+        detalhes = " · ".join(f"{nome} {ms:.0f}" for nome, ms in etapas)
+        return f"{operacao.nome}: {operacao.duracao_ms:.0f} ms | {detalhes}"
+
+    def limpar(self):
+        """Descarta os trechos e operacoes coletados."""
+        with self._trava:
+            self.trechos.clear()
+            self.operacoes.clear()
+            self._operacao = None
+
+    def exportar_chrome(self, caminho):
+        """Grava os trechos coletados no formato JSON de trace events do Chrome (chrome://tracing, Perfetto).
+
+        Returns:
+            tuple: (success, message)
+        """
+        try:
+            with self._trava:
+                trechos = list(self.trechos)
+                operacoes = list(self.operacoes)
+            pid = os.getpid()
+            eventos = []
+            threads = {}
+            for trecho in trechos:
+                threads[trecho.thread.ident] = trecho.thread.name
+                eventos.append({
+                    "name": trecho.nome, "cat": "f1", "ph": "X", "pid": pid, "tid": trecho.thread.ident,
+                    "ts": (trecho.inicio_ns - self._origem_ns) / 1000, "dur": trecho.duracao_ns / 1000,
+                    "args": trecho.args,
+                })
+            for operacao in operacoes:
+                eventos.append({"name": operacao.nome, "cat": "operacao", "ph": "i", "s": "g", "pid": pid, "tid": 0,
+                                "ts": (operacao.inicio_ns - self._origem_ns) / 1000})
+            for tid, nome in threads.items():
+                eventos.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nome}})
+
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo, default=str)
+            return True, f"Trace com {len(trechos)} trechos exportado para {caminho}"
+        except Exception as e:
+            return False, f"Falha ao exportar trace: {e}"
+
+
+rastreador = Rastreador()
+
+
+def medido(nome):
+    """Decorador que mede cada chamada da funcao como um trecho `nome` do rastreador global."""
+
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            if not rastreador.ativo:
+                return funcao(*args, **kwargs)
+            with Trecho(rastreador, nome, {}):
+                return funcao(*args, **kwargs)
+
+        return medida
+
+    return decorador
@@ -2,17 +2,62 @@ from tkinter import messagebox
 
 import customtkinter as ctk
 
-from config import SESSOES_DISPONIVEIS, TIPOS_GRAFICOS
+from config import AO_VIVO_INTERVALO_MS, SESSOES_DISPONIVEIS, TIPOS_GRAFICOS, VELOCIDADES_REPLAY
+from tracing import rastreador
+from worker import PRIORIDADE_SEGUNDO_PLANO, F1Worker
 
 
-class F1UI:
-    """Gerenciador da interface grafica"""
+def _criar_dependencias():
+    """Roda no worker: importa os modulos pesados sem GUI (fastf1, pandas, matplotlib Agg) e cria o data handler.
+
+    O backend TkAgg importa o tkinter e fica para a thread principal (`F1UI._dependencias_prontas`).
+    """
+    from data_handler import F1DataHandler
+    from plotter import F1Plotter
+
+    return F1DataHandler(), F1Plotter
+
+
+def _carregar_sessao(data_handler, ano, gp, sessao, **kwargs):
+    """Roda no worker: carrega a sessao e ja le as estatisticas do cache, que o handler so atualiza nessa thread."""
+    return data_handler.carregar_dados(ano, gp, sessao, **kwargs), data_handler.get_estatisticas_cache()
+
 
-    def __init__(self, root, data_handler, plotter):
+class F1UI:
+    """Gerenciador da interface grafica
+
+    Sem `data_handler`/`plotter`, a janela aparece primeiro e os modulos pesados sao importados no worker logo
+    depois; os botoes de dados ficam desabilitados ate eles ficarem prontos.
+    """
+
+    def __init__(self, root, data_handler=None, plotter=None):
+        self.pre_carregador = None
+        self.evolucao_button = None
+        self.dominancia_checkbox = None
+        self._ultima_selecao = None
+        self.ao_vivo_button = None
+        self._ao_vivo_ativo = False
+        self._tarefa_ao_vivo = None
+        self._ocupado = False
+        self.cache_disco_button = None
+        self.painel_cache = None
+        self.exportar_trace_button = None
+        self.medir_checkbox = None
+        self.cancelar_button = None
+        self.status_label = None
+        self.progresso_bar = None
+        self.status_frame = None
         self.export_button = None
+        self.velocidade_replay_dropdown = None
+        self.replay_button = None
         self.zoom_out_button = None
         self.zoom_in_button = None
         self.zoom_frame = None
+        self.selecao_label = None
+        self.limpar_selecao_button = None
+        self.adicionar_button = None
+        self.mais_rapidas_button = None
+        self.voltas_extras = []
         self.graph_frame = None
         self.tipo_dropdown = None
         self.tipo_label = None
@@ -37,7 +82,37 @@ class F1UI:
         self.root = root
         self.data_handler = data_handler
         self.plotter = plotter
+        self._pronto = data_handler is not None and plotter is not None
+        self.worker = F1Worker(root)
         self.setup_ui()
+        if self._pronto:
+            self.plotter.graph_frame = self.graph_frame
+            self._criar_pre_carregador()
+        else:
+            self._set_ocupado(True)
+            self._set_status("Inicializando...", 0)
+            self.root.after_idle(self._iniciar_dependencias)
+
+    def _iniciar_dependencias(self):
+        """Agenda no worker a importacao dos modulos pesados, depois que a janela ja foi desenhada."""
+        self.worker.executar(_criar_dependencias, ao_concluir=self._dependencias_prontas,
+                             ao_erro=self._mostrar_erro)
+
+    def _dependencias_prontas(self, resultado):
+        """Recebe o data handler, cria o plotter e libera os botoes."""
+        import matplotlib.backends.backend_tkagg  # noqa: F401  (aquece o backend usado no primeiro grafico)
+
+        self.data_handler, plotter_cls = resultado
+        self.plotter = plotter_cls(self.graph_frame)
+        self._criar_pre_carregador()
+        self._pronto = True
+        self._set_ocupado(False)
+        self._set_status("Pronto", 0)
+
+    def _criar_pre_carregador(self):
+        from prefetch import PreCarregador
+
+        self.pre_carregador = PreCarregador(self.worker, self.data_handler)
 
     def setup_ui(self):
         """configura padroes inicias da interface"""
@@ -79,39 +154,76 @@ class F1UI:
                                                  corner_radius=8)
         self.limpar_cache_button.grid(row=1, column=2, columnspan=2, pady=10)
 
+        self.cache_disco_button = ctk.CTkButton(self.controls_frame, text="Cache em Disco",
+                                                command=self.abrir_cache_disco, corner_radius=8)
+        self.cache_disco_button.grid(row=0, column=6, padx=5, pady=5)
+
+        # Sessao em andamento a partir do live timing gravado (arquivo ou servidor de replay local)
+        self.ao_vivo_button = ctk.CTkButton(self.controls_frame, text="Ao Vivo", command=self.iniciar_ao_vivo,
+                                            corner_radius=8)
+        self.ao_vivo_button.grid(row=1, column=7, padx=5, pady=10)
+
         self.comparar_button = ctk.CTkButton(self.controls_frame, text="Comparar Voltas", command=self.comparar_voltas,
                                              corner_radius=8)
         self.comparar_button.grid(row=1, column=4, columnspan=2, pady=10)
 
+        self.mais_rapidas_button = ctk.CTkButton(self.controls_frame, text="Mais Rápidas",
+                                                 command=self.comparar_mais_rapidas, corner_radius=8)
+        self.mais_rapidas_button.grid(row=1, column=6, pady=10)
+
+        self.evolucao_button = ctk.CTkButton(self.controls_frame, text="Evolução", command=self.mostrar_evolucao,
+                                             corner_radius=8)
+        self.evolucao_button.grid(row=2, column=6, padx=5, pady=5)
+
+        # Mini-mapa colorido pelo piloto mais rapido em cada mini-setor, entre todos os pilotos da sessao
+        self.dominancia_checkbox = ctk.CTkCheckBox(self.controls_frame, text="Dominância",
+                                                   command=self.alternar_dominancia)
+        self.dominancia_checkbox.grid(row=3, column=6, padx=5, pady=5)
+
         # Dropdowns para pilotos e voltas
         self.piloto1_label = ctk.CTkLabel(self.controls_frame, text="Piloto 1:")
         self.piloto1_label.grid(row=2, column=0, padx=5, pady=5)
-        self.piloto1_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly")
+        self.piloto1_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly",
+                                                 command=lambda _: self._piloto_selecionado(1))
         self.piloto1_dropdown.grid(row=2, column=1, padx=5, pady=5)
-        self.piloto1_dropdown.bind("<<ComboboxSelected>>", self.atualizar_voltas_piloto1)
 
         self.volta1_label = ctk.CTkLabel(self.controls_frame, text="Volta 1:")
         self.volta1_label.grid(row=3, column=0, padx=5, pady=5)
-        self.volta1_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly")
+        self.volta1_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly",
+                                               command=self._volta_selecionada)
         self.volta1_dropdown.grid(row=3, column=1, padx=5, pady=5)
 
         self.piloto2_label = ctk.CTkLabel(self.controls_frame, text="Piloto 2:")
         self.piloto2_label.grid(row=2, column=2, padx=5, pady=5)
-        self.piloto2_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly")
+        self.piloto2_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly",
+                                                 command=lambda _: self._piloto_selecionado(2))
         self.piloto2_dropdown.grid(row=2, column=3, padx=5, pady=5)
-        self.piloto2_dropdown.bind("<<ComboboxSelected>>", self.atualizar_voltas_piloto2)
 
         self.volta2_label = ctk.CTkLabel(self.controls_frame, text="Volta 2:")
         self.volta2_label.grid(row=3, column=2, padx=5, pady=5)
-        self.volta2_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly")
+        self.volta2_dropdown = ctk.CTkComboBox(self.controls_frame, width=120, values=[""], state="readonly",
+                                               command=self._volta_selecionada)
         self.volta2_dropdown.grid(row=3, column=3, padx=5, pady=5)
 
         self.tipo_label = ctk.CTkLabel(self.controls_frame, text="Tipo de Gráfico:")
         self.tipo_label.grid(row=2, column=4, padx=5, pady=5)
-        self.tipo_dropdown = ctk.CTkComboBox(self.controls_frame, width=150, values=TIPOS_GRAFICOS, state="readonly")
+        self.tipo_dropdown = ctk.CTkComboBox(self.controls_frame, width=150, values=TIPOS_GRAFICOS, state="readonly",
+                                             command=self.trocar_tipo)
         self.tipo_dropdown.grid(row=2, column=5, padx=5, pady=5)
         self.tipo_dropdown.set("Velocidade")
 
+        # Voltas extras: a volta do piloto 2 e adicionada a lista, que entra na comparacao depois das duas voltas
+        self.adicionar_button = ctk.CTkButton(self.controls_frame, text="Adicionar Volta", command=self.adicionar_volta,
+                                              corner_radius=8)
+        self.adicionar_button.grid(row=3, column=4, padx=5, pady=5)
+
+        self.limpar_selecao_button = ctk.CTkButton(self.controls_frame, text="Limpar Seleção",
+                                                   command=self.limpar_selecao, corner_radius=8)
+        self.limpar_selecao_button.grid(row=3, column=5, padx=5, pady=5)
+
+        self.selecao_label = ctk.CTkLabel(self.controls_frame, text="Voltas extras: nenhuma")
+        self.selecao_label.grid(row=4, column=0, columnspan=7, padx=5, pady=5, sticky="w")
+
         # Frame para o grafico de comparacao
         self.graph_frame = ctk.CTkFrame(self.root, corner_radius=10)
         self.graph_frame.pack(fill="both", expand=True, padx=20, pady=10)
@@ -120,11 +232,11 @@ class F1UI:
         self.zoom_frame = ctk.CTkFrame(self.root, corner_radius=10)
         self.zoom_frame.pack(pady=5, padx=20, fill="x")
 
-        self.zoom_in_button = ctk.CTkButton(self.zoom_frame, text="Zoom In", command=self.plotter.zoom_in,
+        self.zoom_in_button = ctk.CTkButton(self.zoom_frame, text="Zoom In", command=self.zoom_in,
                                             corner_radius=8)
         self.zoom_in_button.pack(side="left", padx=5)
 
-        self.zoom_out_button = ctk.CTkButton(self.zoom_frame, text="Zoom Out", command=self.plotter.zoom_out,
+        self.zoom_out_button = ctk.CTkButton(self.zoom_frame, text="Zoom Out", command=self.zoom_out,
                                              corner_radius=8)
         self.zoom_out_button.pack(side="left", padx=5)
 
@@ -132,85 +244,518 @@ class F1UI:
                                            corner_radius=8)
         self.export_button.pack(side="left", padx=5)
 
+        self.replay_button = ctk.CTkButton(self.zoom_frame, text="Replay", command=self.alternar_replay,
+                                           corner_radius=8)
+        self.replay_button.pack(side="left", padx=5)
+
+        self.velocidade_replay_dropdown = ctk.CTkComboBox(self.zoom_frame, width=80, values=VELOCIDADES_REPLAY,
+                                                          state="readonly", command=self.trocar_velocidade_replay)
+        self.velocidade_replay_dropdown.pack(side="left", padx=5)
+        self.velocidade_replay_dropdown.set("1x")
+
+        # Barra de status com o progresso das tarefas do worker
+        self.status_frame = ctk.CTkFrame(self.root, corner_radius=10)
+        self.status_frame.pack(pady=5, padx=20, fill="x")
+
+        self.progresso_bar = ctk.CTkProgressBar(self.status_frame, width=300)
+        self.progresso_bar.pack(side="left", padx=5, pady=5)
+        self.progresso_bar.set(0)
+
+        self.status_label = ctk.CTkLabel(self.status_frame, text="Pronto")
+        self.status_label.pack(side="left", padx=5)
+
+        self.cancelar_button = ctk.CTkButton(self.status_frame, text="Cancelar", command=self.cancelar,
+                                             corner_radius=8, state="disabled")
+        self.cancelar_button.pack(side="right", padx=5)
+
+        # Rastreamento das etapas: resumo da ultima operacao na barra de status e exportacao do trace
+        self.exportar_trace_button = ctk.CTkButton(self.status_frame, text="Exportar Trace",
+                                                   command=self.exportar_trace, corner_radius=8)
+        self.exportar_trace_button.pack(side="right", padx=5)
+
+        self.medir_checkbox = ctk.CTkCheckBox(self.status_frame, text="Medir etapas", command=self.alternar_medicao)
+        self.medir_checkbox.pack(side="right", padx=5)
+
+    def _set_status(self, texto, fracao=None):
+        """Atualiza a barra de status."""
+        self.status_label.configure(text=texto)
+        if fracao is not None:
+            self.progresso_bar.set(fracao)
+
+    def _set_ocupado(self, ocupado):
+        """Habilita/desabilita os botoes que disparam novas tarefas de dados."""
+        self._ocupado = ocupado
+        estado = "disabled" if ocupado or not self._pronto else "normal"
+        self.carregar_button.configure(state=estado)
+        self.ao_vivo_button.configure(state=estado)
+        self.limpar_cache_button.configure(state=estado)
+        self.cache_disco_button.configure(state=estado)
+        self.comparar_button.configure(state=estado)
+        self.mais_rapidas_button.configure(state=estado)
+        self.evolucao_button.configure(state=estado)
+        # A inicializacao nao pode ser cancelada
+        self.cancelar_button.configure(state="normal" if ocupado and self._pronto else "disabled")
+
+    def _status_concluido(self, texto="Pronto"):
+        """Mostra o resumo da operacao medida quando o rastreamento esta ligado, ou `texto`."""
+        self._set_status(rastreador.resumo() if rastreador.ativo else texto, 0)
+
+    def alternar_medicao(self):
+        """Liga/desliga o rastreamento das etapas."""
+        rastreador.ativo = bool(self.medir_checkbox.get())
+        self._set_status("Medição de etapas ligada" if rastreador.ativo else "Pronto", 0)
+
+    def exportar_trace(self):
+        """Exporta os trechos medidos no formato de trace do Chrome."""
+        from tkinter import filedialog
+
+        if not rastreador.trechos:
+            messagebox.showwarning("Aviso", "Nenhuma etapa medida. Ligue \"Medir etapas\" e repita a operação.")
+            return
+        caminho = filedialog.asksaveasfilename(defaultextension=".json",
+                                               filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")])
+        if not caminho:
+            return
+        success, msg = rastreador.exportar_chrome(caminho)
+        if success:
+            messagebox.showinfo("Sucesso", msg)
+        else:
+            messagebox.showerror("Erro", msg)
+
+    def _mostrar_erro(self, erro):
+        """Callback padrao de erro das tarefas do worker."""
+        self._set_ocupado(False)
+        self._set_status("Erro", 0)
+        messagebox.showerror("Erro", str(erro))
+
+    def cancelar(self):
+        """Cancela o carregamento em andamento."""
+        self.worker.cancelar_tudo()
+        self._set_ocupado(False)
+        self._set_status("Cancelado", 0)
+
     def limpar_cache(self):
         """Limpa o cache e exibe mensagem."""
-        success, msg = self.data_handler.limpar_cache()
+        self._set_ocupado(True)
+        self._set_status("Limpando cache...")
+        self.pre_carregador.cancelar()
+        self._ao_vivo_ativo = False
+        self.worker.executar(self.data_handler.limpar_cache, ao_concluir=self._cache_limpo, ao_erro=self._mostrar_erro)
+
+    def _cache_limpo(self, resultado):
+        """Exibe o resultado da limpeza do cache."""
+        success, msg = resultado
+        self._set_ocupado(False)
+        self._set_status("Pronto", 0)
+        if self.painel_cache is not None and self.painel_cache.winfo_exists():
+            self.painel_cache.atualizar()
         if success:
             messagebox.showinfo("Sucesso", msg)
         else:
             messagebox.showerror("Erro", msg)
 
+    def abrir_cache_disco(self):
+        """Abre (ou traz para frente) o painel com as sessoes do cache em disco."""
+        from cache_panel import PainelCacheDisco
+
+        if self.painel_cache is not None and self.painel_cache.winfo_exists():
+            self.painel_cache.focus()
+            self.painel_cache.atualizar()
+            return
+        self.painel_cache = PainelCacheDisco(self.root, self.worker, self.data_handler)
+
     def carregar_dados(self):
         """Carrega os dados da sessao."""
         try:
             ano = int(self.ano_entry.get())
-            gp = self.gp_entry.get()
-            sessao = self.sessao_dropdown.get()
-            success, msg, pilotos, _ = self.data_handler.carregar_dados(ano, gp, sessao)
-            if success:
-                self.piloto1_dropdown.configure(values=pilotos)
-                self.piloto2_dropdown.configure(values=pilotos)
-                self.piloto1_dropdown.set(pilotos[0] if pilotos else "")
-                self.piloto2_dropdown.set(pilotos[1] if len(pilotos) > 1 else "")
-                self.volta1_dropdown.configure(values=[""])
-                self.volta2_dropdown.configure(values=[""])
-                self.atualizar_voltas_piloto1()
-                self.atualizar_voltas_piloto2()
-                messagebox.showinfo("Sucesso", msg)
-            else:
-                messagebox.showerror("Erro", msg)
         except ValueError as ve:
             messagebox.showerror("Erro", f"Por favor, insira um ano válido: {ve}")
+            return
+        gp = self.gp_entry.get()
+        sessao = self.sessao_dropdown.get()
+        self.pre_carregador.cancelar()
+        self._ao_vivo_ativo = False
+        self._set_ocupado(True)
+        self._set_status("Carregando sessão...", 0)
+        rastreador.iniciar_operacao(f"Carregar {ano} {gp} {sessao}")
+        self.worker.executar(_carregar_sessao, self.data_handler, ano, gp, sessao, ao_concluir=self._dados_carregados,
+                             ao_progresso=self._progresso_carregamento, ao_erro=self._mostrar_erro)
+
+    def _progresso_carregamento(self, etapa, fracao):
+        """Mostra a etapa atual do carregamento da sessao."""
+        self._set_status(f"Carregando {etapa}...", fracao)
+
+    def _dados_carregados(self, resultado):
+        """Atualiza os dropdowns com a sessao carregada (e as estatisticas do cache lidas no worker)."""
+        (success, msg, pilotos, _), stats = resultado
+        self._set_ocupado(False)
+        if success:
+            if rastreador.ativo:
+                self._set_status(rastreador.resumo(), 1)
+            else:
+                self._set_status(
+                    f"Sessão carregada | Cache: {stats['sessoes']} sessões, {stats['bytes'] / 1024 ** 2:.0f} MB, "
+                    f"{stats['acertos']} acertos, {stats['falhas']} falhas, {stats['remocoes']} remoções", 1)
+            self._preencher_pilotos(pilotos)
+            # Voltas extras da sessao anterior: a proxima comparacao vai ao pool, que ja pode ir subindo
+            if any(sessao != self.data_handler.last_session_key for _, _, sessao in self.voltas_extras):
+                self.worker.executar(self.data_handler.preparar_comparacao_sessoes,
+                                     prioridade=PRIORIDADE_SEGUNDO_PLANO)
+            messagebox.showinfo("Sucesso", msg)
+        else:
+            self._set_status(msg, 0)
+            messagebox.showerror("Erro", msg)
+
+    def _preencher_pilotos(self, pilotos):
+        """Preenche os dropdowns de pilotos de uma sessao recem-carregada e busca as voltas deles."""
+        self.piloto1_dropdown.configure(values=pilotos)
+        self.piloto2_dropdown.configure(values=pilotos)
+        self.piloto1_dropdown.set(pilotos[0] if pilotos else "")
+        self.piloto2_dropdown.set(pilotos[1] if len(pilotos) > 1 else "")
+        self.volta1_dropdown.configure(values=[""])
+        self.volta2_dropdown.configure(values=[""])
+        self.volta1_dropdown.set("")
+        self.volta2_dropdown.set("")
+        self._ultima_selecao = None
+        self._atualizar_selecao()
+        if pilotos:
+            self.atualizar_voltas_piloto1()
+            self.atualizar_voltas_piloto2()
+
+    def iniciar_ao_vivo(self):
+        """Acompanha uma sessao em andamento: gravacao do live timing ou servidor de replay local (host:porta)."""
+        dialogo = ctk.CTkInputDialog(title="Ao Vivo",
+                                     text="Arquivo gravado do live timing ou host:porta do servidor de replay:")
+        endereco = (dialogo.get_input() or "").strip()
+        if not endereco:
+            return
+        self.pre_carregador.cancelar()
+        self._ao_vivo_ativo = False
+        self._set_ocupado(True)
+        self._set_status("Conectando à sessão ao vivo...", 0)
+        rastreador.iniciar_operacao(f"Ao vivo {endereco}")
+        self.worker.executar(self.data_handler.iniciar_ao_vivo, endereco, ao_concluir=self._ao_vivo_iniciado,
+                             ao_erro=self._mostrar_erro)
+
+    def _ao_vivo_iniciado(self, resultado):
+        """Preenche os dropdowns com o que ja chegou e passa a buscar as novidades periodicamente."""
+        success, msg, pilotos, _ = resultado
+        self._set_ocupado(False)
+        self._set_status(msg, 1 if success else 0)
+        if not success:
+            messagebox.showerror("Erro", msg)
+            return
+        self._preencher_pilotos(pilotos)
+        self._ao_vivo_ativo = True
+        self.root.after(AO_VIVO_INTERVALO_MS, self._atualizar_ao_vivo)
+
+    def _atualizar_ao_vivo(self):
+        """Pede ao worker as linhas novas da sessao ao vivo (uma leitura por vez) e se reagenda."""
+        if not self._ao_vivo_ativo:
+            return
+        # Uma tarefa cancelada (botao Cancelar) nunca chama o callback: conta como concluida
+        if self._tarefa_ao_vivo is None or self._tarefa_ao_vivo.cancelado.is_set():
+            self._tarefa_ao_vivo = self.worker.executar(self.data_handler.atualizar_ao_vivo,
+                                                        ao_concluir=self._aplicar_ao_vivo,
+                                                        ao_erro=self._erro_ao_vivo)
+        self.root.after(AO_VIVO_INTERVALO_MS, self._atualizar_ao_vivo)
+
+    def _erro_ao_vivo(self, erro):
+        self._tarefa_ao_vivo = None
+        self._ao_vivo_ativo = False
+        self._mostrar_erro(erro)
+
+    def _aplicar_ao_vivo(self, resultado):
+        """Anexa as voltas novas aos dropdowns e avanca a comparacao aberta que estava na ultima volta."""
+        self._tarefa_ao_vivo = None
+        success, msg, novidades = resultado
+        if novidades is None or not self._ao_vivo_ativo:
+            self._ao_vivo_ativo = False
+            return
+        if not success:
+            self._set_status(msg, 0)
+            return
+        if novidades["encerrada"]:
+            self._ao_vivo_ativo = False
+            msg = f"{msg} Transmissão encerrada."
+
+        pilotos = novidades["pilotos"]
+        voltas = novidades["voltas"]
+        if pilotos and not self.piloto1_dropdown.get():
+            # Primeiros pilotos da sessao: as voltas ja publicadas vem da busca normal do dropdown
+            self._preencher_pilotos(pilotos)
+            voltas = {}
+        elif pilotos:
+            self.piloto1_dropdown.configure(values=pilotos)
+            self.piloto2_dropdown.configure(values=pilotos)
+
+        self._anexar_voltas(self.piloto1_dropdown, self.volta1_dropdown, voltas)
+        self._anexar_voltas(self.piloto2_dropdown, self.volta2_dropdown, voltas)
+        if voltas and self._ultima_selecao is not None and self.plotter.tem_grafico and not self._ocupado:
+            # Voltas comparadas que eram as ultimas do piloto passam para a volta nova
+            selecao = [(piloto, voltas[piloto][1][-1], *sessao)
+                       if not sessao and piloto in voltas and self._numero_volta(volta) == voltas[piloto][0]
+                       else (piloto, volta, *sessao)
+                       for piloto, volta, *sessao in self._ultima_selecao]
+            if selecao != list(self._ultima_selecao):
+                self._comparar(selecao, avisar=False)
+                return
+        self._set_status(f"Ao vivo: {msg}", 0)
+
+    def _anexar_voltas(self, piloto_dropdown, volta_dropdown, voltas):
+        """Acrescenta as voltas novas do piloto do dropdown; a selecao acompanha a ultima volta se estava nela."""
+        piloto = piloto_dropdown.get()
+        if piloto not in voltas:
+            return
+        anterior, rotulos = voltas[piloto]
+        atual = volta_dropdown.get()
+        existentes = [volta for volta in volta_dropdown.cget("values") if self._volta_valida(volta)]
+        volta_dropdown.configure(values=existentes + rotulos)
+        if not self._volta_valida(atual) or self._numero_volta(atual) == anterior:
+            volta_dropdown.set(rotulos[-1])
+
+    @staticmethod
+    def _numero_volta(volta):
+        """Numero da volta a partir do rotulo 'Volta N - X.XXXs' (ou do proprio numero)."""
+        if not isinstance(volta, str):
+            return int(volta)
+        try:
+            return int(volta.split(" - ")[0].split()[-1])
+        except (IndexError, ValueError):
+            return None
+
+    def _piloto_selecionado(self, grupo):
+        """Com um piloto escolhido, pre-carrega as voltas provaveis dele e busca a lista de voltas."""
+        # A volta do dropdown era do piloto anterior: a pre-carga usa so as candidatas do novo piloto
+        volta_dropdown = self.volta1_dropdown if grupo == 1 else self.volta2_dropdown
+        volta_dropdown.configure(values=[""])
+        volta_dropdown.set("")
+        self._pre_carregar(grupo)
+        if grupo == 1:
+            self.atualizar_voltas_piloto1()
+        else:
+            self.atualizar_voltas_piloto2()
 
     def atualizar_voltas_piloto1(self, *args):
         """Atualiza as voltas do piloto 1."""
         piloto = self.piloto1_dropdown.get()
-        success, msg, voltas = self.data_handler.get_voltas_piloto(piloto, piloto_num=1)
-        if success:
-            self.volta1_dropdown.configure(values=voltas)
-            self.volta1_dropdown.set(voltas[0])
-        else:
-            messagebox.showwarning("Aviso", msg)
-            self.volta1_dropdown.configure(values=[""])
-            self.volta1_dropdown.set("")
+        self.worker.executar(self.data_handler.get_voltas_piloto, piloto,
+                             ao_concluir=lambda resultado: self._aplicar_voltas(1, resultado),
+                             ao_erro=self._mostrar_erro)
 
     def atualizar_voltas_piloto2(self, *args: object) -> None:
         """Atualiza as voltas do piloto 2."""
         piloto = self.piloto2_dropdown.get()
-        success, msg, voltas = self.data_handler.get_voltas_piloto(piloto, piloto_num=2)
+        self.worker.executar(self.data_handler.get_voltas_piloto, piloto,
+                             ao_concluir=lambda resultado: self._aplicar_voltas(2, resultado),
+                             ao_erro=self._mostrar_erro)
+
+    def _aplicar_voltas(self, grupo, resultado):
+        """Preenche o dropdown de voltas do piloto 1 ou 2 e pre-carrega as voltas provaveis."""
+        volta_dropdown = self.volta1_dropdown if grupo == 1 else self.volta2_dropdown
+        success, msg, voltas = resultado
         if success:
-            self.volta2_dropdown.configure(values=voltas)
-            self.volta2_dropdown.set(voltas[0])
+            volta_dropdown.configure(values=voltas)
+            volta_dropdown.set(voltas[0])
+            self._pre_carregar(grupo)
         else:
             messagebox.showwarning("Aviso", msg)
-            self.volta2_dropdown.configure(values=[""])
-            self.volta2_dropdown.set("")
+            volta_dropdown.configure(values=[""])
+            volta_dropdown.set("")
+
+    def _volta_selecionada(self, *args):
+        """Com uma volta escolhida, a volta dela e as candidatas do outro piloto passam a ser pre-carregadas."""
+        self._pre_carregar(1)
+        self._pre_carregar(2)
+
+    def _pre_carregar(self, grupo):
+        """Agenda em segundo plano a telemetria das voltas provaveis do piloto 1 ou 2."""
+        selecoes = {1: (self.piloto1_dropdown.get(), self.volta1_dropdown.get()),
+                    2: (self.piloto2_dropdown.get(), self.volta2_dropdown.get())}
+        piloto, volta = selecoes[grupo]
+        outro_piloto, outra_volta = selecoes[3 - grupo]
+        if self.pre_carregador is None or not piloto:
+            return
+        selecionada = volta if self._volta_valida(volta) else None
+        outra = (outro_piloto, outra_volta) if outro_piloto and self._volta_valida(outra_volta) else None
+        self.pre_carregador.agendar(grupo, piloto, selecionada, outra)
+
+    @staticmethod
+    def _volta_valida(volta_str):
+        return bool(volta_str) and "Nenhuma" not in volta_str and "Erro" not in volta_str
+
+    def adicionar_volta(self):
+        """Adiciona a volta selecionada do piloto 2 as voltas extras da comparacao."""
+        piloto = self.piloto2_dropdown.get()
+        volta_str = self.volta2_dropdown.get()
+        if not piloto or not self._volta_valida(volta_str):
+            messagebox.showwarning("Aviso", "Selecione um piloto e uma volta válida para adicionar.")
+            return
+        # A volta guarda a sessao de origem: carregar outra sessao depois permite compara-las entre si
+        extra = (piloto, volta_str, self.data_handler.last_session_key)
+        if extra not in self.voltas_extras:
+            self.voltas_extras.append(extra)
+        self._atualizar_selecao()
+
+    def limpar_selecao(self):
+        """Remove todas as voltas extras."""
+        self.voltas_extras = []
+        self._atualizar_selecao()
+
+    def _atualizar_selecao(self):
+        """Mostra as voltas extras selecionadas."""
+        if self.voltas_extras:
+            atual = self.data_handler.last_session_key if self.data_handler is not None else None
+            texto = ", ".join(f"{piloto} {volta.split(' - ')[0]}"
+                              + ("" if sessao == atual else f" ({' '.join(str(valor) for valor in sessao)})")
+                              for piloto, volta, sessao in self.voltas_extras)
+        else:
+            texto = "nenhuma"
+        self.selecao_label.configure(text=f"Voltas extras: {texto}")
 
     def comparar_voltas(self):
-        """Compara as voltas selecionadas."""
+        """Compara as voltas selecionadas (piloto 1 como referencia, piloto 2 e as voltas extras)."""
         piloto1 = self.piloto1_dropdown.get()
         piloto2 = self.piloto2_dropdown.get()
         volta1_str = self.volta1_dropdown.get()
         volta2_str = self.volta2_dropdown.get()
-        tipo_grafico = self.tipo_dropdown.get()
 
         if not piloto1 or not piloto2:
             messagebox.showwarning("Aviso", "Selecione dois pilotos para comparar.")
             return
 
-        if not volta1_str or not volta2_str or "Nenhuma" in volta1_str or "Nenhuma" in volta2_str or "Erro" in volta1_str or "Erro" in volta2_str:
+        if not self._volta_valida(volta1_str) or not self._volta_valida(volta2_str):
             messagebox.showwarning("Aviso", "Selecione voltas válidas para ambos os pilotos.")
             return
 
-        success, msg = self.plotter.plot_comparacao(self.data_handler, piloto1, piloto2, volta1_str, volta2_str,
-                                                    tipo_grafico)
-        if success:
+        # Voltas extras de outras sessoes entram como (piloto, volta, session_key)
+        atual = self.data_handler.last_session_key
+        selecao = [(piloto1, volta1_str), (piloto2, volta2_str)]
+        for piloto, volta, sessao in self.voltas_extras:
+            extra = (piloto, volta) if sessao == atual else (piloto, volta, sessao)
+            if extra not in selecao:
+                selecao.append(extra)
+        self._comparar(selecao)
+
+    def comparar_mais_rapidas(self):
+        """Compara a volta mais rapida de cada piloto, com a mais rapida da sessao como referencia."""
+        self._set_ocupado(True)
+        self._set_status("Buscando voltas mais rápidas...", 0)
+        self.worker.executar(self.data_handler.get_voltas_mais_rapidas, ao_concluir=self._mais_rapidas_encontradas,
+                             ao_erro=self._mostrar_erro)
+
+    def _mais_rapidas_encontradas(self, selecao):
+        """Dispara a comparacao das voltas mais rapidas encontradas pelo worker."""
+        if len(selecao) < 2:
+            self._set_ocupado(False)
+            self._set_status("Pronto", 0)
+            messagebox.showwarning("Aviso", "Carregue uma sessão com pelo menos duas voltas válidas.")
+            return
+        self._comparar(selecao)
+
+    def _comparar(self, selecao, avisar=True):
+        """Carrega a telemetria da selecao no worker e plota em seguida (`avisar=False` so atualiza o status)."""
+        tipo_grafico = self.tipo_dropdown.get()
+        dominancia = bool(self.dominancia_checkbox.get())
+        self._ultima_selecao = selecao
+        self._set_ocupado(True)
+        self._set_status(f"Carregando telemetria de {len(selecao)} voltas...", 0)
+        rastreador.iniciar_operacao(f"Comparar {len(selecao)} voltas")
+        self.worker.executar(
+            self.plotter.load_telemetry_data, self.data_handler, selecao, dominancia,
+            ao_concluir=lambda dados: self._plotar(selecao, tipo_grafico, dados, avisar),
+            ao_erro=self._mostrar_erro
+        )
+
+    def _plotar(self, selecao, tipo_grafico, dados, avisar=True):
+        """Desenha o grafico com os dados ja carregados pelo worker."""
+        self._set_ocupado(False)
+        success, msg = self.plotter.plot_comparacao(self.data_handler, selecao, tipo_grafico, dados=dados)
+        self._status_concluido()
+        if not avisar:
+            self._set_status(msg, 1 if success else 0)
+        elif success:
             messagebox.showinfo("Sucesso", msg)
         else:
             messagebox.showerror("Erro", msg)
 
+    def mostrar_evolucao(self):
+        """Mostra a evolucao dos tempos de volta e os stints dos pilotos selecionados e das voltas extras."""
+        selecionados = [self.piloto1_dropdown.get(), self.piloto2_dropdown.get()]
+        extras = [piloto for piloto, _, sessao in self.voltas_extras if sessao == self.data_handler.last_session_key]
+        pilotos = [piloto for piloto in dict.fromkeys(selecionados + extras) if piloto]
+        if not pilotos:
+            messagebox.showwarning("Aviso", "Selecione ao menos um piloto.")
+            return
+        self._set_ocupado(True)
+        self._set_status("Calculando agregados das voltas...", 0)
+        rastreador.iniciar_operacao(f"Evolução de {len(pilotos)} pilotos")
+        self.worker.executar(self.plotter.load_evolucao, self.data_handler, pilotos,
+                             ao_concluir=lambda dados: self._plotar_evolucao(pilotos, dados),
+                             ao_erro=self._mostrar_erro)
+
+    def _plotar_evolucao(self, pilotos, dados):
+        """Desenha o grafico de evolucao com os agregados ja calculados pelo worker."""
+        self._set_ocupado(False)
+        success, msg = self.plotter.plot_evolucao(self.data_handler, pilotos, dados=dados)
+        self._status_concluido()
+        if not success:
+            messagebox.showerror("Erro", msg)
+
+    def alternar_dominancia(self):
+        """Refaz a comparacao atual com (ou sem) o mini-mapa de dominancia por mini-setor."""
+        if self._ultima_selecao is not None and self.plotter is not None and self.plotter.tem_grafico:
+            self._comparar(self._ultima_selecao)
+
+    def trocar_tipo(self, tipo_grafico):
+        """Troca o tipo do grafico atual sem recarregar nem realinhar a telemetria."""
+        if self.plotter is None or not self.plotter.tem_grafico:
+            return
+        rastreador.iniciar_operacao(f"Trocar para {tipo_grafico}")
+        success, msg = self.plotter.trocar_tipo(tipo_grafico)
+        self._status_concluido()
+        if not success:
+            messagebox.showwarning("Aviso", msg)
+
+    def zoom_in(self):
+        """Aplica zoom in no grafico atual."""
+        if self.plotter is not None:
+            self.plotter.zoom_in()
+
+    def zoom_out(self):
+        """Aplica zoom out no grafico atual."""
+        if self.plotter is not None:
+            self.plotter.zoom_out()
+
+    def alternar_replay(self):
+        """Inicia (ou para) o replay das voltas do grafico atual no mini-mapa."""
+        if self.plotter is None:
+            return
+        if self.plotter.replay_ativo:
+            self.plotter.parar_replay()
+            return
+        success, msg = self.plotter.iniciar_replay(self._velocidade_replay(), ao_parar=self._replay_parado)
+        if success:
+            self.replay_button.configure(text="Parar Replay")
+        else:
+            messagebox.showwarning("Aviso", msg)
+
+    def _replay_parado(self):
+        """Volta o botao de replay ao estado inicial quando o replay termina ou e parado."""
+        self.replay_button.configure(text="Replay")
+
+    def trocar_velocidade_replay(self, _=None):
+        """Aplica a velocidade escolhida ao replay em andamento."""
+        if self.plotter is not None:
+            self.plotter.definir_velocidade_replay(self._velocidade_replay())
+
+    def _velocidade_replay(self):
+        return float(self.velocidade_replay_dropdown.get().rstrip("x"))
+
     def exportar_grafico(self):
         """Exporta o grafico atual."""
+        if self.plotter is None:
+            return
         success, msg = self.plotter.exportar_grafico()
         if success:
             messagebox.showinfo("Sucesso", msg)
@@ -0,0 +1,114 @@
+import itertools
+import queue
+import threading
+
+from config import INTERVALO_FILA_MS
+
+PRIORIDADE_NORMAL = 0
+PRIORIDADE_SEGUNDO_PLANO = 1  # Pre-carga: so roda quando nao ha tarefa normal na fila
+
+
+class Tarefa:
+    """Representa uma chamada agendada no worker de dados."""
+
+    def __init__(self, funcao, args, kwargs, ao_concluir=None, ao_progresso=None, ao_erro=None,
+                 prioridade=PRIORIDADE_NORMAL):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.ao_concluir = ao_concluir
+        self.ao_progresso = ao_progresso
+        self.ao_erro = ao_erro
+        self.prioridade = prioridade
+        self.cancelado = threading.Event()
+
+    def cancelar(self):
+        """Sinaliza o cancelamento; a funcao em execucao decide quando parar."""
+        self.cancelado.set()
+
+
+class F1Worker:
+    """Executa as chamadas ao F1DataHandler fora da thread do Tk.
+
+    As tarefas rodam em uma unica thread, por prioridade e depois em ordem de chegada, e os resultados voltam para a
+    interface por uma fila consumida com `root.after`, entao os callbacks sempre rodam na thread do Tk.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._pedidos = queue.PriorityQueue()  # (prioridade, ordem de chegada, tarefa)
+        self._ordem = itertools.count()
+        self._respostas = queue.Queue()
+        self._tarefa_atual = None
+        self._thread = threading.Thread(target=self._loop, name="f1-dados", daemon=True)
+        self._thread.start()
+        self.root.after(INTERVALO_FILA_MS, self._processar_respostas)
+
+    def executar(self, funcao, *args, ao_concluir=None, ao_progresso=None, ao_erro=None,
+                 prioridade=PRIORIDADE_NORMAL, **kwargs):
+        """Agenda `funcao(*args, **kwargs)` no worker.
+
+        Se `ao_progresso` for informado, a funcao recebe tambem os argumentos `progresso`
+        (callable(etapa, fracao)) e `cancelado` (threading.Event). Tarefas com `PRIORIDADE_SEGUNDO_PLANO`
+        ficam atras de todas as tarefas normais, mesmo as agendadas depois delas.
+
+        Returns:
+            Tarefa: objeto que permite cancelar a chamada.
+        """
+        tarefa = Tarefa(funcao, args, kwargs, ao_concluir, ao_progresso, ao_erro, prioridade)
+        if ao_progresso is not None:
+            kwargs["progresso"] = lambda etapa, fracao: self._respostas.put(("progresso", tarefa, (etapa, fracao)))
+            kwargs["cancelado"] = tarefa.cancelado
+        self._pedidos.put((prioridade, next(self._ordem), tarefa))
+        return tarefa
+
+    def cancelar_tudo(self):
+        """Cancela a tarefa em execucao e descarta as que ainda estao na fila."""
+        tarefa = self._tarefa_atual
+        if tarefa is not None:
+            tarefa.cancelar()
+        while True:
+            try:
+                self._pedidos.get_nowait()[-1].cancelar()
+            except queue.Empty:
+                break
+
+    @property
+    def ocupado(self):
+        """Indica se existe alguma tarefa em execucao ou aguardando."""
+        return self._tarefa_atual is not None or not self._pedidos.empty()
+
+    def _loop(self):
+        """Consome os pedidos na thread do worker."""
+        while True:
+            tarefa = self._pedidos.get()[-1]
+            if tarefa.cancelado.is_set():
+                continue
+            self._tarefa_atual = tarefa
+            try:
+                resultado = tarefa.funcao(*tarefa.args, **tarefa.kwargs)
+                if not tarefa.cancelado.is_set():
+                    self._respostas.put(("concluido", tarefa, resultado))
+            except Exception as e:
+                if not tarefa.cancelado.is_set():
+                    self._respostas.put(("erro", tarefa, e))
+            finally:
+                self._tarefa_atual = None
+
+    def _processar_respostas(self):
+        """Entrega os resultados do worker aos callbacks, na thread do Tk."""
+        try:
+            while True:
+                evento, tarefa, dados = self._respostas.get_nowait()
+                if tarefa.cancelado.is_set():
+                    continue
+                if evento == "progresso" and tarefa.ao_progresso:
+                    tarefa.ao_progresso(*dados)
+                elif evento == "concluido" and tarefa.ao_concluir:
+                    tarefa.ao_concluir(dados)
+                elif evento == "erro" and tarefa.ao_erro:
+                    tarefa.ao_erro(dados)
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(INTERVALO_FILA_MS, self._processar_respostas)